@@ -362,15 +362,17 @@ export default function AdminDashboard() {
                               {commission.providerName} • {new Date(commission.occurredAt || Date.now()).toLocaleDateString('fi-FI')}
                             </p>
                           </div>
-                          <Badge variant={
-                            commission.status === 'approved' ? 'default' : 
-                            commission.status === 'pending' ? 'secondary' : 
-                            'destructive'
-                          }>
-                            {commission.status === 'approved' ? 'Hyväksytty' :
-                             commission.status === 'pending' ? 'Odottaa' :
-                             'Peruutettu'}
-                          </Badge>
+                          {commission.status && (
+                            <Badge variant={
+                              commission.status === 'approved' ? 'default' : 
+                              commission.status === 'pending' ? 'secondary' : 
+                              'destructive'
+                            }>
+                              {commission.status === 'approved' ? 'Hyväksytty' :
+                               commission.status === 'pending' ? 'Odottaa' :
+                               'Peruutettu'}
+                            </Badge>
+                          )}
                         </div>
                         
                         <div className="grid grid-cols-3 gap-4 text-sm">
@@ -1,194 +1,66 @@
 import { supabase, testConnection, initializeFoodAiData } from '../../../lib/supabase.js';
 import { NextResponse } from 'next/server';
 import { v4 as uuidv4 } from 'uuid';
-
-// Finnish cities - all major cities in Finland
-const FINNISH_CITIES = [
-  'Helsinki', 'Espoo', 'Tampere', 'Vantaa', 'Oulu', 'Turku', 'Jyväskylä', 
-  'Lahti', 'Kuopio', 'Pori', 'Kouvola', 'Joensuu', 'Lappeenranta', 'Hämeenlinna',
-  'Vaasa', 'Seinäjoki', 'Rovaniemi', 'Mikkeli', 'Kotka', 'Salo', 'Porvoo'
-];
-
-// Finnish cuisine types
-const FINNISH_CUISINES = [
-  'Suomalainen', 'Pizza', 'Sushi', 'Kiinalainen', 'Intialainen', 'Thai', 'Italiana',
-  'Hampurilainen', 'Kebab', 'Meksikkolainen', 'Aasialainen', 'Vegan', 'Kasvis',
-  'Kala', 'Liha', 'Salaatti', 'Keitto', 'Grill', 'Fast Food', 'Jälkiruoka'
-];
-
-// Mock Finnish restaurants
-const FINNISH_RESTAURANTS = [
-  { 
-    id: 'rest_1', 
-    name: 'Ravintola Savoy', 
-    city: 'Helsinki', 
-    district: 'Keskusta',
-    cuisine_types: ['Suomalainen', 'Fine Dining'], 
-    rating: 4.8, 
-    latitude: 60.1699, 
-    longitude: 24.9384 
-  },
-  { 
-    id: 'rest_2', 
-    name: 'Pizzeria da Mario', 
-    city: 'Helsinki', 
-    district: 'Kallio',
-    cuisine_types: ['Pizza', 'Italiana'], 
-    rating: 4.3, 
-    latitude: 60.1841, 
-    longitude: 24.9511 
-  },
-  { 
-    id: 'rest_3', 
-    name: 'Sushi Zen', 
-    city: 'Tampere', 
-    district: 'Keskusta',
-    cuisine_types: ['Sushi', 'Japanilainen'], 
-    rating: 4.6, 
-    latitude: 61.4981, 
-    longitude: 23.7608 
-  },
-  { 
-    id: 'rest_4', 
-    name: 'Golden Dragon', 
-    city: 'Turku', 
-    district: 'Keskusta',
-    cuisine_types: ['Kiinalainen', 'Aasialainen'], 
-    rating: 4.4, 
-    latitude: 60.4518, 
-    longitude: 22.2666 
-  },
-  { 
-    id: 'rest_5', 
-    name: 'Burger Palace', 
-    city: 'Oulu', 
-    district: 'Keskusta',
-    cuisine_types: ['Hampurilainen', 'Fast Food'], 
-    rating: 4.2, 
-    latitude: 65.0121, 
-    longitude: 25.4651 
-  },
-  { 
-    id: 'rest_6', 
-    name: 'Kebab King', 
-    city: 'Jyväskylä', 
-    district: 'Keskusta',
-    cuisine_types: ['Kebab', 'Turkkilainen'], 
-    rating: 4.1, 
-    latitude: 62.2426, 
-    longitude: 25.7473 
-  },
-  { 
-    id: 'rest_7', 
-    name: 'Thai Garden', 
-    city: 'Lahti', 
-    district: 'Keskusta',
-    cuisine_types: ['Thai', 'Aasialainen'], 
-    rating: 4.5, 
-    latitude: 60.9827, 
-    longitude: 25.6612 
-  },
-  { 
-    id: 'rest_8', 
-    name: 'Ravintola Aino', 
-    city: 'Kuopio', 
-    district: 'Keskusta',
-    cuisine_types: ['Suomalainen', 'Eurooppalainen'], 
-    rating: 4.7, 
-    latitude: 62.8924, 
-    longitude: 27.6780 
-  }
-];
-
-// Finnish food providers - expanded with requested services
-const FINNISH_PROVIDERS = [
-  { 
-    id: 'wolt', 
-    name: 'Wolt', 
-    logo_url: 'https://images.unsplash.com/photo-1565299624946-b28f40a0ca4b?w=100&h=100&fit=crop', 
-    color: '#00C2E8',
-    commission_rate: 8.50,
-    website: 'https://wolt.com/fi'
-  },
-  { 
-    id: 'foodora', 
-    name: 'Foodora', 
-    logo_url: 'https://images.unsplash.com/photo-1555992336-03a23a47b61e?w=100&h=100&fit=crop', 
-    color: '#E91E63',
-    commission_rate: 7.20,
-    website: 'https://www.foodora.fi'
-  },
-  { 
-    id: 'resq_club', 
-    name: 'ResQ Club', 
-    logo_url: 'https://images.unsplash.com/photo-1498837167922-ddd27525d352?w=100&h=100&fit=crop', 
-    color: '#4CAF50',
-    commission_rate: 12.00,
-    website: 'https://www.resq-club.com/fi/'
-  },
-  { 
-    id: 'kotipizza', 
-    name: 'Kotipizza', 
-    logo_url: 'https://images.unsplash.com/photo-1513104890138-7c749659a591?w=100&h=100&fit=crop', 
-    color: '#D32F2F',
-    commission_rate: 6.50,
-    website: 'https://www.kotipizza.fi/'
-  },
-  { 
-    id: 'k_ruoka', 
-    name: 'K-Ruoka', 
-    logo_url: 'https://images.unsplash.com/photo-1542838132-92c53300491e?w=100&h=100&fit=crop', 
-    color: '#FF6D00',
-    commission_rate: 5.00,
-    website: 'https://www.k-ruoka.fi/kauppa'
-  },
-  { 
-    id: 'fiksuruoka', 
-    name: 'Fiksuruoka', 
-    logo_url: 'https://images.unsplash.com/photo-1556909114-f6e7ad7d3136?w=100&h=100&fit=crop', 
-    color: '#2E7D32',
-    commission_rate: 9.00,
-    website: 'https://www.fiksuruoka.fi'
+import { createReadinessProbe, READINESS_STATES } from '../../../lib/supabase-readiness.js';
+import { clickoutQueue } from '../../../lib/clickout-queue.js';
+import { fetchClickoutRollups, fetchCommissionRollups } from '../../../lib/admin-rollups.js';
+import { getOfferCatalog } from '../../../lib/catalog/index.js';
+import { getOfferIndex, encodeOfferCursor, decodeOfferCursor, offerFilterKey } from '../../../lib/catalog/offer-index.js';
+import { catalogBatchReader, supabaseBatchReader, createOfferExportStream } from '../../../lib/catalog/export.js';
+import { getOfferAggregates } from '../../../lib/catalog/aggregates.js';
+import { FINNISH_CITIES, FINNISH_RESTAURANTS, FINNISH_PROVIDERS } from '../../../lib/catalog/mock-data.js';
+import { getGeoIndex, DEFAULT_RADIUS_KM, MAX_RADIUS_KM } from '../../../lib/catalog/geo-index.js';
+import { offerExpiry } from '../../../lib/catalog/expiry.js';
+import { parseFields, projectOffers } from '../../../lib/catalog/projection.js';
+import { computeETag, precompressJson, conditionalJsonResponse } from '../../../lib/http-cache.js';
+import { createRequestTimer, trackUpstream, renderMetrics } from '../../../lib/metrics.js';
+import { getProviderCacheStats } from '../../../lib/providers/index.js';
+import { chatResponseCache, chatStreamCache } from '../../../lib/chat-cache.js';
+import { getChatOfferSnapshotStats } from '../../../lib/catalog/chat-offers.js';
+
+// Endpoints that read the raw offer list (others use the offer index or aggregates)
+const CATALOG_PATHS = new Set(['admin/clickouts', 'admin/commissions']);
+
+// Route labels for metrics; anything else is counted as 'other' to keep label sets small
+const METRIC_ROUTES = new Set([
+  '', 'admin/overview', 'admin/providers', 'admin/clickouts', 'admin/commissions', 'admin/metrics',
+  'offers', 'offers/export', 'providers', 'cities', 'cuisines', 'stats', 'clickouts'
+]);
+const metricRoute = (method, path) => `${method} /${METRIC_ROUTES.has(path) ? path : 'other'}`;
+
+// Lists that never change while the process runs: serialized and compressed on first use
+const STATIC_LISTS = {
+  providers: () => FINNISH_PROVIDERS,
+  cities: () => [...new Set(FINNISH_RESTAURANTS.map(r => r.city))],
+  cuisines: () => [...new Set(FINNISH_RESTAURANTS.flatMap(r => r.cuisine_types))]
+};
+const STATIC_CACHE_CONTROL = 'public, max-age=3600';
+const staticBodies = new Map();
+
+function staticListBody(path) {
+  let entity = staticBodies.get(path);
+  if (!entity) {
+    entity = precompressJson(STATIC_LISTS[path]());
+    staticBodies.set(path, entity);
   }
-];
-
-// Finnish food items
-const FINNISH_FOOD_ITEMS = [
-  'Lohikeitto', 'Karjalanpiirakka', 'Poronkäristys', 'Mustikkapiirakka', 'Korvapuusti',
-  'Margherita Pizza', 'Pepperoni Pizza', 'Quattro Stagioni', 'Calzone',
-  'Nigiri Sushi', 'Maki Roll', 'Sashimi', 'Temaki', 'California Roll',
-  'Cheeseburger', 'Big Burger', 'Chicken Burger', 'Fish Burger', 'Veggie Burger',
-  'Kebab', 'Falafel', 'Gyros', 'Shawarma', 'Iskender',
-  'Pad Thai', 'Green Curry', 'Tom Yum', 'Massaman Curry', 'Som Tam',
-  'Chicken Tikka Masala', 'Biryani', 'Naan', 'Samosa', 'Dal',
-  'Sweet & Sour Chicken', 'Kung Pao', 'Chow Mein', 'Fried Rice', 'Spring Rolls',
-  'Caesar Salaatti', 'Tonnisalaatti', 'Kreikkalainen Salaatti'
-];
-
-// Auto-create Supabase tables if they don't exist
-async function ensureSupabaseTables() {
-  try {
-    // Test if tables exist by querying providers
-    const { data, error } = await supabase
-      .from('providers')
-      .select('count')
-      .limit(1);
-    
-    if (error && error.code === 'PGRST116') {
-      // Tables don't exist, create them with basic structure
-      console.log('Creating Supabase tables...');
-      
-      // Note: We can't create tables directly via client, but we can insert seed data
-      // The tables should be created manually via SQL Editor
-      await seedSupabaseData();
-      return false; // Tables still need manual creation
-    }
-    
-    return true; // Tables exist
-  } catch (err) {
-    console.error('Error checking Supabase tables:', err);
-    return false;
+  return entity;
+}
+
+// Probe whether Supabase tables exist
+// Note: We can't create tables directly via client, but we can insert seed data.
+// The tables should be created manually via SQL Editor.
+async function probeSupabaseTables() {
+  const { error } = await trackUpstream('supabase', () => supabase
+    .from('providers')
+    .select('count')
+    .limit(1));
+
+  if (error && error.code === 'PGRST116') {
+    // Tables don't exist yet, attempt to seed
+    return { ready: false, needsSeed: true };
   }
+
+  return { ready: !error, needsSeed: false };
 }
 
 // Seed Supabase with initial data
@@ -303,81 +175,24 @@ async function seedSupabaseData() {
   }
 }
 
-// Generate Finnish offers
-function generateFinnishOffers() {
-  const offers = [];
-  
-  FINNISH_RESTAURANTS.forEach(restaurant => {
-    FINNISH_PROVIDERS.forEach(provider => {
-      const numOffers = Math.floor(Math.random() * 4) + 2; // 2-5 offers
-      
-      for (let i = 0; i < numOffers; i++) {
-        const foodItem = FINNISH_FOOD_ITEMS[Math.floor(Math.random() * FINNISH_FOOD_ITEMS.length)];
-        const originalPrice = Math.floor(Math.random() * 25) + 8; // 8-33 EUR
-        const discountPercent = Math.floor(Math.random() * 45) + 15; // 15-60% discount
-        const discountedPrice = parseFloat((originalPrice * (1 - discountPercent / 100)).toFixed(2));
-        
-        const endsAt = new Date();
-        endsAt.setHours(endsAt.getHours() + Math.floor(Math.random() * 48) + 2);
-        
-        // Food image URLs
-        // High-quality food images from Unsplash
-        const foodImageIds = [
-          '1546069901-ba9599a7e63c', // Colorful Buddha Bowl
-          '1715493926880-a15b1fee7b30', // Pancakes with Blueberries  
-          '1555939594-58d7cb561ad1', // Grilled Meat Platter
-          '1533777324565-a040eb52facd', // Pasta Spread
-          '1604908176997-125f25cc6f3d', // Chicken Tomato Salad
-          '1565299624946-b28f40a0ca4b'  // Fallback food image
-        ];
-        const imageId = foodImageIds[Math.floor(Math.random() * foodImageIds.length)];
-        
-        offers.push({
-          id: uuidv4(),
-          provider_id: provider.id,
-          provider_name: provider.name,
-          provider_logo: provider.logo_url,
-          provider_color: provider.color,
-          restaurant_id: restaurant.id,
-          restaurant_name: restaurant.name,
-          city: restaurant.city,
-          district: restaurant.district,
-          cuisine_types: restaurant.cuisine_types,
-          rating: restaurant.rating,
-          latitude: restaurant.latitude,
-          longitude: restaurant.longitude,
-          title: foodItem,
-          description: `Herkullinen ${foodItem.toLowerCase()} ravintola ${restaurant.name}sta`,
-          original_price: originalPrice,
-          discounted_price: discountedPrice,
-          discount_percent: discountPercent,
-          currency: 'EUR',
-          delivery_fee: Math.floor(Math.random() * 6) + 1, // 1-7 EUR
-          min_order_amount: Math.floor(Math.random() * 20) + 15, // 15-35 EUR
-          has_pickup: Math.random() > 0.4,
-          has_delivery: true,
-          starts_at: new Date(),
-          ends_at: endsAt,
-          image_url: `https://images.unsplash.com/photo-${imageId}?w=400&h=300&fit=crop&auto=format`,
-          tags: ['alennus', ...restaurant.cuisine_types.map(c => c.toLowerCase())],
-          deep_link: `https://${provider.id}.com/restaurant/${restaurant.id}/offer/${uuidv4()}`,
-          is_active: true,
-          created_at: new Date(),
-          updated_at: new Date(),
-          clickCount: Math.floor(Math.random() * 50),
-          revenue: parseFloat((Math.random() * 200).toFixed(2))
-        });
-      }
-    });
-  });
-  
-  return offers;
-}
+// Memoized table-existence state, probed once at startup and re-probed with backoff
+const supabaseReadiness = createReadinessProbe({
+  probe: probeSupabaseTables,
+  seed: seedSupabaseData
+});
+supabaseReadiness.check();
 
-// Generate mock admin data
-function generateMockAdminData(offers) {
-  const totalRevenue = offers.reduce((sum, offer) => sum + (offer.revenue || 0), 0);
-  const totalClicks = offers.reduce((sum, offer) => sum + (offer.clickCount || 0), 0);
+// Remove offers from the catalog as they end; persist deactivations once Supabase is ready
+offerExpiry.start({
+  shouldDeactivate: () => supabaseReadiness.getState() === READINESS_STATES.READY
+});
+
+// Window for the admin "expiring offers" count (hours)
+const EXPIRING_WINDOW_HOURS = 24;
+
+// Generate mock admin data from precomputed aggregates and the expiry queue
+function generateMockAdminData(aggregates, expiry) {
+  const { revenue: totalRevenue, clicks: totalClicks, activeCount, offerCount } = aggregates.global;
   const totalConversions = Math.floor(totalClicks * 0.08); // 8% conversion rate
   
   return {
@@ -385,58 +200,64 @@ function generateMockAdminData(offers) {
     totalClicks,
     totalConversions,
     conversionRate: ((totalConversions / totalClicks) * 100).toFixed(1),
-    activeOffers: offers.filter(o => o.is_active).length,
-    totalOffers: offers.length,
+    activeOffers: activeCount,
+    totalOffers: offerCount,
     revenueGrowth: 12,
     clicksGrowth: 8,
     monthlyRevenue: (totalRevenue * 0.4).toFixed(2),
     weeklyRevenue: (totalRevenue * 0.1).toFixed(2),
     dailyAvgRevenue: (totalRevenue / 30).toFixed(2),
     avgRevenuePerClick: (totalRevenue / totalClicks).toFixed(2),
-    expiringOffers: Math.floor(offers.length * 0.1),
-    expiredOffers: Math.floor(offers.length * 0.05)
+    expiringOffers: expiry.expiringWithinHours(EXPIRING_WINDOW_HOURS),
+    expiredOffers: expiry.stats().expired
   };
 }
 
 export async function GET(request) {
+  const { pathname, searchParams } = new URL(request.url);
+  const path = pathname.split('/api/')[1] || '';
+
+  // Per-phase timings go to the Server-Timing header and the in-process histograms
+  const timing = createRequestTimer(metricRoute('GET', path));
+  const respond = (body, init) => timing.finish(timing.time('serialize', () => NextResponse.json(body, init)));
+  // ETag/304 responses for pre-serialized bodies
+  const respondEntity = (entity, headers) => timing.finish(conditionalJsonResponse(request, entity, headers));
+
   try {
-    const { pathname, searchParams } = new URL(request.url);
-    const path = pathname.split('/api/')[1] || '';
 
-    // Ensure Supabase tables exist (attempt to seed if not)
-    await ensureSupabaseTables();
+    // Kick off a re-probe if one is due; never blocks the request
+    supabaseReadiness.check();
 
-    // Generate Finnish offers for demo
-    const finnishOffers = generateFinnishOffers();
+    // Shared, materialized offer catalog (only loaded when the endpoint needs it)
+    const finnishOffers = CATALOG_PATHS.has(path) ? (await timing.time('catalog', getOfferCatalog)).offers : [];
 
     switch (path) {
-      case 'admin/overview':
-        const overviewData = generateMockAdminData(finnishOffers);
-        const topOffers = finnishOffers
-          .sort((a, b) => (b.clickCount || 0) - (a.clickCount || 0))
-          .slice(0, 10);
+      case 'admin/overview': {
+        const aggregates = await timing.time('aggregates', getOfferAggregates);
+        const overviewData = generateMockAdminData(aggregates, offerExpiry);
+        const topOffers = aggregates.topOffers();
         
         const cityStats = FINNISH_CITIES.slice(0, 6).map(city => {
-          const cityOffers = finnishOffers.filter(o => o.city === city);
+          const cityCounters = aggregates.city(city);
           return {
             name: city,
-            offerCount: cityOffers.length,
-            clickCount: cityOffers.reduce((sum, o) => sum + (o.clickCount || 0), 0),
-            revenue: cityOffers.reduce((sum, o) => sum + (o.revenue || 0), 0).toFixed(2)
+            offerCount: cityCounters.offerCount,
+            clickCount: cityCounters.clicks,
+            revenue: cityCounters.revenue.toFixed(2)
           };
         });
 
-        return NextResponse.json({
+        return respond({
           data: overviewData,
           topOffers,
           cityStats
         });
+      }
 
-      case 'admin/providers':
+      case 'admin/providers': {
+        const aggregates = await timing.time('aggregates', getOfferAggregates);
         const providersData = FINNISH_PROVIDERS.map(provider => {
-          const providerOffers = finnishOffers.filter(o => o.provider_id === provider.id);
-          const clickCount = providerOffers.reduce((sum, o) => sum + (o.clickCount || 0), 0);
-          const revenue = providerOffers.reduce((sum, o) => sum + (o.revenue || 0), 0);
+          const { offerCount, clicks: clickCount, revenue } = aggregates.provider(provider.id);
           const conversions = Math.floor(clickCount * 0.08);
           
           return {
@@ -444,16 +265,31 @@ export async function GET(request) {
             logoUrl: provider.logo_url,
             commissionRate: provider.commission_rate,
             isActive: true,
-            offerCount: providerOffers.length,
+            offerCount,
             clickCount,
             conversions,
             earned: (revenue * provider.commission_rate / 100).toFixed(2)
           };
         });
 
-        return NextResponse.json({ data: providersData });
+        return respond({ data: providersData });
+      }
+
+      case 'admin/clickouts': {
+        // Real hourly rollups maintained by Postgres triggers; mock rows until Supabase is ready
+        if (supabaseReadiness.getState() === READINESS_STATES.READY) {
+          try {
+            const { data, nextCursor } = await timing.time('rollups', () => fetchClickoutRollups({
+              cursor: searchParams.get('cursor'),
+              limit: searchParams.get('limit'),
+              provider: searchParams.get('provider')
+            }));
+            return respond({ data, nextCursor });
+          } catch (error) {
+            console.error('Clickout rollup query failed, serving mock data:', error);
+          }
+        }
 
-      case 'admin/clickouts':
         const mockClickouts = finnishOffers.slice(0, 20).map((offer, index) => ({
           id: uuidv4(),
           offerId: offer.id,
@@ -465,9 +301,24 @@ export async function GET(request) {
           revenue: Math.random() > 0.9 ? parseFloat((Math.random() * 50).toFixed(2)) : 0
         }));
 
-        return NextResponse.json({ data: mockClickouts });
+        return respond({ data: mockClickouts, nextCursor: null });
+      }
+
+      case 'admin/commissions': {
+        // Daily rollups with at least one conversion; mock rows until Supabase is ready
+        if (supabaseReadiness.getState() === READINESS_STATES.READY) {
+          try {
+            const { data, nextCursor } = await timing.time('rollups', () => fetchCommissionRollups({
+              cursor: searchParams.get('cursor'),
+              limit: searchParams.get('limit'),
+              provider: searchParams.get('provider')
+            }));
+            return respond({ data, nextCursor });
+          } catch (error) {
+            console.error('Commission rollup query failed, serving mock data:', error);
+          }
+        }
 
-      case 'admin/commissions':
         const mockCommissions = Array.from({ length: 15 }, (_, index) => {
           const offer = finnishOffers[Math.floor(Math.random() * finnishOffers.length)];
           const provider = FINNISH_PROVIDERS.find(p => p.id === offer.provider_id);
@@ -490,7 +341,21 @@ export async function GET(request) {
           };
         });
 
-        return NextResponse.json({ data: mockCommissions });
+        return respond({ data: mockCommissions, nextCursor: null });
+      }
+
+      case 'admin/metrics':
+        // Prometheus text format for scraping
+        return timing.finish(new NextResponse(renderMetrics({
+          clickout_queue: clickoutQueue.stats(),
+          provider_cache: getProviderCacheStats(),
+          chat_response_cache: chatResponseCache.stats(),
+          chat_stream_cache: chatStreamCache.stats(),
+          chat_offer_snapshot: getChatOfferSnapshotStats(),
+          offer_expiry: offerExpiry.stats()
+        }), {
+          headers: { 'Content-Type': 'text/plain; version=0.0.4; charset=utf-8' }
+        }));
 
       case 'offers':
         const city = searchParams.get('city') || '';
@@ -498,126 +363,205 @@ export async function GET(request) {
         const minDiscount = parseInt(searchParams.get('minDiscount')) || 0;
         const maxPrice = parseInt(searchParams.get('maxPrice')) || 100;
         const provider = searchParams.get('provider') || '';
-        const sortBy = searchParams.get('sortBy') || 'discount';
+        const lat = parseFloat(searchParams.get('lat'));
+        const lng = parseFloat(searchParams.get('lng'));
+        const nearMe = Number.isFinite(lat) && Number.isFinite(lng);
+        const sortBy = searchParams.get('sortBy') || (nearMe ? 'distance' : 'discount');
         const page = parseInt(searchParams.get('page')) || 1;
         const limit = parseInt(searchParams.get('limit')) || 12;
+        const fields = parseFields(searchParams.get('fields'));
+        const cursorParam = searchParams.get('cursor');
 
-        let filteredOffers = finnishOffers.filter(offer => {
-          const matchesCity = !city || city === 'all' || offer.city.toLowerCase().includes(city.toLowerCase());
-          const matchesCuisine = !cuisine || cuisine === 'all' || 
-            offer.cuisine_types.some(c => c.toLowerCase().includes(cuisine.toLowerCase()));
-          const matchesDiscount = offer.discount_percent >= minDiscount;
-          const matchesPrice = offer.discounted_price <= maxPrice;
-          const matchesProvider = !provider || provider === 'all' || offer.provider_id === provider;
-          
-          return matchesCity && matchesCuisine && matchesDiscount && matchesPrice && matchesProvider;
-        });
+        const startIndex = (page - 1) * limit;
 
-        // Sort offers
-        filteredOffers.sort((a, b) => {
-          switch (sortBy) {
-            case 'price':
-              return a.discounted_price - b.discounted_price;
-            case 'rating':
-              return b.rating - a.rating;
-            case 'discount':
-            default:
-              return b.discount_percent - a.discount_percent;
+        let paginatedOffers;
+        let pagination;
+        if (nearMe) {
+          if (Math.abs(lat) > 90 || Math.abs(lng) > 180) {
+            return respond({ error: 'Virheelliset koordinaatit' }, { status: 400 });
           }
-        });
+          if (cursorParam) {
+            return respond({ error: 'Sijaintihaku käyttää sivunumeroita' }, { status: 400 });
+          }
+          const radiusParam = searchParams.get('radiusKm');
+          const requestedRadius = radiusParam === null ? DEFAULT_RADIUS_KM : parseFloat(radiusParam);
+          if (!(requestedRadius > 0)) {
+            return respond({ error: 'Virheellinen hakusäde' }, { status: 400 });
+          }
+          const radiusKm = Math.min(requestedRadius, MAX_RADIUS_KM);
+
+          // Grid lookup around the point; the other filters only run on nearby offers
+          const cityQuery = city.toLowerCase();
+          const cuisineQuery = cuisine.toLowerCase();
+          const geoIndex = await timing.time('index', getGeoIndex);
+          let total;
+          ({ offers: paginatedOffers, total } = timing.time('query', () => geoIndex.query({
+            lat,
+            lng,
+            radiusKm,
+            sortBy,
+            offset: Math.max(0, startIndex),
+            limit,
+            filter: offer =>
+              (!cityQuery || cityQuery === 'all' || offer.city.toLowerCase().includes(cityQuery)) &&
+              (!cuisineQuery || cuisineQuery === 'all' ||
+                offer.cuisine_types.some(c => c.toLowerCase().includes(cuisineQuery))) &&
+              (!provider || provider === 'all' || offer.provider_id === provider) &&
+              offer.discount_percent >= minDiscount &&
+              offer.discounted_price <= maxPrice
+          })));
+          pagination = { total, page, totalPages: Math.ceil(total / limit), hasMore: startIndex + limit < total };
+        } else {
+          const offerIndex = await timing.time('index', getOfferIndex);
+          const filters = { city, cuisine, provider, minDiscount, maxPrice };
+          const filterKey = offerFilterKey(filters);
+
+          if (cursorParam) {
+            // Keyset page: resume after the cursor's position in the presorted view
+            const cursor = decodeOfferCursor(cursorParam);
+            if (!cursor || cursor.filterKey !== filterKey) {
+              return respond({ error: 'Virheellinen sivutusavain' }, { status: 400 });
+            }
+            if (cursor.version !== offerIndex.version) {
+              // The catalog was rebuilt; positions from the old version would skip or repeat offers
+              return respond({ error: 'Sivutusavain on vanhentunut', code: 'cursor_expired' }, { status: 410 });
+            }
+            const { offers, hasMore, lastRank } = timing.time('query', () => offerIndex.queryAfter({
+              ...filters,
+              sortBy: cursor.sortBy,
+              afterRank: cursor.rank,
+              limit
+            }));
+            paginatedOffers = offers;
+            pagination = {
+              hasMore,
+              nextCursor: hasMore
+                ? encodeOfferCursor({ version: offerIndex.version, sortBy: cursor.sortBy, filterKey, rank: lastRank })
+                : null
+            };
+          } else {
+            // Indexed lookup: intersect postings and select only the requested page
+            let total;
+            ({ offers: paginatedOffers, total } = timing.time('query', () => offerIndex.query({
+              ...filters,
+              sortBy,
+              offset: Math.max(0, startIndex),
+              limit
+            })));
+
+            // Any page can hand over to cursors from its last offer
+            const hasMore = startIndex + limit < total;
+            const lastOffer = paginatedOffers[paginatedOffers.length - 1];
+            const { order, rank } = offerIndex.sortedView(sortBy);
+            pagination = {
+              total,
+              page,
+              totalPages: Math.ceil(total / limit),
+              hasMore,
+              nextCursor: hasMore && lastOffer
+                ? encodeOfferCursor({ version: offerIndex.version, sortBy: order, filterKey, rank: rank.get(lastOffer) })
+                : null
+            };
+          }
+        }
 
-        const startIndex = (page - 1) * limit;
-        const paginatedOffers = filteredOffers.slice(startIndex, startIndex + limit);
-
-        return NextResponse.json({
-          offers: paginatedOffers,
-          total: filteredOffers.length,
-          page,
-          totalPages: Math.ceil(filteredOffers.length / limit),
-          hasMore: startIndex + limit < filteredOffers.length
+        // Compact list view with provider/restaurant lookup tables unless fields= asks otherwise
+        const offersEntity = timing.time('serialize', () => {
+          const body = Buffer.from(JSON.stringify({
+            ...projectOffers(paginatedOffers, fields),
+            ...pagination
+          }));
+          return { body, etag: computeETag(body) };
         });
 
-      case 'providers':
-        return NextResponse.json(FINNISH_PROVIDERS);
+        // Always revalidate; unchanged pages cost a 304 instead of the body
+        return respondEntity(offersEntity, { 'Cache-Control': 'no-cache' });
+
+      case 'offers/export': {
+        // NDJSON dump of the whole catalog, read batch by batch as the client consumes it
+        const exportOptions = { provider: searchParams.get('provider') || null };
+        const fromSupabase = supabaseReadiness.getState() === READINESS_STATES.READY;
+        const readBatch = fromSupabase
+          ? supabaseBatchReader(exportOptions)
+          : catalogBatchReader((await timing.time('catalog', getOfferCatalog)).offers, exportOptions);
+
+        return timing.finish(new Response(createOfferExportStream(readBatch, {
+          fields: searchParams.get('fields') ? parseFields(searchParams.get('fields')) : null
+        }), {
+          headers: {
+            'Content-Type': 'application/x-ndjson; charset=utf-8',
+            'Content-Disposition': 'attachment; filename="offers.ndjson"',
+            'Cache-Control': 'no-store',
+            'X-Export-Source': fromSupabase ? 'supabase' : 'catalog'
+          }
+        }));
+      }
 
+      case 'providers':
       case 'cities':
-        const cities = [...new Set(FINNISH_RESTAURANTS.map(r => r.city))];
-        return NextResponse.json(cities);
-
       case 'cuisines':
-        const cuisines = [...new Set(FINNISH_RESTAURANTS.flatMap(r => r.cuisine_types))];
-        return NextResponse.json(cuisines);
+        return respondEntity(timing.time('serialize', () => staticListBody(path)), {
+          'Cache-Control': STATIC_CACHE_CONTROL
+        });
 
-      case 'stats':
-        const totalOffers = finnishOffers.length;
-        const averageDiscount = Math.round(finnishOffers.reduce((sum, offer) => sum + offer.discount_percent, 0) / totalOffers);
-        const totalSavings = finnishOffers.reduce((sum, offer) => sum + (offer.original_price - offer.discounted_price), 0);
+      case 'stats': {
+        const { offerCount: totalOffers, discountSum, savings } = (await timing.time('aggregates', getOfferAggregates)).global;
+        const averageDiscount = Math.round(discountSum / totalOffers);
         
-        return NextResponse.json({
+        return respond({
           totalOffers,
           activeProviders: FINNISH_PROVIDERS.length,
           averageDiscount,
-          totalSavings: Math.round(totalSavings),
+          totalSavings: Math.round(savings),
           cities: [...new Set(FINNISH_RESTAURANTS.map(r => r.city))].length
         });
+      }
 
       default:
-        return NextResponse.json({ 
+        return respond({ 
           message: 'FoodAi API - Suomen Ruokatarjousten Vertailupalvelu',
           status: 'Supabase integraatio toiminnassa...'
         });
     }
   } catch (error) {
     console.error('API Virhe:', error);
-    return NextResponse.json({ error: 'Sisäinen palvelinvirhe' }, { status: 500 });
+    return respond({ error: 'Sisäinen palvelinvirhe' }, { status: 500 });
   }
 }
 
 export async function POST(request) {
+  const { pathname } = new URL(request.url);
+  const path = pathname.split('/api/')[1] || '';
+  const timing = createRequestTimer(metricRoute('POST', path));
+  const respond = (body, init) => timing.finish(timing.time('serialize', () => NextResponse.json(body, init)));
+
   try {
-    const { pathname } = new URL(request.url);
-    const path = pathname.split('/api/')[1] || '';
-    const body = await request.json();
+    const body = await timing.time('parse', () => request.json());
 
     switch (path) {
       case 'clickouts':
         const { offerId, providerId, userId } = body;
+        const forwardedFor = request.headers.get('x-forwarded-for');
         
-        // Try to save to Supabase, fallback to console log
-        try {
-          const { data, error } = await supabase
-            .from('clickouts')
-            .insert([{
-              offer_id: offerId,
-              provider_id: providerId,
-              user_id: userId || null,
-              ip_address: request.headers.get('x-forwarded-for') || request.headers.get('x-real-ip') || 'unknown',
-              user_agent: request.headers.get('user-agent') || '',
-              referer: request.headers.get('referer') || '',
-              clicked_at: new Date().toISOString()
-            }])
-            .select();
-
-          if (error) throw error;
-          
-          console.log('Clickout saved to Supabase:', data);
-        } catch (supabaseError) {
-          // Fallback to console log if Supabase fails
-          console.log('Clickout tracked (Supabase unavailable):', {
-            offerId,
-            providerId,
-            userId,
-            timestamp: new Date().toISOString()
-          });
-        }
+        // Queue for a batched Supabase insert; the redirect never waits on the write
+        timing.time('enqueue', () => clickoutQueue.enqueue({
+          offer_id: offerId,
+          provider_id: providerId,
+          user_id: userId || null,
+          // ip_address is INET: first forwarded hop, or null so the row stays insertable
+          ip_address: (forwardedFor ? forwardedFor.split(',')[0].trim() : request.headers.get('x-real-ip')) || null,
+          user_agent: request.headers.get('user-agent') || '',
+          referer: request.headers.get('referer') || '',
+          clicked_at: new Date().toISOString()
+        }));
         
-        return NextResponse.json({ success: true, clickoutId: uuidv4() });
+        return respond({ success: true, clickoutId: uuidv4() });
 
       default:
-        return NextResponse.json({ error: 'Ei löydetty' }, { status: 404 });
+        return respond({ error: 'Ei löydetty' }, { status: 404 });
     }
   } catch (error) {
     console.error('POST API Virhe:', error);
-    return NextResponse.json({ error: 'Sisäinen palvelinvirhe' }, { status: 500 });
+    return respond({ error: 'Sisäinen palvelinvirhe' }, { status: 500 });
   }
 }
\ No newline at end of file
@@ -7,12 +7,15 @@
 
 import { NextResponse } from 'next/server';
 import { generateContextualResponse } from '../../../lib/deepseek.js';
-import { supabase } from '../../../lib/supabase.js';
+import { getChatOfferContext } from '../../../lib/catalog/chat-offers.js';
+import { buildChatCacheKey, chatResponseCache } from '../../../lib/chat-cache.js';
+import { createRequestTimer } from '../../../lib/metrics.js';
 
 /**
  * Handle POST requests for chat completions
  */
 export async function POST(request) {
+  const timing = createRequestTimer('POST chat');
   try {
     const { messages, includeOffers = true } = await request.json();
     
@@ -38,43 +41,23 @@ export async function POST(request) {
 
     let currentOffers = [];
     
-    // Fetch current offers to provide context if requested
+    // Pick the offers relevant to this conversation from the shared snapshot
     if (includeOffers) {
       try {
-        const { data: offers, error } = await supabase
-          .from('offers')
-          .select(`
-            *,
-            restaurants(name, city, cuisine_types),
-            providers(name)
-          `)
-          .eq('is_active', true)
-          .gte('ends_at', new Date().toISOString())
-          .order('discount_percentage', { ascending: false })
-          .limit(15);
-
-        if (!error && offers) {
-          currentOffers = offers.map(offer => ({
-            title: offer.title,
-            restaurant_name: offer.restaurants?.name || 'Unknown',
-            original_price: offer.original_price,
-            discounted_price: offer.discounted_price,
-            discount_percentage: offer.discount_percentage,
-            provider_name: offer.providers?.name || 'Unknown',
-            cuisine: offer.restaurants?.cuisine_types?.join(', ') || 'Mixed',
-            city: offer.restaurants?.city || 'Unknown'
-          }));
-        }
+        currentOffers = await timing.time('context', () => getChatOfferContext(messages, 15));
       } catch (error) {
         console.warn('Failed to fetch current offers for context:', error);
         // Continue without offers context
       }
     }
 
-    // Generate AI response with current offers context
-    const response = await generateContextualResponse(messages, currentOffers);
+    // Repeated conversations over the same offers are answered from cache
+    const cacheKey = buildChatCacheKey('chat', messages, { offers: currentOffers });
+    const response = await timing.time('completion', () => chatResponseCache.getOrLoad(cacheKey, () =>
+      generateContextualResponse(messages, currentOffers)
+    ));
     
-    return NextResponse.json(response);
+    return timing.finish(NextResponse.json(response));
   } catch (error) {
     console.error('Chat API Error:', error);
     
@@ -6,12 +6,15 @@
 
 import { NextResponse } from 'next/server';
 import { generateStreamingFoodDealResponse } from '../../../../lib/deepseek.js';
-import { supabase } from '../../../../lib/supabase.js';
+import { getChatOfferContext } from '../../../../lib/catalog/chat-offers.js';
+import { buildChatCacheKey, chatStreamCache } from '../../../../lib/chat-cache.js';
+import { createRequestTimer } from '../../../../lib/metrics.js';
 
 /**
  * Handle POST requests for streaming chat completions
  */
 export async function POST(request) {
+  const timing = createRequestTimer('POST chat/stream');
   try {
     const { messages, includeOffers = true } = await request.json();
     
@@ -24,50 +27,34 @@ export async function POST(request) {
 
     let currentOffers = [];
     
-    // Fetch current offers for context
+    // Pick relevant offers from the shared snapshot (no per-message DB query)
     if (includeOffers) {
       try {
-        const { data: offers, error } = await supabase
-          .from('offers')
-          .select(`
-            *,
-            restaurants(name, city, cuisine_types),
-            providers(name)
-          `)
-          .eq('is_active', true)
-          .gte('ends_at', new Date().toISOString())
-          .order('discount_percentage', { ascending: false })
-          .limit(10);
-
-        if (!error && offers) {
-          currentOffers = offers.map(offer => ({
-            title: offer.title,
-            restaurant_name: offer.restaurants?.name || 'Unknown',
-            original_price: offer.original_price,
-            discounted_price: offer.discounted_price,
-            discount_percentage: offer.discount_percentage,
-            provider_name: offer.providers?.name || 'Unknown',
-            cuisine: offer.restaurants?.cuisine_types?.join(', ') || 'Mixed'
-          }));
-        }
+        currentOffers = await timing.time('context', () => getChatOfferContext(messages, 10));
       } catch (error) {
         console.warn('Failed to fetch offers for streaming context:', error);
       }
     }
 
-    // Get streaming response from DeepSeek
-    const stream = await generateStreamingFoodDealResponse(messages, currentOffers);
+    // Replay a cached answer, join an identical stream in flight, or start a new one
+    const cacheKey = buildChatCacheKey('stream', messages, { offers: currentOffers });
+    const { chunks, cache } = await timing.time('open', () => chatStreamCache.open(cacheKey, async () => {
+      const stream = await generateStreamingFoodDealResponse(messages, currentOffers);
+      return (async function* () {
+        for await (const chunk of stream) {
+          const content = chunk.choices[0]?.delta?.content || '';
+          if (content) yield content;
+        }
+      })();
+    }));
 
     const encoder = new TextEncoder();
     const readable = new ReadableStream({
       async start(controller) {
         try {
-          for await (const chunk of stream) {
-            const content = chunk.choices[0]?.delta?.content || '';
-            if (content) {
-              const sseData = `data: ${JSON.stringify({ content })}\n\n`;
-              controller.enqueue(encoder.encode(sseData));
-            }
+          for await (const content of chunks) {
+            const sseData = `data: ${JSON.stringify({ content })}\n\n`;
+            controller.enqueue(encoder.encode(sseData));
           }
           // Send completion signal
           controller.enqueue(encoder.encode('data: [DONE]\n\n'));
@@ -84,16 +71,18 @@ export async function POST(request) {
       },
     });
 
-    return new Response(readable, {
+    // Server-Timing covers the work before the first byte; the body streams afterwards
+    return timing.finish(new Response(readable, {
       headers: {
         'Content-Type': 'text/event-stream',
         'Cache-Control': 'no-cache',
         'Connection': 'keep-alive',
+        'X-Chat-Cache': cache,
         'Access-Control-Allow-Origin': '*',
         'Access-Control-Allow-Methods': 'POST',
         'Access-Control-Allow-Headers': 'Content-Type',
       },
-    });
+    }));
   } catch (error) {
     console.error('Streaming Chat API Error:', error);
     
@@ -19,6 +19,7 @@ import Footer from '@/components/Footer';
 
 export default function FoodAi() {
   const [offers, setOffers] = useState([]);
+  const [offerLookups, setOfferLookups] = useState({ providers: {}, restaurants: {} });
   const [loading, setLoading] = useState(true);
   const [providers, setProviders] = useState([]);
   const [cities, setCities] = useState([]);
@@ -106,6 +107,8 @@ export default function FoodAi() {
       const response = await fetch(`/api/offers?${params}`);
       const data = await response.json();
       setOffers(data.offers || []);
+      // Provider and restaurant details come once per page, keyed by id
+      setOfferLookups({ providers: data.providers || {}, restaurants: data.restaurants || {} });
       setTotalPages(data.totalPages || 1);
     } catch (error) {
       console.error('Error fetching offers:', error);
@@ -623,7 +626,7 @@ export default function FoodAi() {
                         />
                         <div className="absolute top-2 right-2">
                           <Badge className="fast-food-discount">
-                            {offer.discount_percentage}%
+                            {offer.discount_percent}%
                           </Badge>
                         </div>
                         <div className="absolute bottom-2 left-2">
@@ -631,7 +634,7 @@ export default function FoodAi() {
                             variant="secondary" 
                             className="bg-white/90 text-gray-800 font-medium"
                           >
-                            {providers.find(p => p.id === offer.provider_id)?.name}
+                            {offerLookups.providers[offer.provider_id]?.name}
                           </Badge>
                         </div>
                       </div>
@@ -647,10 +650,10 @@ export default function FoodAi() {
                         
                         <div className="flex items-center gap-2">
                           <MapPin className="h-4 w-4 text-gray-400" />
-                          <span className="text-sm text-muted-foreground">{offer.restaurant_name}</span>
+                          <span className="text-sm text-muted-foreground">{offerLookups.restaurants[offer.restaurant_id]?.name}</span>
                           <div className="flex items-center gap-1 ml-auto">
                             <Star className="h-4 w-4 text-yellow-400 fill-current" />
-                            <span className="text-sm font-medium">{offer.rating || 4.5}</span>
+                            <span className="text-sm font-medium">{offerLookups.restaurants[offer.restaurant_id]?.rating || 4.5}</span>
                           </div>
                         </div>
                         
@@ -8,6 +8,15 @@ import requests
 import json
 import time
 import os
+import sys
+import math
+import random
+import argparse
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
 from typing import Dict, List, Any
 
 # Get base URL from environment
@@ -15,10 +24,33 @@ BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://mealdeals.preview.emergent
 API_BASE = f"{BASE_URL}/api"
 
 class FoodAITester:
-    def __init__(self):
+    def __init__(self, api_base: str = API_BASE, image_host: str = None):
+        self.api_base = api_base
+        self.image_host = image_host  # e.g. the stand-in server, to check images offline
         self.results = []
         self.total_tests = 0
         self.passed_tests = 0
+        self.records = []  # structured check and request records (see write_results)
+        self.pending_requests = []
+        self.session = requests.Session()
+        self.session.hooks['response'].append(self.record_response)
+
+    def record_response(self, response, *args, **kwargs):
+        """Session hook: time the whole response and keep a request record"""
+        read_start = time.perf_counter()
+        size = None if kwargs.get('stream') else len(response.content)
+        read_ms = (time.perf_counter() - read_start) * 1000
+        url = urlsplit(response.request.url)
+        self.pending_requests.append({
+            'kind': 'request',
+            'method': response.request.method,
+            'endpoint': url.path,
+            'params': url.query,
+            'status': response.status_code,
+            'latency_ms': round(response.elapsed.total_seconds() * 1000 + read_ms, 2),
+            'bytes': size
+        })
+        return response
         
     def log_result(self, test_name: str, passed: bool, details: str = ""):
         """Log test result"""
@@ -35,13 +67,20 @@ class FoodAITester:
             
         self.results.append(result)
         print(result)
+
+        # Requests made since the previous check belong to this one
+        for record in self.pending_requests:
+            record['check'] = test_name
+        self.records.extend(self.pending_requests)
+        self.pending_requests = []
+        self.records.append({'kind': 'check', 'check': test_name, 'passed': passed, 'details': details})
         
     def test_basic_api_health(self):
         """Test basic API health and connectivity"""
         print("\n=== BASIC API HEALTH TESTS ===")
         
         try:
-            response = requests.get(f"{API_BASE}", timeout=10)
+            response = self.session.get(f"{self.api_base}", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 self.log_result("Basic API Health", True, f"Status: {data.get('status', 'OK')}")
@@ -55,7 +94,7 @@ class FoodAITester:
         print("\n=== PROVIDERS API TESTS ===")
         
         try:
-            response = requests.get(f"{API_BASE}/providers", timeout=10)
+            response = self.session.get(f"{self.api_base}/providers", timeout=10)
             if response.status_code == 200:
                 providers = response.json()
                 
@@ -86,7 +125,7 @@ class FoodAITester:
         print("\n=== CITIES API TESTS ===")
         
         try:
-            response = requests.get(f"{API_BASE}/cities", timeout=10)
+            response = self.session.get(f"{self.api_base}/cities", timeout=10)
             if response.status_code == 200:
                 cities = response.json()
                 
@@ -105,7 +144,7 @@ class FoodAITester:
         print("\n=== CUISINES API TESTS ===")
         
         try:
-            response = requests.get(f"{API_BASE}/cuisines", timeout=10)
+            response = self.session.get(f"{self.api_base}/cuisines", timeout=10)
             if response.status_code == 200:
                 cuisines = response.json()
                 
@@ -125,7 +164,7 @@ class FoodAITester:
         
         # Test basic offers
         try:
-            response = requests.get(f"{API_BASE}/offers", timeout=15)
+            response = self.session.get(f"{self.api_base}/offers", timeout=15)
             if response.status_code == 200:
                 data = response.json()
                 
@@ -163,7 +202,7 @@ class FoodAITester:
         
         # Test offers with price filter (up to 200€)
         try:
-            response = requests.get(f"{API_BASE}/offers?maxPrice=150", timeout=10)
+            response = self.session.get(f"{self.api_base}/offers?maxPrice=150", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('offers'):
@@ -180,7 +219,7 @@ class FoodAITester:
         
         # Test offers with city filter
         try:
-            response = requests.get(f"{API_BASE}/offers?city=Helsinki", timeout=10)
+            response = self.session.get(f"{self.api_base}/offers?city=Helsinki", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 self.log_result("Offers API - City Filter", True,
@@ -192,7 +231,7 @@ class FoodAITester:
         
         # Test offers with pagination
         try:
-            response = requests.get(f"{API_BASE}/offers?page=1&limit=5", timeout=10)
+            response = self.session.get(f"{self.api_base}/offers?page=1&limit=5", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 correct_pagination = (data.get('page') == 1 and 
@@ -209,7 +248,7 @@ class FoodAITester:
         print("\n=== STATS API TESTS ===")
         
         try:
-            response = requests.get(f"{API_BASE}/stats", timeout=10)
+            response = self.session.get(f"{self.api_base}/stats", timeout=10)
             if response.status_code == 200:
                 stats = response.json()
                 
@@ -235,7 +274,7 @@ class FoodAITester:
                 "userId": "test-user-456"
             }
             
-            response = requests.post(f"{API_BASE}/clickouts", 
+            response = self.session.post(f"{self.api_base}/clickouts", 
                                    json=clickout_data, 
                                    timeout=10)
             
@@ -256,7 +295,7 @@ class FoodAITester:
         
         # Test GET endpoint info
         try:
-            response = requests.get(f"{API_BASE}/chat", timeout=10)
+            response = self.session.get(f"{self.api_base}/chat", timeout=10)
             if response.status_code == 200:
                 info = response.json()
                 is_chat_api = info.get('service') == 'FoodAI Chat API'
@@ -280,7 +319,7 @@ class FoodAITester:
                 "includeOffers": True
             }
             
-            response = requests.post(f"{API_BASE}/chat", 
+            response = self.session.post(f"{self.api_base}/chat", 
                                    json=finnish_message, 
                                    timeout=30)
             
@@ -308,7 +347,7 @@ class FoodAITester:
                 "includeOffers": True
             }
             
-            response = requests.post(f"{API_BASE}/chat",
+            response = self.session.post(f"{self.api_base}/chat",
                                    json=english_message,
                                    timeout=30)
             
@@ -335,7 +374,7 @@ class FoodAITester:
                 ]
             }
             
-            response = requests.post(f"{API_BASE}/chat",
+            response = self.session.post(f"{self.api_base}/chat",
                                    json=invalid_message,
                                    timeout=10)
             
@@ -353,7 +392,7 @@ class FoodAITester:
         try:
             empty_request = {}
             
-            response = requests.post(f"{API_BASE}/chat",
+            response = self.session.post(f"{self.api_base}/chat",
                                    json=empty_request,
                                    timeout=10)
             
@@ -382,7 +421,7 @@ class FoodAITester:
                 "includeOffers": True
             }
             
-            response = requests.post(f"{API_BASE}/chat/stream",
+            response = self.session.post(f"{self.api_base}/chat/stream",
                                    json=streaming_message,
                                    timeout=30,
                                    stream=True)
@@ -411,7 +450,7 @@ class FoodAITester:
         
         # Test OPTIONS request for CORS
         try:
-            response = requests.options(f"{API_BASE}/chat/stream", timeout=10)
+            response = self.session.options(f"{self.api_base}/chat/stream", timeout=10)
             if response.status_code == 200:
                 cors_headers = response.headers.get('Access-Control-Allow-Origin', '')
                 has_cors = cors_headers == '*'
@@ -433,7 +472,7 @@ class FoodAITester:
         for provider in providers_to_test:
             try:
                 # Test provider-specific offers (should be included in main offers endpoint)
-                response = requests.get(f"{API_BASE}/offers?provider={provider}", timeout=10)
+                response = self.session.get(f"{self.api_base}/offers?provider={provider}", timeout=10)
                 if response.status_code == 200:
                     data = response.json()
                     provider_offers = [offer for offer in data.get('offers', []) 
@@ -455,7 +494,7 @@ class FoodAITester:
         
         try:
             # Get some offers to test their image URLs
-            response = requests.get(f"{API_BASE}/offers?limit=3", timeout=10)
+            response = self.session.get(f"{self.api_base}/offers?limit=3", timeout=10)
             if response.status_code == 200:
                 data = response.json()
                 offers = data.get('offers', [])
@@ -469,7 +508,10 @@ class FoodAITester:
                         if image_url:
                             total_images += 1
                             try:
-                                img_response = requests.head(image_url, timeout=5)
+                                if self.image_host:
+                                    parts = urlsplit(image_url)
+                                    image_url = f"{self.image_host}{parts.path}?{parts.query}"
+                                img_response = self.session.head(image_url, timeout=5)
                                 if img_response.status_code == 200:
                                     working_images += 1
                             except:
@@ -488,7 +530,7 @@ class FoodAITester:
     def run_all_tests(self):
         """Run all backend tests"""
         print("🚀 Starting FoodAI Backend Testing Suite")
-        print(f"Testing against: {API_BASE}")
+        print(f"Testing against: {self.api_base}")
         print("=" * 60)
         
         # Run all test categories
@@ -520,7 +562,441 @@ class FoodAITester:
         
         return self.passed_tests == self.total_tests
 
+# Default request mix for load mode: name -> weight, method, candidate paths, JSON body
+LOAD_MIX = {
+    'offers': {'weight': 4, 'method': 'GET', 'paths': ['/offers', '/offers?page=2', '/offers?page=1&limit=24']},
+    'offers_filtered': {'weight': 4, 'method': 'GET', 'paths': [
+        '/offers?city=Helsinki',
+        '/offers?city=Tampere&sortBy=price',
+        '/offers?cuisine=Pizza&minDiscount=30',
+        '/offers?maxPrice=15&sortBy=rating',
+        '/offers?provider=wolt&sortBy=discount',
+        '/offers?city=Espoo&cuisine=Sushi&maxPrice=40'
+    ]},
+    'stats': {'weight': 2, 'method': 'GET', 'paths': ['/stats']},
+    'providers': {'weight': 1, 'method': 'GET', 'paths': ['/providers']},
+    'clickouts': {'weight': 1, 'method': 'POST', 'paths': ['/clickouts'], 'body': {
+        "offerId": "load-test-offer",
+        "providerId": "wolt",
+        "userId": "load-test-user"
+    }}
+}
+
+def parse_mix(spec: str) -> Dict[str, Dict[str, Any]]:
+    """Parse a mix override like 'offers=5,stats=1' into a weighted LOAD_MIX subset"""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in LOAD_MIX:
+            raise ValueError(f"Unknown endpoint in mix: {name} (choose from {', '.join(LOAD_MIX)})")
+        mix[name] = {**LOAD_MIX[name], 'weight': float(weight or 1)}
+    return mix
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+_thread_state = threading.local()
+
+def thread_session() -> requests.Session:
+    """One keep-alive session per worker thread (Session is not thread-safe)"""
+    if not hasattr(_thread_state, 'session'):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _thread_state.session = session
+    return _thread_state.session
+
+class LoadTester:
+    """Drive the API with a weighted request mix from a pool of workers"""
+
+    def __init__(self, api_base: str = API_BASE, workers: int = 8, duration: float = 30,
+                 rps: float = 0, mix: Dict[str, Dict[str, Any]] = None, timeout: float = 10):
+        self.api_base = api_base
+        self.workers = workers
+        self.duration = duration
+        self.rps = rps
+        self.mix = mix or LOAD_MIX
+        self.timeout = timeout
+        self.samples = {name: [] for name in self.mix}
+        self.errors = {name: 0 for name in self.mix}
+        self.bytes = {name: 0 for name in self.mix}
+        self.lock = threading.Lock()
+        self.names = list(self.mix)
+        self.weights = [self.mix[name]['weight'] for name in self.names]
+
+    def send(self, name: str):
+        """Send one request for an endpoint and record its latency"""
+        spec = self.mix[name]
+        url = f"{self.api_base}{random.choice(spec['paths'])}"
+        failed = False
+        size = 0
+        start = time.perf_counter()
+        try:
+            response = thread_session().request(spec['method'], url, json=spec.get('body'), timeout=self.timeout)
+            size = len(response.content)  # include body transfer in the latency
+            failed = response.status_code >= 400
+        except requests.RequestException:
+            failed = True
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        with self.lock:
+            self.samples[name].append(elapsed_ms)
+            self.bytes[name] += size
+            if failed:
+                self.errors[name] += 1
+
+    def worker(self, slots, started: float, deadline: float):
+        rng = random.Random()
+        while True:
+            if self.rps > 0:
+                # Open loop: request k is due at started + k / rps, whoever is free takes it
+                with self.lock:
+                    due = started + next(slots) / self.rps
+                if due >= deadline:
+                    return
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            elif time.perf_counter() >= deadline:
+                return
+            self.send(rng.choices(self.names, weights=self.weights)[0])
+
+    def run(self) -> Dict[str, Dict[str, float]]:
+        """Run the load test and return per-endpoint statistics"""
+        print(f"🔥 Load test against {self.api_base}: {self.workers} workers, {self.duration}s, "
+              f"{'target ' + str(self.rps) + ' RPS' if self.rps > 0 else 'unthrottled'}")
+        slots = itertools.count()
+        started = time.perf_counter()
+        deadline = started + self.duration
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for _ in range(self.workers):
+                pool.submit(self.worker, slots, started, deadline)
+        self.elapsed = time.perf_counter() - started
+        return self.report()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Summarize latency percentiles, throughput and error rate per endpoint"""
+        report = {}
+        all_samples = []
+        for name in self.names:
+            latencies = sorted(self.samples[name])
+            all_samples.extend(latencies)
+            report[name] = self.summarize(latencies, self.errors[name], self.bytes[name])
+        report['total'] = self.summarize(sorted(all_samples), sum(self.errors.values()), sum(self.bytes.values()))
+        return report
+
+    def summarize(self, latencies: List[float], errors: int, total_bytes: int) -> Dict[str, float]:
+        count = len(latencies)
+        return {
+            'requests': count,
+            'errors': errors,
+            'error_rate': errors / count * 100 if count else 0.0,
+            'throughput': count / self.elapsed if self.elapsed else 0.0,
+            'avg_bytes': total_bytes / count if count else 0.0,
+            'p50': percentile(latencies, 50),
+            'p90': percentile(latencies, 90),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else 0.0
+        }
+
+    def records(self, report: Dict[str, Dict[str, float]]) -> List[Dict[str, Any]]:
+        """Report rows as structured records"""
+        return [{'kind': 'load', 'endpoint': name, 'params': json.dumps(self.mix[name]['paths']) if name in self.mix else '',
+                 **row} for name, row in report.items()]
+
+    def print_report(self, report: Dict[str, Dict[str, float]]):
+        print("\n" + "=" * 60)
+        print("📊 LOAD TEST RESULTS (latency in ms)")
+        print(f"{'endpoint':<16}{'reqs':>7}{'rps':>8}{'err%':>7}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}")
+        for name, row in report.items():
+            print(f"{name:<16}{row['requests']:>7}{row['throughput']:>8.1f}{row['error_rate']:>7.1f}"
+                  f"{row['p50']:>8.1f}{row['p90']:>8.1f}{row['p99']:>8.1f}{row['max']:>8.1f}")
+
+# Prompts for the streaming benchmark (typical first-turn questions)
+STREAM_PROMPTS = [
+    "Mitkä ovat parhaat pizzatarjoukset Helsingissä tänään?",
+    "Halvin sushi Tampereella?",
+    "Show me burger deals in Oulu under 10 euros",
+    "Onko ResQ Clubilla ylijäämäruokaa Turussa?",
+    "Best Thai food discounts in Lahti"
+]
+
+STREAM_METRICS = ('ttfb', 'ttfc', 'gap', 'duration', 'tokens_per_sec')
+
+class StreamBenchmark:
+    """Measure perceived speed of /chat/stream across concurrent streams"""
+
+    def __init__(self, api_base: str = API_BASE, streams: int = 20, concurrency: int = 5,
+                 unique_prompts: bool = False, timeout: float = 60):
+        self.api_base = api_base
+        self.streams = streams
+        self.concurrency = concurrency
+        self.unique_prompts = unique_prompts
+        self.timeout = timeout
+        self.stream_results = []
+        self.lock = threading.Lock()
+
+    def prompt(self, index: int) -> str:
+        text = STREAM_PROMPTS[index % len(STREAM_PROMPTS)]
+        # A nonce defeats the response cache so every stream goes upstream
+        return f"{text} (#{index})" if self.unique_prompts else text
+
+    def run_stream(self, index: int) -> Dict[str, Any]:
+        """Open one stream, parse SSE frames up to [DONE] and time them"""
+        record = {'ttfb': None, 'ttfc': None, 'duration': None, 'gaps': [], 'chunks': 0,
+                  'chars': 0, 'cache': None, 'error': None}
+        body = {"messages": [{"role": "user", "content": self.prompt(index)}], "includeOffers": True}
+        start = time.perf_counter()
+        try:
+            response = thread_session().post(f"{self.api_base}/chat/stream", json=body,
+                                             timeout=self.timeout, stream=True)
+            record['ttfb'] = (time.perf_counter() - start) * 1000
+            record['cache'] = response.headers.get('X-Chat-Cache')
+            if response.status_code != 200:
+                record['error'] = f"HTTP {response.status_code}"
+                response.close()
+                return record
+
+            buffer = b''
+            last_chunk_at = None
+            done = False
+            for data in response.iter_content(chunk_size=None):
+                buffer += data
+                while b'\n\n' in buffer and not done:
+                    frame, buffer = buffer.split(b'\n\n', 1)
+                    if not frame.startswith(b'data: '):
+                        continue
+                    payload = frame[6:].decode('utf-8')
+                    if payload == '[DONE]':
+                        done = True
+                        break
+                    message = json.loads(payload)
+                    if 'error' in message:
+                        record['error'] = message['error']
+                        continue
+                    now = time.perf_counter()
+                    if last_chunk_at is None:
+                        record['ttfc'] = (now - start) * 1000
+                    else:
+                        record['gaps'].append((now - last_chunk_at) * 1000)
+                    last_chunk_at = now
+                    record['chunks'] += 1
+                    record['chars'] += len(message.get('content', ''))
+                if done:
+                    break
+            response.close()
+            record['duration'] = (time.perf_counter() - start) * 1000
+            if not done and not record['error']:
+                record['error'] = 'stream ended without [DONE]'
+        except (requests.RequestException, ValueError) as e:
+            record['error'] = str(e)
+        return record
+
+    def run(self) -> Dict[str, Any]:
+        print(f"📡 Streaming benchmark against {self.api_base}: {self.streams} streams, "
+              f"{self.concurrency} concurrent{', unique prompts' if self.unique_prompts else ''}")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            self.stream_results = list(pool.map(self.run_stream, range(self.streams)))
+        self.elapsed = time.perf_counter() - started
+        return self.report()
+
+    def report(self) -> Dict[str, Any]:
+        """Percentiles for TTFB, time to first content, inter-chunk gaps, duration and tokens/sec"""
+        ok = [record for record in self.stream_results if not record['error']]
+
+        def distribution(values: List[float]) -> Dict[str, float]:
+            values = sorted(values)
+            return {'p50': percentile(values, 50), 'p90': percentile(values, 90), 'p95': percentile(values, 95),
+                    'p99': percentile(values, 99), 'max': values[-1] if values else 0.0}
+
+        # Each SSE content frame carries one upstream delta (roughly one token)
+        rates = [record['chunks'] / ((record['duration'] - record['ttfc']) / 1000)
+                 for record in ok if record['chunks'] > 1 and record['duration'] > record['ttfc']]
+        cache = {}
+        for record in self.stream_results:
+            cache[record['cache'] or 'n/a'] = cache.get(record['cache'] or 'n/a', 0) + 1
+
+        return {
+            'streams': len(self.stream_results),
+            'errors': len(self.stream_results) - len(ok),
+            'error_rate': ((len(self.stream_results) - len(ok)) / len(self.stream_results) * 100
+                           if self.stream_results else 0.0),
+            'cache': cache,
+            'ttfb': distribution([record['ttfb'] for record in ok]),
+            'ttfc': distribution([record['ttfc'] for record in ok if record['ttfc'] is not None]),
+            'gap': distribution([gap for record in ok for gap in record['gaps']]),
+            'duration': distribution([record['duration'] for record in ok]),
+            'tokens_per_sec': distribution(rates)
+        }
+
+    def records(self, report: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Report metrics as structured records"""
+        params = json.dumps({'streams': self.streams, 'concurrency': self.concurrency,
+                             'unique_prompts': self.unique_prompts})
+        return [{'kind': 'stream', 'endpoint': '/chat/stream', 'metric': metric, 'params': params,
+                 'streams': report['streams'], 'errors': report['errors'], **report[metric]}
+                for metric in STREAM_METRICS]
+
+    def print_report(self, report: Dict[str, Any]):
+        print("\n" + "=" * 60)
+        print("📊 STREAMING BENCHMARK RESULTS (times in ms)")
+        print(f"streams: {report['streams']}, errors: {report['errors']} ({report['error_rate']:.1f}%), "
+              f"cache: {report['cache']}")
+        print(f"{'metric':<16}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+        for metric in STREAM_METRICS:
+            row = report[metric]
+            print(f"{metric:<16}{row['p50']:>9.1f}{row['p90']:>9.1f}{row['p99']:>9.1f}{row['max']:>9.1f}")
+        for record in self.stream_results:
+            if record['error']:
+                print(f"  ❌ {record['error']}")
+                break
+
+def write_results(path: str, results: Dict[str, Any]):
+    """Write run results as JSON, or as one CSV row per record when path ends in .csv"""
+    if path.endswith('.csv'):
+        import csv
+        fields = []
+        for record in results['records']:
+            fields.extend(field for field in record if field not in fields)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(results['records'])
+    else:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"💾 Wrote {len(results['records'])} records to {path}")
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Load results written by write_results (JSON)"""
+    with open(path) as f:
+        return json.load(f)
+
+def summarize_records(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """p95 latency (ms) and payload bytes per comparable key"""
+    grouped = {}
+    for record in records:
+        kind = record['kind']
+        if kind == 'request':
+            key = f"{record['method']} {record['endpoint']}" + (f"?{record['params']}" if record['params'] else '')
+            entry = grouped.setdefault(key, {'latencies': [], 'bytes': None})
+            entry['latencies'].append(record['latency_ms'])
+            if record['bytes'] is not None:
+                entry['bytes'] = max(entry['bytes'] or 0, record['bytes'])
+        elif kind == 'load':
+            grouped[f"load {record['endpoint']}"] = {'latencies': None, 'p95': record['p95'], 'bytes': record['avg_bytes']}
+        elif kind == 'stream' and record['metric'] != 'tokens_per_sec':
+            grouped[f"stream {record['metric']}"] = {'latencies': None, 'p95': record['p95'], 'bytes': None}
+
+    summary = {}
+    for key, entry in grouped.items():
+        p95 = percentile(sorted(entry['latencies']), 95) if entry['latencies'] is not None else entry['p95']
+        summary[key] = {'p95_ms': p95, 'bytes': entry['bytes']}
+    return summary
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], latency_threshold: float = 0.2,
+                    bytes_threshold: float = 0.1, min_latency_delta_ms: float = 5) -> List[str]:
+    """Compare a run against a baseline; returns the regressions found"""
+    now = summarize_records(current['records'])
+    before = summarize_records(baseline['records'])
+    regressions = []
+
+    print("\n" + "=" * 60)
+    print(f"📐 BASELINE COMPARISON (p95 +{latency_threshold:.0%}, bytes +{bytes_threshold:.0%})")
+    print(f"{'key':<52}{'p95 base':>10}{'p95 now':>10}{'bytes base':>12}{'bytes now':>12}")
+    for key in sorted(now.keys() & before.keys()):
+        a, b = before[key], now[key]
+        flags = []
+        if (b['p95_ms'] > a['p95_ms'] * (1 + latency_threshold) and
+                b['p95_ms'] - a['p95_ms'] >= min_latency_delta_ms):
+            flags.append('latency')
+        if a['bytes'] and b['bytes'] is not None and b['bytes'] > a['bytes'] * (1 + bytes_threshold):
+            flags.append('bytes')
+        marker = f"  ❌ {'+'.join(flags)}" if flags else ''
+        size = lambda value: '-' if value is None else f"{value:.0f}"
+        print(f"{key[:51]:<52}{a['p95_ms']:>10.1f}{b['p95_ms']:>10.1f}"
+              f"{size(a['bytes']):>12}{size(b['bytes']):>12}{marker}")
+        for flag in flags:
+            regressions.append(f"{key}: {flag} regression")
+
+    missing = sorted(before.keys() - now.keys())
+    if missing:
+        print(f"ℹ️  {len(missing)} baseline keys not in this run (e.g. {missing[0]})")
+    if regressions:
+        print(f"⚠️  {len(regressions)} regressions beyond threshold")
+    else:
+        print("🎉 No regressions against baseline")
+    return regressions
+
 if __name__ == "__main__":
-    tester = FoodAITester()
-    success = tester.run_all_tests()
-    exit(0 if success else 1)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="FoodAI backend tests and load runner")
+    parser.add_argument('--load', action='store_true', help="run the concurrent load test instead of the functional suite")
+    parser.add_argument('--workers', type=int, default=8, help="concurrent workers (load mode)")
+    parser.add_argument('--duration', type=float, default=30, help="test duration in seconds (load mode)")
+    parser.add_argument('--rps', type=float, default=0, help="target requests per second, 0 = as fast as possible (load mode)")
+    parser.add_argument('--mix', default='', help="weighted endpoint mix, e.g. offers=5,offers_filtered=3,stats=1 (load mode)")
+    parser.add_argument('--stream-bench', action='store_true', help="run the streaming chat benchmark")
+    parser.add_argument('--streams', type=int, default=20, help="number of streams (stream benchmark)")
+    parser.add_argument('--concurrency', type=int, default=5, help="concurrent streams (stream benchmark)")
+    parser.add_argument('--unique-prompts', action='store_true', help="make every prompt unique to bypass the chat cache (stream benchmark)")
+    parser.add_argument('--standin', action='store_true', help="run against the local stand-in server instead of BASE_URL")
+    parser.add_argument('--latency-ms', type=float, default=0, help="stand-in latency per request")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="stand-in latency jitter (+/-)")
+    parser.add_argument('--failure-rate', type=float, default=0, help="fraction of stand-in requests answered with 503")
+    parser.add_argument('--output', help="write structured results to a .json or .csv file")
+    parser.add_argument('--baseline', help="compare against a saved JSON run; exit 2 on regressions")
+    parser.add_argument('--compare', help="compare this saved JSON run instead of running tests (use with --baseline)")
+    parser.add_argument('--latency-threshold', type=float, default=0.2, help="allowed p95 latency growth (0.2 = +20%%)")
+    parser.add_argument('--bytes-threshold', type=float, default=0.1, help="allowed payload size growth (0.1 = +10%%)")
+    args = parser.parse_args()
+
+    success = True
+    if args.compare:
+        results = load_results(args.compare)
+    else:
+        api_base = API_BASE
+        if args.standin:
+            from tests.standin_server import start_standin_server
+            standin, api_base = start_standin_server(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                                     failure_rate=args.failure_rate)
+
+        if args.stream_bench:
+            benchmark = StreamBenchmark(api_base=api_base, streams=args.streams, concurrency=args.concurrency,
+                                        unique_prompts=args.unique_prompts)
+            report = benchmark.run()
+            benchmark.print_report(report)
+            mode, records = 'stream', benchmark.records(report)
+        elif args.load:
+            load_tester = LoadTester(api_base=api_base, workers=args.workers, duration=args.duration, rps=args.rps,
+                                     mix=parse_mix(args.mix) if args.mix else None)
+            report = load_tester.run()
+            load_tester.print_report(report)
+            mode, records = 'load', load_tester.records(report)
+        else:
+            tester = FoodAITester(api_base, image_host=standin.base_url if args.standin else None)
+            success = tester.run_all_tests()
+            mode, records = 'functional', tester.records
+
+        results = {
+            'meta': {'mode': mode, 'api_base': api_base, 'standin': args.standin,
+                     'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())},
+            'records': records
+        }
+        if args.output:
+            write_results(args.output, results)
+
+    exit_code = 0 if success else 1
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.latency_threshold,
+                                      args.bytes_threshold)
+        if regressions:
+            exit_code = 2
+    sys.exit(exit_code)
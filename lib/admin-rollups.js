@@ -0,0 +1,170 @@
+/**
+ * Clickout and Commission Rollups for the FoodAI admin dashboard
+ *
+ * Reads the hourly/daily rollup tables that Postgres maintains incrementally
+ * from `clickouts` (see supabase_schema.sql), with keyset pagination on
+ * (bucket_start DESC, id DESC) so each page costs the same regardless of how
+ * much click history exists.
+ */
+
+import { supabase } from './supabase.js';
+import { trackUpstream } from './metrics.js';
+
+const ROLLUP_COLUMNS = 'id, bucket_start, provider_id, offer_id, clicks, conversions, conversion_value, commission_earned, last_clicked_at, updated_at';
+const MAX_PAGE_SIZE = 100;
+
+// Rollup ids are bigserial; anything else in a cursor is rejected
+const ROLLUP_ID_PATTERN = /^[1-9]\d{0,18}$/;
+
+/**
+ * Encode a keyset position as an opaque cursor
+ * @param {Object} row - Last row of the current page
+ * @returns {string} Cursor string
+ */
+export function encodeRollupCursor(row) {
+  return Buffer.from(JSON.stringify({ b: row.bucket_start, i: row.id })).toString('base64url');
+}
+
+/**
+ * Decode a cursor produced by encodeRollupCursor
+ * @param {string} cursor - Cursor string
+ * @returns {Object|null} { bucketStart, id } or null when missing or malformed
+ *
+ * Both values end up in a PostgREST filter string, so they are rebuilt from
+ * parsed values (an ISO timestamp and a digits-only id) rather than passed through.
+ */
+export function decodeRollupCursor(cursor) {
+  if (!cursor) return null;
+  try {
+    const { b, i } = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    const time = typeof b === 'string' ? Date.parse(b) : NaN;
+    const id = typeof i === 'number' || typeof i === 'string' ? String(i) : '';
+    if (Number.isNaN(time) || !ROLLUP_ID_PATTERN.test(id)) return null;
+    return { bucketStart: new Date(time).toISOString(), id };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Read one keyset page from a rollup table
+ * @param {string} table - Rollup table name
+ * @param {Object} options - { cursor, limit, provider, conversionsOnly }
+ * @returns {Promise<Object>} { rows, nextCursor }
+ */
+async function readRollupPage(table, { cursor, limit = 20, provider = null, conversionsOnly = false }) {
+  const pageSize = Math.min(Math.max(parseInt(limit) || 20, 1), MAX_PAGE_SIZE);
+  const position = decodeRollupCursor(cursor);
+
+  let query = supabase
+    .from(table)
+    .select(ROLLUP_COLUMNS)
+    .order('bucket_start', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(pageSize + 1);
+
+  if (provider && provider !== 'all') {
+    query = query.eq('provider_id', provider);
+  }
+  if (conversionsOnly) {
+    query = query.gt('conversions', 0);
+  }
+  if (position) {
+    query = query.or(
+      `bucket_start.lt."${position.bucketStart}",and(bucket_start.eq."${position.bucketStart}",id.lt.${position.id})`
+    );
+  }
+
+  const { data, error } = await trackUpstream('supabase', () => query);
+  if (error) throw error;
+
+  const rows = data.slice(0, pageSize);
+  const nextCursor = data.length > pageSize ? encodeRollupCursor(rows[rows.length - 1]) : null;
+  return { rows, nextCursor };
+}
+
+/**
+ * Look up offer titles and provider names for a page of rollup rows
+ * @param {Array} rows - Rollup rows
+ * @returns {Promise<Object>} { offerTitles: Map, providerNames: Map }
+ */
+async function loadLabels(rows) {
+  const offerIds = [...new Set(rows.map(row => row.offer_id).filter(Boolean))];
+  const providerIds = [...new Set(rows.map(row => row.provider_id).filter(Boolean))];
+
+  const [offersResult, providersResult] = await Promise.all([
+    offerIds.length > 0
+      ? trackUpstream('supabase', () => supabase.from('offers').select('id, title').in('id', offerIds))
+      : { data: [] },
+    providerIds.length > 0
+      ? trackUpstream('supabase', () => supabase.from('providers').select('id, name').in('id', providerIds))
+      : { data: [] }
+  ]);
+
+  return {
+    offerTitles: new Map((offersResult.data || []).map(offer => [offer.id, offer.title])),
+    providerNames: new Map((providersResult.data || []).map(provider => [provider.id, provider.name]))
+  };
+}
+
+/**
+ * Hourly clickout rollups per provider and offer, newest first
+ * @param {Object} options - { cursor, limit, provider }
+ * @returns {Promise<Object>} { data, nextCursor }
+ */
+export async function fetchClickoutRollups(options = {}) {
+  const { rows, nextCursor } = await readRollupPage('clickout_rollups_hourly', options);
+  const { offerTitles, providerNames } = await loadLabels(rows);
+
+  const data = rows.map(row => ({
+    id: row.id,
+    offerId: row.offer_id,
+    offerTitle: offerTitles.get(row.offer_id) || null,
+    providerId: row.provider_id,
+    providerName: providerNames.get(row.provider_id) || row.provider_id,
+    timestamp: row.last_clicked_at || row.bucket_start,
+    bucketStart: row.bucket_start,
+    clicks: Number(row.clicks),
+    conversions: Number(row.conversions),
+    isConversion: Number(row.conversions) > 0,
+    revenue: parseFloat(row.commission_earned) || 0
+  }));
+
+  return { data, nextCursor };
+}
+
+/**
+ * Daily commission rollups (buckets with at least one conversion), newest first
+ * @param {Object} options - { cursor, limit, provider }
+ * @returns {Promise<Object>} { data, nextCursor }
+ */
+export async function fetchCommissionRollups(options = {}) {
+  const { rows, nextCursor } = await readRollupPage('clickout_rollups_daily', { ...options, conversionsOnly: true });
+  const { offerTitles, providerNames } = await loadLabels(rows);
+
+  const data = rows.map(row => {
+    const commissionAmount = parseFloat(row.commission_earned) || 0;
+    return {
+      id: row.id,
+      offerId: row.offer_id,
+      offerTitle: offerTitles.get(row.offer_id) || null,
+      providerId: row.provider_id,
+      providerName: providerNames.get(row.provider_id) || row.provider_id,
+      conversions: Number(row.conversions),
+      grossAmount: (parseFloat(row.conversion_value) || 0).toFixed(2),
+      commissionAmount: commissionAmount.toFixed(2),
+      currency: 'EUR',
+      occurredAt: row.bucket_start,
+      reportedAt: row.updated_at
+    };
+  });
+
+  return { data, nextCursor };
+}
+
+export default {
+  encodeRollupCursor,
+  decodeRollupCursor,
+  fetchClickoutRollups,
+  fetchCommissionRollups
+};
@@ -0,0 +1,178 @@
+/**
+ * In-process caching for FoodAI
+ *
+ * A small LRU cache with TTL eviction and a stale-while-revalidate wrapper
+ * around it. Stale entries are served immediately while a single background
+ * refresh runs, and concurrent misses for the same key share one load.
+ */
+
+/**
+ * Least-recently-used cache with per-entry expiry
+ */
+export class LRUCache {
+  /**
+   * @param {Object} options
+   * @param {number} options.maxEntries - Maximum number of entries kept
+   * @param {number} options.ttlMs - Default time-to-live for entries
+   */
+  constructor({ maxEntries = 500, ttlMs = 60 * 1000 } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.entries = new Map();
+    this.evictions = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    if (Date.now() >= entry.expiresAt) {
+      this.entries.delete(key);
+      this.evictions++;
+      return undefined;
+    }
+    // Move to the most recently used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key, value, ttlMs = this.ttlMs) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      this.entries.delete(oldestKey);
+      this.evictions++;
+    }
+  }
+
+  delete(key) {
+    return this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+}
+
+/**
+ * Create a stale-while-revalidate cache
+ * @param {Object} options
+ * @param {number} options.maxEntries - Maximum entries kept in memory
+ * @param {number} options.freshMs - How long a value is served without refreshing
+ * @param {number} options.staleMs - How long after that a value may still be served stale
+ * @param {Object} options.backend - Optional shared backend with async get(key) / set(key, record, ttlMs)
+ * @returns {Object} Cache with getOrLoad(key, loader), stats(), clear() and setBackend()
+ */
+export function createSwrCache({ maxEntries = 500, freshMs = 60 * 1000, staleMs = 5 * 60 * 1000, backend = null } = {}) {
+  const memory = new LRUCache({ maxEntries, ttlMs: freshMs + staleMs });
+  const inflight = new Map();
+  const counters = { hits: 0, misses: 0, stale: 0, coalesced: 0, backendHits: 0, refreshErrors: 0 };
+  let sharedBackend = backend;
+
+  const store = (key, value) => {
+    const record = { value, freshUntil: Date.now() + freshMs };
+    memory.set(key, record);
+    if (sharedBackend) {
+      Promise.resolve(sharedBackend.set(key, record, freshMs + staleMs)).catch(error => {
+        console.error('Shared cache write failed:', error);
+      });
+    }
+    return record;
+  };
+
+  // Single-flight load per key
+  const load = (key, loader) => {
+    let pending = inflight.get(key);
+    if (!pending) {
+      pending = (async () => {
+        try {
+          return store(key, await loader()).value;
+        } finally {
+          inflight.delete(key);
+        }
+      })();
+      inflight.set(key, pending);
+    }
+    return pending;
+  };
+
+  const readBackend = async (key) => {
+    if (!sharedBackend) return null;
+    try {
+      const record = await sharedBackend.get(key);
+      if (record && Date.now() < record.freshUntil + staleMs) {
+        memory.set(key, record, record.freshUntil + staleMs - Date.now());
+        return record;
+      }
+    } catch (error) {
+      console.error('Shared cache read failed:', error);
+    }
+    return null;
+  };
+
+  return {
+    /**
+     * Return the cached value for key, loading it on a miss
+     * @param {string} key - Cache key
+     * @param {Function} loader - Async function producing a fresh value
+     * @returns {Promise<any>} Cached or freshly loaded value
+     */
+    async getOrLoad(key, loader) {
+      let record = memory.get(key);
+      if (!record) {
+        if (inflight.has(key)) {
+          counters.coalesced++;
+          return inflight.get(key);
+        }
+        if (sharedBackend) {
+          record = await readBackend(key);
+          if (record) counters.backendHits++;
+        }
+      }
+
+      if (!record) {
+        if (inflight.has(key)) {
+          counters.coalesced++;
+          return inflight.get(key);
+        }
+        counters.misses++;
+        return load(key, loader);
+      }
+
+      if (Date.now() < record.freshUntil) {
+        counters.hits++;
+      } else {
+        counters.stale++;
+        if (!inflight.has(key)) {
+          load(key, loader).catch(error => {
+            counters.refreshErrors++;
+            console.error(`Background refresh failed for ${key}:`, error);
+          });
+        }
+      }
+      return record.value;
+    },
+
+    stats() {
+      return { ...counters, entries: memory.size, evictions: memory.evictions, inflight: inflight.size };
+    },
+
+    clear() {
+      memory.clear();
+    },
+
+    setBackend(nextBackend) {
+      sharedBackend = nextBackend;
+    }
+  };
+}
+
+export default {
+  LRUCache,
+  createSwrCache
+};
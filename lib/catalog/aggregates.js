@@ -0,0 +1,144 @@
+/**
+ * Offer Aggregates for FoodAI
+ *
+ * Precomputed per-city, per-provider and global counters (offers, clicks,
+ * revenue, savings, discount sum) plus the top offers by clicks. Built once
+ * per catalog version and updated incrementally when offers are removed
+ * (expiry), so the admin and stats endpoints read them in O(1).
+ */
+
+import { offerCatalog, getOfferCatalog } from './index.js';
+import { selectTopK } from './top-k.js';
+
+const TOP_OFFERS_LIMIT = 10;
+
+function emptyCounters() {
+  return { offerCount: 0, activeCount: 0, clicks: 0, revenue: 0, savings: 0, discountSum: 0 };
+}
+
+function applyOffer(counters, offer, sign) {
+  counters.offerCount += sign;
+  if (offer.is_active) counters.activeCount += sign;
+  counters.clicks += sign * (offer.clickCount || 0);
+  counters.revenue += sign * (offer.revenue || 0);
+  counters.savings += sign * (offer.original_price - offer.discounted_price);
+  counters.discountSum += sign * offer.discount_percent;
+}
+
+export class OfferAggregates {
+  constructor({ topLimit = TOP_OFFERS_LIMIT } = {}) {
+    this.topLimit = topLimit;
+    this.version = 0;
+    this.reset();
+  }
+
+  reset() {
+    this.global = emptyCounters();
+    this.byCity = new Map();
+    this.byProvider = new Map();
+    this.ordinals = new Map();
+    this.nextOrdinal = 0;
+    this.top = [];
+    this.topDirty = false;
+  }
+
+  // Most clicks first; ties keep catalog order
+  compareTop = (a, b) =>
+    (b.clickCount || 0) - (a.clickCount || 0) || this.ordinals.get(a) - this.ordinals.get(b);
+
+  /**
+   * Rebuild all counters from a full offer list
+   * @param {Array} offers - Catalog offers
+   * @param {number} version - Catalog version the aggregates are built from
+   */
+  build(offers, version) {
+    this.reset();
+    this.version = version;
+    for (const offer of offers) {
+      this.ordinals.set(offer, this.nextOrdinal++);
+      this.count(offer, 1);
+    }
+    this.top = selectTopK(offers, this.topLimit, this.compareTop);
+  }
+
+  /**
+   * Remove one offer from the counters
+   * @param {Object} offer - Offer to remove
+   */
+  remove(offer) {
+    if (!this.ordinals.has(offer)) return;
+    this.count(offer, -1);
+    if (this.top.includes(offer)) {
+      // Refill lazily from the remaining offers on the next read
+      this.topDirty = true;
+    }
+    this.ordinals.delete(offer);
+  }
+
+  count(offer, sign) {
+    applyOffer(this.global, offer, sign);
+    for (const [groups, key] of [[this.byCity, offer.city], [this.byProvider, offer.provider_id]]) {
+      let counters = groups.get(key);
+      if (!counters) {
+        counters = emptyCounters();
+        groups.set(key, counters);
+      }
+      applyOffer(counters, offer, sign);
+    }
+  }
+
+  /**
+   * @param {string} city - City name (exact match)
+   * @returns {Object} Counters for the city (zeros when unknown)
+   */
+  city(city) {
+    return this.byCity.get(city) || emptyCounters();
+  }
+
+  /**
+   * @param {string} providerId - Provider identifier
+   * @returns {Object} Counters for the provider (zeros when unknown)
+   */
+  provider(providerId) {
+    return this.byProvider.get(providerId) || emptyCounters();
+  }
+
+  /**
+   * @returns {Array} Offers with the most clicks, best first
+   */
+  topOffers() {
+    if (this.topDirty) {
+      this.top = selectTopK(this.ordinals.keys(), this.topLimit, this.compareTop);
+      this.topDirty = false;
+    }
+    return this.top;
+  }
+}
+
+// Shared aggregates kept in step with the shared offer catalog
+export const offerAggregates = new OfferAggregates();
+
+// Removals (expiry) are applied in place; full rebuilds are picked up by version
+offerCatalog.subscribe((event, catalog) => {
+  if (event.type === 'remove' && offerAggregates.version === catalog.version) {
+    event.offers.forEach(offer => offerAggregates.remove(offer));
+  }
+});
+
+/**
+ * Get the aggregates for the current catalog, rebuilding them after a catalog refresh
+ * @returns {Promise<OfferAggregates>} Aggregates matching the current catalog version
+ */
+export async function getOfferAggregates() {
+  const catalog = await getOfferCatalog();
+  if (offerAggregates.version !== catalog.version) {
+    offerAggregates.build(catalog.offers, catalog.version);
+  }
+  return offerAggregates;
+}
+
+export default {
+  OfferAggregates,
+  offerAggregates,
+  getOfferAggregates
+};
@@ -0,0 +1,264 @@
+/**
+ * Chat Offer Context for FoodAI
+ *
+ * Keeps a periodically refreshed in-memory snapshot of active offers for the
+ * chat routes and picks the offers most relevant to the latest user message
+ * (city, cuisine and price hints, Finnish inflections included), so a chat
+ * message never waits on a database query before the model call.
+ */
+
+import { supabase } from '../supabase.js';
+import { trackUpstream } from '../metrics.js';
+import { OfferCatalog, getOfferCatalog } from './index.js';
+import { FINNISH_CITIES } from './mock-data.js';
+import { selectTopK } from './top-k.js';
+
+// Snapshot refresh interval and size (configurable via environment)
+const SNAPSHOT_TTL_MS = parseInt(process.env.CHAT_OFFER_SNAPSHOT_TTL_MS) || 60 * 1000;
+const SNAPSHOT_SIZE = parseInt(process.env.CHAT_OFFER_SNAPSHOT_SIZE) || 500;
+
+// Inflected stems that do not start with the base form (consonant gradation etc.)
+const CITY_STEMS = {
+  helsinki: ['helsing'],
+  tampere: ['tamper'],
+  turku: ['turu'],
+  lahti: ['lahde', 'lahte'],
+  seinäjoki: ['seinäjo'],
+  lappeenranta: ['lappeenran'],
+  rovaniemi: ['rovaniem']
+};
+
+// Word prefixes (Finnish and English) hinting at a cuisine type
+const CUISINE_KEYWORDS = {
+  pizza: ['pizz'],
+  sushi: ['sushi'],
+  japanilainen: ['japani', 'japanese', 'ramen'],
+  kiinalainen: ['kiina', 'chinese'],
+  intialainen: ['intia', 'indian', 'curry'],
+  thai: ['thai'],
+  italiana: ['itali', 'pasta'],
+  hampurilainen: ['hampurilai', 'purilai', 'burger'],
+  kebab: ['kebab'],
+  meksikkolainen: ['meksik', 'mexican', 'taco', 'burrito'],
+  aasialainen: ['aasia', 'asian'],
+  vegan: ['vegaan', 'vegan'],
+  kasvis: ['kasvis', 'vegetarian'],
+  kala: ['kala', 'fish'],
+  liha: ['liha', 'meat', 'steak', 'pihvi'],
+  salaatti: ['salaat', 'salad'],
+  keitto: ['keitto', 'keito', 'soup'],
+  grill: ['grill'],
+  'fast food': ['pikaruo', 'fastfood'],
+  jälkiruoka: ['jälkiruo', 'dessert'],
+  suomalainen: ['suomalai', 'finnish']
+};
+
+const CHEAP_WORDS = ['halpa', 'halvin', 'halvem', 'halpo', 'halvat', 'edulli', 'cheap', 'budget'];
+
+// "alle 15 €", "max 20e", "under 10", "enintään 12 euroa"
+const MAX_PRICE_PATTERN = /(?:alle|under|below|max(?:imi)?|enintään|korkeintaan|<)\s*(\d+(?:[.,]\d+)?)/;
+const BUDGET_PATTERN = /(\d+(?:[.,]\d+)?)\s*(?:€|e\b|eur|euro)/;
+
+const tokenize = (text) => text.toLowerCase().split(/[^a-z0-9åäö]+/).filter(Boolean);
+
+function cityPrefixes(city) {
+  const name = city.toLowerCase();
+  const prefixes = [name, ...(CITY_STEMS[name] || [])];
+  // Drop the final vowel for forms like Rovaniemellä; short names only match in full
+  if (name.length - 1 >= 5) prefixes.push(name.slice(0, -1));
+  return prefixes;
+}
+
+/**
+ * Convert an offer row into a snapshot entry with precomputed match keys
+ * @param {Object} offer - Flat offer (restaurant/provider names already resolved)
+ * @returns {Object} Snapshot entry with `context` for the model and match keys
+ */
+function toSnapshotEntry(offer) {
+  const cuisine = (offer.cuisine_types || []).join(', ') || 'Mixed';
+  return {
+    id: offer.id,
+    cityKey: (offer.city || '').toLowerCase(),
+    cuisineKey: cuisine.toLowerCase(),
+    titleKey: (offer.title || '').toLowerCase(),
+    price: Number(offer.discounted_price) || 0,
+    discount: Number(offer.discount_percentage ?? offer.discount_percent) || 0,
+    endsAt: offer.ends_at ? new Date(offer.ends_at).getTime() : Infinity,
+    context: {
+      title: offer.title,
+      restaurant_name: offer.restaurant_name || 'Unknown',
+      original_price: offer.original_price,
+      discounted_price: offer.discounted_price,
+      discount_percentage: offer.discount_percentage ?? offer.discount_percent,
+      provider_name: offer.provider_name || 'Unknown',
+      cuisine,
+      city: offer.city || 'Unknown'
+    }
+  };
+}
+
+/**
+ * Load active offers for the snapshot, falling back to the in-memory catalog
+ * when Supabase is unavailable
+ * @returns {Promise<Array>} Snapshot entries
+ */
+async function loadChatOffers() {
+  try {
+    const { data: offers, error } = await trackUpstream('supabase', () => supabase
+      .from('offers')
+      .select(`
+        *,
+        restaurants(name, city, cuisine_types),
+        providers(name)
+      `)
+      .eq('is_active', true)
+      .gte('ends_at', new Date().toISOString())
+      .order('discount_percent', { ascending: false })
+      .limit(SNAPSHOT_SIZE));
+
+    if (error) throw error;
+
+    loadCounters.supabase++;
+    return offers.map(offer => toSnapshotEntry({
+      ...offer,
+      restaurant_name: offer.restaurants?.name,
+      provider_name: offer.providers?.name,
+      city: offer.restaurants?.city,
+      cuisine_types: offer.restaurants?.cuisine_types
+    }));
+  } catch (error) {
+    loadCounters.fallback++;
+    console.error(
+      `Chat offer snapshot query failed (${error?.code || 'no code'}: ${error?.message || error}), ` +
+      `falling back to the offer catalog (${loadCounters.fallback} fallbacks so far)`
+    );
+    const catalog = await getOfferCatalog();
+    return catalog.offers.map(toSnapshotEntry);
+  }
+}
+
+// Snapshot loads by source; a rising fallback count means the Supabase query is failing
+const loadCounters = { supabase: 0, fallback: 0 };
+
+// Shared snapshot for both chat routes (stale snapshots are served while one refresh runs)
+export const chatOfferSnapshot = new OfferCatalog({ load: loadChatOffers, ttlMs: SNAPSHOT_TTL_MS });
+
+/**
+ * Get the chat offer snapshot, building it on first use
+ * @returns {Promise<OfferCatalog>} Snapshot whose `offers` are snapshot entries
+ */
+export function getChatOfferSnapshot() {
+  return chatOfferSnapshot.get();
+}
+
+/**
+ * @returns {Object} Snapshot load counts by source, for the metrics endpoint
+ */
+export function getChatOfferSnapshotStats() {
+  return { ...loadCounters, version: chatOfferSnapshot.version, offers: chatOfferSnapshot.offers.length };
+}
+
+/**
+ * Extract offer hints from a chat message
+ * @param {string} text - User message
+ * @param {Array<string>} cities - Known city names
+ * @returns {Object} { city, cuisines, maxPrice, cheap }
+ */
+export function extractOfferHints(text, cities = FINNISH_CITIES) {
+  const lower = (text || '').toLowerCase();
+  const tokens = tokenize(lower);
+
+  const city = cities.find(name =>
+    cityPrefixes(name).some(prefix => tokens.some(token => token.startsWith(prefix)))
+  ) || null;
+
+  const cuisines = Object.keys(CUISINE_KEYWORDS).filter(cuisine =>
+    CUISINE_KEYWORDS[cuisine].some(keyword => tokens.some(token => token.startsWith(keyword)))
+  );
+
+  const priceMatch = lower.match(MAX_PRICE_PATTERN) || lower.match(BUDGET_PATTERN);
+  const maxPrice = priceMatch ? parseFloat(priceMatch[1].replace(',', '.')) : null;
+
+  const cheap = tokens.some(token => CHEAP_WORDS.some(word => token.startsWith(word)));
+
+  return { city, cuisines, maxPrice, cheap };
+}
+
+/**
+ * Merge hints from the conversation: the latest user message wins, earlier
+ * user messages fill in a city or cuisine the follow-up did not repeat
+ * @param {Array} messages - Chat messages
+ * @param {Array<string>} cities - Known city names
+ * @returns {Object} { city, cuisines, maxPrice, cheap }
+ */
+export function extractConversationHints(messages, cities = FINNISH_CITIES) {
+  const userMessages = messages.filter(message => message.role === 'user');
+  const latest = extractOfferHints(userMessages[userMessages.length - 1]?.content, cities);
+
+  for (let i = userMessages.length - 2; i >= 0 && (!latest.city || latest.cuisines.length === 0); i--) {
+    const earlier = extractOfferHints(userMessages[i].content, cities);
+    if (!latest.city) latest.city = earlier.city;
+    if (latest.cuisines.length === 0) latest.cuisines = earlier.cuisines;
+  }
+  return latest;
+}
+
+/**
+ * Select the offers most relevant to the conversation from the snapshot
+ * @param {Array} entries - Snapshot entries
+ * @param {Object} hints - Output of extractConversationHints
+ * @param {number} limit - Number of offers to return
+ * @returns {Array} Offer context objects for the model
+ */
+export function selectRelevantOffers(entries, hints, limit) {
+  const now = Date.now();
+  const live = entries.filter(entry => entry.endsAt > now);
+  const cityKey = hints.city?.toLowerCase();
+
+  // Hard filters, relaxed in turn when they leave nothing to recommend
+  let candidates = live.filter(entry =>
+    (!cityKey || entry.cityKey === cityKey) && (hints.maxPrice == null || entry.price <= hints.maxPrice)
+  );
+  if (candidates.length === 0 && hints.maxPrice != null) {
+    candidates = live.filter(entry => !cityKey || entry.cityKey === cityKey);
+  }
+  if (candidates.length === 0) {
+    candidates = live;
+  }
+
+  const keywords = hints.cuisines.map(cuisine => [cuisine, CUISINE_KEYWORDS[cuisine]]);
+  const relevance = (entry) => keywords.reduce((score, [cuisine, words]) =>
+    score +
+    (entry.cuisineKey.includes(cuisine) ? 2 : 0) +
+    (words.some(word => entry.titleKey.includes(word)) ? 1 : 0), 0);
+
+  const scores = new Map(candidates.map(entry => [entry, relevance(entry)]));
+  const compare = (a, b) =>
+    scores.get(b) - scores.get(a) ||
+    (hints.cheap ? a.price - b.price : b.discount - a.discount) ||
+    (hints.cheap ? b.discount - a.discount : a.price - b.price);
+
+  return selectTopK(candidates, limit, compare).map(entry => entry.context);
+}
+
+/**
+ * Offers to include in the chat context for a conversation
+ * @param {Array} messages - Chat messages
+ * @param {number} limit - Number of offers to return
+ * @returns {Promise<Array>} Offer context objects
+ */
+export async function getChatOfferContext(messages, limit) {
+  const snapshot = await getChatOfferSnapshot();
+  const hints = extractConversationHints(messages);
+  return selectRelevantOffers(snapshot.offers, hints, limit);
+}
+
+export default {
+  chatOfferSnapshot,
+  getChatOfferSnapshot,
+  getChatOfferSnapshotStats,
+  extractOfferHints,
+  extractConversationHints,
+  selectRelevantOffers,
+  getChatOfferContext
+};
@@ -0,0 +1,233 @@
+/**
+ * Offer Expiry Scheduler for FoodAI
+ *
+ * Keeps the catalog's offers in a queue sorted by `ends_at` with a head
+ * pointer at the next offer to expire, and a single timer set for that
+ * moment. When it fires, every offer that has ended is removed from the
+ * catalog (and, through catalog events, from its indexes and aggregates) and
+ * queued for a batched `is_active = false` update in Supabase. Because the
+ * queue is sorted, "expiring in the next N hours" is a binary search.
+ */
+
+import { supabase } from '../supabase.js';
+import { trackUpstream } from '../metrics.js';
+import { offerCatalog } from './index.js';
+
+// Deactivation batching (configurable via environment)
+const DEACTIVATE_BATCH_SIZE = parseInt(process.env.OFFER_DEACTIVATE_BATCH_SIZE) || 200;
+const DEACTIVATE_DELAY_MS = parseInt(process.env.OFFER_DEACTIVATE_DELAY_MS) || 5000;
+
+// setTimeout delays above this overflow to 1ms; longer waits are re-armed
+const MAX_TIMER_MS = 2 ** 31 - 1;
+
+const HOUR_MS = 60 * 60 * 1000;
+
+const endTime = (offer) => (offer.ends_at ? new Date(offer.ends_at).getTime() : NaN);
+
+export class ExpiryScheduler {
+  /**
+   * @param {Object} options
+   * @param {OfferCatalog} options.catalog - Catalog whose offers expire
+   * @param {Function} options.deactivate - Async (ids) => number of rows updated for a batch of expired offers
+   * @param {Function} options.shouldDeactivate - () => boolean, false while the database is unavailable
+   * @param {number} options.batchSize - Ids per deactivation update
+   * @param {number} options.delayMs - Time expired ids are collected before an update
+   */
+  constructor({
+    catalog,
+    deactivate = null,
+    shouldDeactivate = () => true,
+    batchSize = DEACTIVATE_BATCH_SIZE,
+    delayMs = DEACTIVATE_DELAY_MS
+  }) {
+    this.catalog = catalog;
+    this.deactivate = deactivate;
+    this.shouldDeactivate = shouldDeactivate;
+    this.batchSize = batchSize;
+    this.delayMs = delayMs;
+    this.queue = [];
+    this.head = 0;
+    this.timer = null;
+    this.pending = [];
+    this.flushTimer = null;
+    this.unsubscribe = null;
+    this.counters = { expired: 0, deactivated: 0, deactivateUnmatched: 0, deactivateErrors: 0 };
+  }
+
+  /**
+   * Follow catalog rebuilds and arm the timer
+   * @param {Object} options - { shouldDeactivate } overriding the constructor option
+   * @returns {ExpiryScheduler} this
+   */
+  start({ shouldDeactivate } = {}) {
+    if (shouldDeactivate) this.shouldDeactivate = shouldDeactivate;
+    if (!this.unsubscribe) {
+      this.unsubscribe = this.catalog.subscribe(event => {
+        if (event.type === 'replace') this.rebuild(event.offers);
+      });
+      if (this.catalog.version > 0) this.rebuild(this.catalog.offers);
+    }
+    return this;
+  }
+
+  stop() {
+    if (this.unsubscribe) this.unsubscribe();
+    this.unsubscribe = null;
+    clearTimeout(this.timer);
+    this.timer = null;
+  }
+
+  /**
+   * Rebuild the sorted queue from a full offer list
+   * @param {Array} offers - Catalog offers
+   */
+  rebuild(offers) {
+    this.queue = offers
+      .map(offer => ({ endsAt: endTime(offer), offer }))
+      .filter(entry => Number.isFinite(entry.endsAt))
+      .sort((a, b) => a.endsAt - b.endsAt);
+    this.head = 0;
+    // Never expire inline: a rebuild is announced from inside the catalog's replace()
+    this.arm(0);
+  }
+
+  arm(delayMs = null) {
+    clearTimeout(this.timer);
+    this.timer = null;
+    if (this.head >= this.queue.length) return;
+
+    const wait = delayMs ?? Math.max(0, this.queue[this.head].endsAt - Date.now());
+    this.timer = setTimeout(() => this.expireDue(), Math.min(wait, MAX_TIMER_MS));
+    if (this.timer.unref) this.timer.unref();
+  }
+
+  /**
+   * Remove every offer whose end time has passed, then re-arm for the next one
+   * @param {number} now - Current time
+   * @returns {Array} Offers removed from the catalog
+   */
+  expireDue(now = Date.now()) {
+    const due = [];
+    while (this.head < this.queue.length && this.queue[this.head].endsAt <= now) {
+      due.push(this.queue[this.head++].offer);
+    }
+    // Drop consumed entries once they make up half of the queue
+    if (this.head > 0 && this.head * 2 >= this.queue.length) {
+      this.queue = this.queue.slice(this.head);
+      this.head = 0;
+    }
+
+    const removed = due.length > 0 ? this.catalog.remove(due) : [];
+    if (removed.length > 0) {
+      this.counters.expired += removed.length;
+      this.queueDeactivation(removed.map(offer => offer.id));
+    }
+    this.arm();
+    return removed;
+  }
+
+  queueDeactivation(ids) {
+    if (!this.deactivate) return;
+    this.pending.push(...ids);
+    if (this.pending.length >= this.batchSize) {
+      this.flush();
+    } else {
+      this.scheduleFlush();
+    }
+  }
+
+  scheduleFlush() {
+    if (this.flushTimer) return;
+    this.flushTimer = setTimeout(() => this.flush(), this.delayMs);
+    if (this.flushTimer.unref) this.flushTimer.unref();
+  }
+
+  /**
+   * Write pending deactivations to the database in batches. While the database
+   * is unavailable the ids stay pending and the flush is retried after delayMs.
+   * @returns {Promise<void>}
+   */
+  async flush() {
+    clearTimeout(this.flushTimer);
+    this.flushTimer = null;
+    if (this.pending.length === 0) return;
+    if (!this.shouldDeactivate()) {
+      this.scheduleFlush();
+      return;
+    }
+    const ids = this.pending.splice(0);
+
+    for (let i = 0; i < ids.length; i += this.batchSize) {
+      const batch = ids.slice(i, i + this.batchSize);
+      try {
+        // Count what the database changed: ids it doesn't hold (or already
+        // inactive) are reported separately instead of as deactivated
+        const updated = await this.deactivate(batch);
+        this.counters.deactivated += updated;
+        this.counters.deactivateUnmatched += batch.length - updated;
+      } catch (error) {
+        // The database still filters on ends_at, so a missed update only costs storage
+        this.counters.deactivateErrors++;
+        console.error('Failed to deactivate expired offers:', error);
+      }
+    }
+  }
+
+  /**
+   * Number of live offers ending within the next window (binary search)
+   * @param {number} windowMs - Window length from now
+   * @param {number} now - Current time
+   * @returns {number} Offer count
+   */
+  expiringWithin(windowMs, now = Date.now()) {
+    return this.countUntil(now + windowMs) - this.countUntil(now);
+  }
+
+  /**
+   * @param {number} hours - Window length in hours
+   * @returns {number} Offers ending within the next `hours`
+   */
+  expiringWithinHours(hours) {
+    return this.expiringWithin(hours * HOUR_MS);
+  }
+
+  // Queued offers (from the head) with endsAt <= time
+  countUntil(time) {
+    let low = this.head;
+    let high = this.queue.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (this.queue[middle].endsAt <= time) low = middle + 1;
+      else high = middle;
+    }
+    return low - this.head;
+  }
+
+  stats() {
+    return { ...this.counters, scheduled: this.queue.length - this.head, pendingDeactivations: this.pending.length };
+  }
+}
+
+/**
+ * Mark offers inactive in Supabase
+ * @param {Array<string>} ids - Offer ids
+ * @returns {Promise<number>} Rows actually updated
+ */
+async function deactivateOffers(ids) {
+  const { data, error } = await trackUpstream('supabase', () => supabase
+    .from('offers')
+    .update({ is_active: false })
+    .in('id', ids)
+    .eq('is_active', true)
+    .select('id'));
+  if (error) throw error;
+  return data.length;
+}
+
+// Shared scheduler for the shared catalog; started by the API route
+export const offerExpiry = new ExpiryScheduler({ catalog: offerCatalog, deactivate: deactivateOffers });
+
+export default {
+  ExpiryScheduler,
+  offerExpiry
+};
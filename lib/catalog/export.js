@@ -0,0 +1,122 @@
+/**
+ * Offer Export for FoodAI
+ *
+ * Streams the whole offer catalog as NDJSON (one offer per line). Offers are
+ * read in fixed-size batches and a batch is only read when the client has
+ * consumed the previous one, so memory stays constant however large the
+ * catalog is. Supabase is read with keyset pages on id; the in-memory catalog
+ * is walked over the offer list it had when the export started.
+ */
+
+import { supabase } from '../supabase.js';
+import { trackUpstream } from '../metrics.js';
+import { projectOffer } from './projection.js';
+
+// Offers per batch read (configurable via environment)
+const EXPORT_BATCH_SIZE = parseInt(process.env.OFFER_EXPORT_BATCH_SIZE) || 500;
+
+/**
+ * Batch reader over an in-memory offer list
+ * @param {Array} offers - Offer list (the catalog swaps in a new array on refresh,
+ *   so an export keeps reading the version it started with)
+ * @param {Object} options - { provider, batchSize }
+ * @returns {Function} Async () => Array of offers, empty when done
+ */
+export function catalogBatchReader(offers, { provider = null, batchSize = EXPORT_BATCH_SIZE } = {}) {
+  let position = 0;
+  return async () => {
+    const batch = [];
+    while (position < offers.length && batch.length < batchSize) {
+      const offer = offers[position++];
+      if (!provider || offer.provider_id === provider) batch.push(offer);
+    }
+    return batch;
+  };
+}
+
+/**
+ * Batch reader over the live offers in the Supabase offers table, ordered by id.
+ * Like the catalog, only active offers that have not ended are exported.
+ * @param {Object} options - { provider, batchSize }
+ * @returns {Function} Async () => Array of offers, empty when done
+ */
+export function supabaseBatchReader({ provider = null, batchSize = EXPORT_BATCH_SIZE } = {}) {
+  let lastId = null;
+  let done = false;
+  // One cutoff for the whole export, so an offer ending mid-export doesn't vanish between batches
+  const startedAt = new Date().toISOString();
+  return async () => {
+    if (done) return [];
+
+    let query = supabase
+      .from('offers')
+      .select(`
+        *,
+        restaurants(name, city, district, cuisine_types, rating, latitude, longitude),
+        providers(name)
+      `)
+      .eq('is_active', true)
+      .gt('ends_at', startedAt)
+      .order('id', { ascending: true })
+      .limit(batchSize);
+    if (provider) query = query.eq('provider_id', provider);
+    // Keyset on id: each batch is an index range scan, however deep the export is
+    if (lastId !== null) query = query.gt('id', lastId);
+
+    const { data, error } = await trackUpstream('supabase', () => query);
+    if (error) throw error;
+
+    if (data.length < batchSize) done = true;
+    if (data.length > 0) lastId = data[data.length - 1].id;
+
+    return data.map(({ restaurants, providers, ...offer }) => ({
+      ...offer,
+      provider_name: providers?.name,
+      restaurant_name: restaurants?.name,
+      city: restaurants?.city,
+      district: restaurants?.district,
+      cuisine_types: restaurants?.cuisine_types,
+      rating: restaurants?.rating,
+      latitude: restaurants?.latitude,
+      longitude: restaurants?.longitude
+    }));
+  };
+}
+
+/**
+ * Create an NDJSON stream of offers
+ * @param {Function} readBatch - Batch reader (catalogBatchReader or supabaseBatchReader)
+ * @param {Object} options - { fields } (output of parseFields, null for whole offers)
+ * @returns {ReadableStream} Byte stream, one JSON offer per line
+ */
+export function createOfferExportStream(readBatch, { fields = null } = {}) {
+  const encoder = new TextEncoder();
+  return new ReadableStream({
+    // Called only when the consumer wants more data
+    async pull(controller) {
+      try {
+        const batch = await readBatch();
+        if (batch.length === 0) {
+          controller.close();
+          return;
+        }
+        let chunk = '';
+        for (const offer of batch) {
+          chunk += JSON.stringify(projectOffer(offer, fields)) + '\n';
+        }
+        controller.enqueue(encoder.encode(chunk));
+      } catch (error) {
+        // Headers are already sent; end with an error line the client can detect
+        console.error('Offer export failed:', error);
+        controller.enqueue(encoder.encode(JSON.stringify({ error: 'Vienti keskeytyi' }) + '\n'));
+        controller.close();
+      }
+    }
+  }, { highWaterMark: 1 });
+}
+
+export default {
+  catalogBatchReader,
+  supabaseBatchReader,
+  createOfferExportStream
+};
@@ -0,0 +1,236 @@
+/**
+ * Geospatial Offer Index for FoodAI
+ *
+ * Uniform lat/lng grid over the offer catalog for "near me" searches. A
+ * radius query only visits the grid cells overlapping the search circle's
+ * bounding box and computes exact distances for the offers in those cells,
+ * so the cost follows the number of nearby offers rather than the catalog
+ * size. The grid is synced incrementally by offer id on catalog refreshes.
+ */
+
+import { offerCatalog, getOfferCatalog } from './index.js';
+import { selectTopK } from './top-k.js';
+
+// Grid cell edge in kilometres along a meridian (configurable via environment)
+const GEO_CELL_KM = parseInt(process.env.GEO_INDEX_CELL_KM) || 5;
+
+const EARTH_RADIUS_KM = 6371;
+const KM_PER_DEGREE = (Math.PI / 180) * EARTH_RADIUS_KM;
+
+export const DEFAULT_RADIUS_KM = 5;
+export const MAX_RADIUS_KM = 100;
+
+// Share of the blended score that comes from the discount (the rest from proximity)
+const BLEND_DISCOUNT_WEIGHT = 0.5;
+
+const toRadians = (degrees) => degrees * Math.PI / 180;
+
+/**
+ * Great-circle distance between two points
+ * @returns {number} Distance in kilometres
+ */
+export function haversineKm(lat1, lng1, lat2, lng2) {
+  const dLat = toRadians(lat2 - lat1);
+  const dLng = toRadians(lng2 - lng1);
+  const a = Math.sin(dLat / 2) ** 2 +
+    Math.cos(toRadians(lat1)) * Math.cos(toRadians(lat2)) * Math.sin(dLng / 2) ** 2;
+  return 2 * EARTH_RADIUS_KM * Math.asin(Math.min(1, Math.sqrt(a)));
+}
+
+const hasLocation = (offer) => Number.isFinite(offer.latitude) && Number.isFinite(offer.longitude);
+
+export class GeoIndex {
+  /**
+   * @param {Object} options
+   * @param {number} options.cellKm - Grid cell edge in kilometres
+   */
+  constructor({ cellKm = GEO_CELL_KM } = {}) {
+    this.cellDeg = cellKm / KM_PER_DEGREE;
+    this.version = 0;
+    this.cells = new Map();
+    this.cellById = new Map();
+  }
+
+  get size() {
+    return this.cellById.size;
+  }
+
+  cellKey(row, col) {
+    return `${row}:${col}`;
+  }
+
+  cellOf(latitude, longitude) {
+    return this.cellKey(Math.floor(latitude / this.cellDeg), Math.floor(longitude / this.cellDeg));
+  }
+
+  /**
+   * Add or replace one offer (matched by id)
+   * @param {Object} offer - Offer with latitude/longitude; offers without are skipped
+   */
+  add(offer) {
+    if (!hasLocation(offer)) {
+      this.remove(offer);
+      return;
+    }
+    const key = this.cellOf(offer.latitude, offer.longitude);
+    const previousKey = this.cellById.get(offer.id);
+    if (previousKey !== undefined && previousKey !== key) {
+      this.removeFromCell(previousKey, offer.id);
+    }
+    let cell = this.cells.get(key);
+    if (!cell) {
+      cell = new Map();
+      this.cells.set(key, cell);
+    }
+    cell.set(offer.id, offer);
+    this.cellById.set(offer.id, key);
+  }
+
+  /**
+   * Remove one offer by id
+   * @param {Object} offer - Offer (only its id is used)
+   */
+  remove(offer) {
+    const key = this.cellById.get(offer.id);
+    if (key === undefined) return;
+    this.removeFromCell(key, offer.id);
+    this.cellById.delete(offer.id);
+  }
+
+  removeFromCell(key, id) {
+    const cell = this.cells.get(key);
+    if (!cell) return;
+    cell.delete(id);
+    if (cell.size === 0) this.cells.delete(key);
+  }
+
+  /**
+   * Bring the grid in line with a full offer list: offers whose id is gone are
+   * removed, new or moved offers are (re)placed, unchanged ones are swapped in place
+   * @param {Array} offers - Catalog offers
+   * @param {number} version - Catalog version the grid now reflects
+   */
+  sync(offers, version) {
+    const ids = new Set();
+    for (const offer of offers) {
+      ids.add(offer.id);
+      this.add(offer);
+    }
+    for (const id of [...this.cellById.keys()]) {
+      if (!ids.has(id)) this.remove({ id });
+    }
+    this.version = version;
+  }
+
+  /**
+   * Offers within a radius, with their distance
+   * @param {Object} params
+   * @param {number} params.lat - Search centre latitude
+   * @param {number} params.lng - Search centre longitude
+   * @param {number} params.radiusKm - Search radius in kilometres (must be positive)
+   * @param {Function} params.filter - Optional predicate applied to nearby offers
+   * @returns {Array} [{ offer, distanceKm }] in no particular order
+   */
+  within({ lat, lng, radiusKm, filter = null }) {
+    if (!(radiusKm > 0)) {
+      throw new Error(`Search radius must be positive, got ${radiusKm}`);
+    }
+    const latSpan = radiusKm / KM_PER_DEGREE;
+    const lngSpan = Math.min(180, radiusKm / (KM_PER_DEGREE * Math.max(Math.cos(toRadians(lat)), 1e-6)));
+
+    const minRow = Math.floor((lat - latSpan) / this.cellDeg);
+    const maxRow = Math.floor((lat + latSpan) / this.cellDeg);
+    const minCol = Math.floor((lng - lngSpan) / this.cellDeg);
+    const maxCol = Math.floor((lng + lngSpan) / this.cellDeg);
+
+    const matches = [];
+    const visit = (cell) => {
+      for (const offer of cell.values()) {
+        const distanceKm = haversineKm(lat, lng, offer.latitude, offer.longitude);
+        if (distanceKm <= radiusKm && (!filter || filter(offer))) {
+          matches.push({ offer, distanceKm });
+        }
+      }
+    };
+
+    // Walk whichever is smaller: the covered cell range or the occupied cells
+    if ((maxRow - minRow + 1) * (maxCol - minCol + 1) <= this.cells.size) {
+      for (let row = minRow; row <= maxRow; row++) {
+        for (let col = minCol; col <= maxCol; col++) {
+          const cell = this.cells.get(this.cellKey(row, col));
+          if (cell) visit(cell);
+        }
+      }
+    } else {
+      for (const [key, cell] of this.cells) {
+        const [row, col] = key.split(':').map(Number);
+        if (row >= minRow && row <= maxRow && col >= minCol && col <= maxCol) visit(cell);
+      }
+    }
+    return matches;
+  }
+
+  /**
+   * Return one page of offers within a radius
+   * @param {Object} params - lat, lng, radiusKm, filter, sortBy ('distance', 'blend',
+   *   'discount', 'price' or 'rating'), offset, limit
+   * @returns {Object} { offers (copies with distance_km), total }
+   */
+  query({ lat, lng, radiusKm = DEFAULT_RADIUS_KM, filter = null, sortBy = 'distance', offset = 0, limit = 12 }) {
+    const matches = this.within({ lat, lng, radiusKm, filter });
+
+    // Blend: closeness within the radius and discount, both scaled to 0..1
+    const blended = ({ offer, distanceKm }) =>
+      (1 - BLEND_DISCOUNT_WEIGHT) * (1 - distanceKm / radiusKm) +
+      BLEND_DISCOUNT_WEIGHT * (offer.discount_percent || 0) / 100;
+
+    const byDistance = (a, b) => a.distanceKm - b.distanceKm;
+    const orders = {
+      distance: byDistance,
+      blend: (a, b) => blended(b) - blended(a) || byDistance(a, b),
+      discount: (a, b) => b.offer.discount_percent - a.offer.discount_percent || byDistance(a, b),
+      price: (a, b) => a.offer.discounted_price - b.offer.discounted_price || byDistance(a, b),
+      rating: (a, b) => b.offer.rating - a.offer.rating || byDistance(a, b)
+    };
+
+    const top = selectTopK(matches, offset + limit, orders[sortBy] || byDistance);
+    return {
+      offers: top.slice(offset).map(({ offer, distanceKm }) => ({
+        ...offer,
+        distance_km: Math.round(distanceKm * 100) / 100
+      })),
+      total: matches.length
+    };
+  }
+}
+
+// Shared grid kept in step with the shared offer catalog
+export const geoIndex = new GeoIndex();
+
+// Removals (expiry) are applied in place; full rebuilds are synced by version
+offerCatalog.subscribe((event, catalog) => {
+  if (event.type === 'remove' && geoIndex.version === catalog.version) {
+    event.offers.forEach(offer => geoIndex.remove(offer));
+  }
+});
+
+/**
+ * Get the geo index for the current catalog, syncing it after a catalog refresh
+ * @returns {Promise<GeoIndex>} Index matching the current catalog version
+ */
+export async function getGeoIndex() {
+  const catalog = await getOfferCatalog();
+  if (geoIndex.version !== catalog.version) {
+    geoIndex.sync(catalog.offers, catalog.version);
+  }
+  return geoIndex;
+}
+
+export default {
+  GeoIndex,
+  geoIndex,
+  getGeoIndex,
+  haversineKm,
+  DEFAULT_RADIUS_KM,
+  MAX_RADIUS_KM
+};
@@ -0,0 +1,140 @@
+/**
+ * Offer Catalog for FoodAI
+ *
+ * Materialized, in-process offer catalog shared by all API handlers.
+ * The catalog is built once, served from memory and rebuilt in the background
+ * when its TTL lapses, so offer IDs and ordering stay stable between requests.
+ * Between rebuilds, individual offers can be removed (see expiry.js).
+ */
+
+import { generateFinnishOffers } from './mock-data.js';
+
+// Catalog refresh interval (configurable via OFFER_CATALOG_TTL_MS)
+const CATALOG_TTL_MS = parseInt(process.env.OFFER_CATALOG_TTL_MS) || 5 * 60 * 1000;
+
+// Delay before retrying a failed background refresh
+const REFRESH_RETRY_MS = 30 * 1000;
+
+export class OfferCatalog {
+  /**
+   * @param {Object} options
+   * @param {Function} options.load - Async function returning the full offer list
+   * @param {number} options.ttlMs - Time before the catalog is rebuilt in the background
+   */
+  constructor({ load, ttlMs = CATALOG_TTL_MS } = {}) {
+    this.load = load;
+    this.ttlMs = ttlMs;
+    this.offers = [];
+    this.byId = new Map();
+    this.version = 0;
+    this.builtAt = null;
+    this.refreshAfter = 0;
+    this.refreshing = null;
+    this.listeners = new Set();
+  }
+
+  /**
+   * Return the catalog, building it on first use.
+   * A stale catalog is served as-is while a single background rebuild runs.
+   * @returns {Promise<OfferCatalog>} The ready catalog
+   */
+  async get() {
+    if (this.version === 0) {
+      await this.refresh();
+    } else if (Date.now() >= this.refreshAfter) {
+      this.refresh().catch(error => {
+        console.error('Offer catalog refresh failed:', error);
+      });
+    }
+    return this;
+  }
+
+  /**
+   * Rebuild the catalog. Concurrent callers share the same in-flight rebuild.
+   * @returns {Promise<void>}
+   */
+  refresh() {
+    if (!this.refreshing) {
+      this.refreshing = (async () => {
+        try {
+          const offers = await this.load();
+          this.replace(offers);
+        } catch (error) {
+          // Keep serving the previous catalog and retry a bit later
+          this.refreshAfter = Date.now() + Math.min(this.ttlMs, REFRESH_RETRY_MS);
+          throw error;
+        } finally {
+          this.refreshing = null;
+        }
+      })();
+    }
+    return this.refreshing;
+  }
+
+  /**
+   * Swap in a new offer list and notify subscribers
+   * @param {Array} offers - Complete offer list
+   */
+  replace(offers) {
+    this.offers = offers;
+    this.byId = new Map(offers.map(offer => [offer.id, offer]));
+    this.version++;
+    this.builtAt = new Date();
+    this.refreshAfter = Date.now() + this.ttlMs;
+    this.emit({ type: 'replace', offers });
+  }
+
+  /**
+   * Drop offers from the current catalog without a rebuild (e.g. expired offers).
+   * The version is unchanged; derived indexes apply the `remove` event in place.
+   * @param {Array} offers - Offers to remove (matched by identity)
+   * @returns {Array} Offers that were actually removed
+   */
+  remove(offers) {
+    const removed = offers.filter(offer => this.byId.get(offer.id) === offer);
+    if (removed.length === 0) return removed;
+
+    const dead = new Set(removed);
+    this.offers = this.offers.filter(offer => !dead.has(offer));
+    for (const offer of removed) this.byId.delete(offer.id);
+    this.emit({ type: 'remove', offers: removed });
+    return removed;
+  }
+
+  /**
+   * Register a listener for catalog changes
+   * @param {Function} listener - Called with a change event ({ type: 'replace' | 'remove', offers })
+   * @returns {Function} Unsubscribe function
+   */
+  subscribe(listener) {
+    this.listeners.add(listener);
+    return () => this.listeners.delete(listener);
+  }
+
+  emit(event) {
+    for (const listener of this.listeners) {
+      try {
+        listener(event, this);
+      } catch (error) {
+        console.error('Offer catalog listener failed:', error);
+      }
+    }
+  }
+}
+
+// Shared catalog instance used by the API routes
+export const offerCatalog = new OfferCatalog({ load: generateFinnishOffers });
+
+/**
+ * Get the shared offer catalog, building it if needed
+ * @returns {Promise<OfferCatalog>} The shared catalog
+ */
+export function getOfferCatalog() {
+  return offerCatalog.get();
+}
+
+export default {
+  OfferCatalog,
+  offerCatalog,
+  getOfferCatalog
+};
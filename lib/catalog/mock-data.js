@@ -0,0 +1,249 @@
+/**
+ * Finnish Mock Catalog Data for FoodAI
+ * 
+ * Static restaurant/provider fixtures and the demo offer generator used to
+ * populate the in-process offer catalog until real provider feeds are live.
+ */
+
+import { v5 as uuidv5 } from 'uuid';
+
+// Namespace for deterministic offer IDs (provider + restaurant + slot)
+const OFFER_ID_NAMESPACE = '6b1f3c52-8f0e-4d5a-9c3b-2f7e1a4d9b60';
+
+// Finnish cities - all major cities in Finland
+export const FINNISH_CITIES = [
+  'Helsinki', 'Espoo', 'Tampere', 'Vantaa', 'Oulu', 'Turku', 'Jyväskylä', 
+  'Lahti', 'Kuopio', 'Pori', 'Kouvola', 'Joensuu', 'Lappeenranta', 'Hämeenlinna',
+  'Vaasa', 'Seinäjoki', 'Rovaniemi', 'Mikkeli', 'Kotka', 'Salo', 'Porvoo'
+];
+
+// Finnish cuisine types
+export const FINNISH_CUISINES = [
+  'Suomalainen', 'Pizza', 'Sushi', 'Kiinalainen', 'Intialainen', 'Thai', 'Italiana',
+  'Hampurilainen', 'Kebab', 'Meksikkolainen', 'Aasialainen', 'Vegan', 'Kasvis',
+  'Kala', 'Liha', 'Salaatti', 'Keitto', 'Grill', 'Fast Food', 'Jälkiruoka'
+];
+
+// Mock Finnish restaurants
+export const FINNISH_RESTAURANTS = [
+  { 
+    id: 'rest_1', 
+    name: 'Ravintola Savoy', 
+    city: 'Helsinki', 
+    district: 'Keskusta',
+    cuisine_types: ['Suomalainen', 'Fine Dining'], 
+    rating: 4.8, 
+    latitude: 60.1699, 
+    longitude: 24.9384 
+  },
+  { 
+    id: 'rest_2', 
+    name: 'Pizzeria da Mario', 
+    city: 'Helsinki', 
+    district: 'Kallio',
+    cuisine_types: ['Pizza', 'Italiana'], 
+    rating: 4.3, 
+    latitude: 60.1841, 
+    longitude: 24.9511 
+  },
+  { 
+    id: 'rest_3', 
+    name: 'Sushi Zen', 
+    city: 'Tampere', 
+    district: 'Keskusta',
+    cuisine_types: ['Sushi', 'Japanilainen'], 
+    rating: 4.6, 
+    latitude: 61.4981, 
+    longitude: 23.7608 
+  },
+  { 
+    id: 'rest_4', 
+    name: 'Golden Dragon', 
+    city: 'Turku', 
+    district: 'Keskusta',
+    cuisine_types: ['Kiinalainen', 'Aasialainen'], 
+    rating: 4.4, 
+    latitude: 60.4518, 
+    longitude: 22.2666 
+  },
+  { 
+    id: 'rest_5', 
+    name: 'Burger Palace', 
+    city: 'Oulu', 
+    district: 'Keskusta',
+    cuisine_types: ['Hampurilainen', 'Fast Food'], 
+    rating: 4.2, 
+    latitude: 65.0121, 
+    longitude: 25.4651 
+  },
+  { 
+    id: 'rest_6', 
+    name: 'Kebab King', 
+    city: 'Jyväskylä', 
+    district: 'Keskusta',
+    cuisine_types: ['Kebab', 'Turkkilainen'], 
+    rating: 4.1, 
+    latitude: 62.2426, 
+    longitude: 25.7473 
+  },
+  { 
+    id: 'rest_7', 
+    name: 'Thai Garden', 
+    city: 'Lahti', 
+    district: 'Keskusta',
+    cuisine_types: ['Thai', 'Aasialainen'], 
+    rating: 4.5, 
+    latitude: 60.9827, 
+    longitude: 25.6612 
+  },
+  { 
+    id: 'rest_8', 
+    name: 'Ravintola Aino', 
+    city: 'Kuopio', 
+    district: 'Keskusta',
+    cuisine_types: ['Suomalainen', 'Eurooppalainen'], 
+    rating: 4.7, 
+    latitude: 62.8924, 
+    longitude: 27.6780 
+  }
+];
+
+// Finnish food providers - expanded with requested services
+export const FINNISH_PROVIDERS = [
+  { 
+    id: 'wolt', 
+    name: 'Wolt', 
+    logo_url: 'https://images.unsplash.com/photo-1565299624946-b28f40a0ca4b?w=100&h=100&fit=crop', 
+    color: '#00C2E8',
+    commission_rate: 8.50,
+    website: 'https://wolt.com/fi'
+  },
+  { 
+    id: 'foodora', 
+    name: 'Foodora', 
+    logo_url: 'https://images.unsplash.com/photo-1555992336-03a23a47b61e?w=100&h=100&fit=crop', 
+    color: '#E91E63',
+    commission_rate: 7.20,
+    website: 'https://www.foodora.fi'
+  },
+  { 
+    id: 'resq_club', 
+    name: 'ResQ Club', 
+    logo_url: 'https://images.unsplash.com/photo-1498837167922-ddd27525d352?w=100&h=100&fit=crop', 
+    color: '#4CAF50',
+    commission_rate: 12.00,
+    website: 'https://www.resq-club.com/fi/'
+  },
+  { 
+    id: 'kotipizza', 
+    name: 'Kotipizza', 
+    logo_url: 'https://images.unsplash.com/photo-1513104890138-7c749659a591?w=100&h=100&fit=crop', 
+    color: '#D32F2F',
+    commission_rate: 6.50,
+    website: 'https://www.kotipizza.fi/'
+  },
+  { 
+    id: 'k_ruoka', 
+    name: 'K-Ruoka', 
+    logo_url: 'https://images.unsplash.com/photo-1542838132-92c53300491e?w=100&h=100&fit=crop', 
+    color: '#FF6D00',
+    commission_rate: 5.00,
+    website: 'https://www.k-ruoka.fi/kauppa'
+  },
+  { 
+    id: 'fiksuruoka', 
+    name: 'Fiksuruoka', 
+    logo_url: 'https://images.unsplash.com/photo-1556909114-f6e7ad7d3136?w=100&h=100&fit=crop', 
+    color: '#2E7D32',
+    commission_rate: 9.00,
+    website: 'https://www.fiksuruoka.fi'
+  }
+];
+
+// Finnish food items
+export const FINNISH_FOOD_ITEMS = [
+  'Lohikeitto', 'Karjalanpiirakka', 'Poronkäristys', 'Mustikkapiirakka', 'Korvapuusti',
+  'Margherita Pizza', 'Pepperoni Pizza', 'Quattro Stagioni', 'Calzone',
+  'Nigiri Sushi', 'Maki Roll', 'Sashimi', 'Temaki', 'California Roll',
+  'Cheeseburger', 'Big Burger', 'Chicken Burger', 'Fish Burger', 'Veggie Burger',
+  'Kebab', 'Falafel', 'Gyros', 'Shawarma', 'Iskender',
+  'Pad Thai', 'Green Curry', 'Tom Yum', 'Massaman Curry', 'Som Tam',
+  'Chicken Tikka Masala', 'Biryani', 'Naan', 'Samosa', 'Dal',
+  'Sweet & Sour Chicken', 'Kung Pao', 'Chow Mein', 'Fried Rice', 'Spring Rolls',
+  'Caesar Salaatti', 'Tonnisalaatti', 'Kreikkalainen Salaatti'
+];
+
+// Food image URLs
+// High-quality food images from Unsplash
+const FOOD_IMAGE_IDS = [
+  '1546069901-ba9599a7e63c', // Colorful Buddha Bowl
+  '1715493926880-a15b1fee7b30', // Pancakes with Blueberries  
+  '1555939594-58d7cb561ad1', // Grilled Meat Platter
+  '1533777324565-a040eb52facd', // Pasta Spread
+  '1604908176997-125f25cc6f3d', // Chicken Tomato Salad
+  '1565299624946-b28f40a0ca4b'  // Fallback food image
+];
+
+// Generate Finnish offers
+export function generateFinnishOffers() {
+  const offers = [];
+  const now = new Date();
+  
+  FINNISH_RESTAURANTS.forEach(restaurant => {
+    FINNISH_PROVIDERS.forEach(provider => {
+      const numOffers = Math.floor(Math.random() * 4) + 2; // 2-5 offers
+      
+      for (let i = 0; i < numOffers; i++) {
+        const foodItem = FINNISH_FOOD_ITEMS[Math.floor(Math.random() * FINNISH_FOOD_ITEMS.length)];
+        const originalPrice = Math.floor(Math.random() * 25) + 8; // 8-33 EUR
+        const discountPercent = Math.floor(Math.random() * 45) + 15; // 15-60% discount
+        const discountedPrice = parseFloat((originalPrice * (1 - discountPercent / 100)).toFixed(2));
+        
+        const endsAt = new Date(now);
+        endsAt.setHours(endsAt.getHours() + Math.floor(Math.random() * 48) + 2);
+        
+        const imageId = FOOD_IMAGE_IDS[Math.floor(Math.random() * FOOD_IMAGE_IDS.length)];
+        // Same restaurant/provider/slot keeps the same ID across catalog rebuilds
+        const offerId = uuidv5(`${provider.id}:${restaurant.id}:${i}`, OFFER_ID_NAMESPACE);
+        
+        offers.push({
+          id: offerId,
+          provider_id: provider.id,
+          provider_name: provider.name,
+          provider_logo: provider.logo_url,
+          provider_color: provider.color,
+          restaurant_id: restaurant.id,
+          restaurant_name: restaurant.name,
+          city: restaurant.city,
+          district: restaurant.district,
+          cuisine_types: restaurant.cuisine_types,
+          rating: restaurant.rating,
+          latitude: restaurant.latitude,
+          longitude: restaurant.longitude,
+          title: foodItem,
+          description: `Herkullinen ${foodItem.toLowerCase()} ravintola ${restaurant.name}sta`,
+          original_price: originalPrice,
+          discounted_price: discountedPrice,
+          discount_percent: discountPercent,
+          currency: 'EUR',
+          delivery_fee: Math.floor(Math.random() * 6) + 1, // 1-7 EUR
+          min_order_amount: Math.floor(Math.random() * 20) + 15, // 15-35 EUR
+          has_pickup: Math.random() > 0.4,
+          has_delivery: true,
+          starts_at: now,
+          ends_at: endsAt,
+          image_url: `https://images.unsplash.com/photo-${imageId}?w=400&h=300&fit=crop&auto=format`,
+          tags: ['alennus', ...restaurant.cuisine_types.map(c => c.toLowerCase())],
+          deep_link: `https://${provider.id}.com/restaurant/${restaurant.id}/offer/${offerId}`,
+          is_active: true,
+          created_at: now,
+          updated_at: now,
+          clickCount: Math.floor(Math.random() * 50),
+          revenue: parseFloat((Math.random() * 200).toFixed(2))
+        });
+      }
+    });
+  });
+  
+  return offers;
+}
@@ -0,0 +1,336 @@
+/**
+ * Offer Index for FoodAI
+ *
+ * Secondary indexes over the offer catalog used by the `offers` endpoint:
+ * city, cuisine and provider postings plus presorted views per sort order.
+ * A filtered page is produced by intersecting postings and selecting the
+ * top k by precomputed rank instead of filtering and sorting the whole list.
+ * Keyset cursors resume from a rank in a presorted view and are only valid
+ * for the catalog version they were issued against.
+ */
+
+import { offerCatalog, getOfferCatalog } from './index.js';
+import { selectTopK } from './top-k.js';
+import { LRUCache } from '../cache.js';
+
+// Memoized city/cuisine substring lookups per index build (configurable via environment);
+// the queries come from clients, so the memo is bounded
+const LOOKUP_CACHE_MAX_ENTRIES = parseInt(process.env.OFFER_INDEX_LOOKUP_CACHE_SIZE) || 1000;
+
+// Entries only go stale when the catalog changes, and that clears the memo
+const createLookupCache = () => new LRUCache({ maxEntries: LOOKUP_CACHE_MAX_ENTRIES, ttlMs: Infinity });
+
+// Sort orders supported by the offers endpoint (same semantics as before indexing)
+const SORT_ORDERS = {
+  discount: (a, b) => b.discount_percent - a.discount_percent,
+  price: (a, b) => a.discounted_price - b.discounted_price,
+  rating: (a, b) => b.rating - a.rating
+};
+
+export class OfferIndex {
+  constructor() {
+    this.version = 0;
+    this.size = 0;
+    this.byCity = new Map();
+    this.byCuisine = new Map();
+    this.byProvider = new Map();
+    this.views = {};
+    this.ranks = {};
+    this.minDiscount = 0;
+    this.maxPrice = 0;
+    this.lookupCache = createLookupCache();
+  }
+
+  /**
+   * Rebuild all postings and presorted views from a full offer list
+   * @param {Array} offers - Catalog offers, in catalog order
+   * @param {number} version - Catalog version the index is built from
+   */
+  build(offers, version) {
+    this.version = version;
+    this.size = offers.length;
+    this.byCity = new Map();
+    this.byCuisine = new Map();
+    this.byProvider = new Map();
+    this.lookupCache.clear();
+    this.minDiscount = Infinity;
+    this.maxPrice = -Infinity;
+
+    for (const offer of offers) {
+      addPosting(this.byCity, offer.city.toLowerCase(), offer);
+      addPosting(this.byProvider, offer.provider_id, offer);
+      for (const cuisine of offer.cuisine_types) {
+        addPosting(this.byCuisine, cuisine.toLowerCase(), offer);
+      }
+      this.minDiscount = Math.min(this.minDiscount, offer.discount_percent);
+      this.maxPrice = Math.max(this.maxPrice, offer.discounted_price);
+    }
+
+    // Array.prototype.sort is stable, so ties keep catalog order
+    for (const [sortBy, compare] of Object.entries(SORT_ORDERS)) {
+      const view = [...offers].sort(compare);
+      const rank = new Map();
+      view.forEach((offer, position) => rank.set(offer, position));
+      this.views[sortBy] = view;
+      this.ranks[sortBy] = rank;
+    }
+  }
+
+  /**
+   * Find offers whose key contains the query (substring match on lowercased keys).
+   * Distinct keys are few, so scanning them is cheap; recent results are memoized (LRU).
+   * @param {Map} postings - Key to offers map
+   * @param {string} query - Lowercased query string
+   * @returns {Array} Matching offers without duplicates
+   */
+  lookup(postings, query) {
+    const cacheKey = `${postings === this.byCity ? 'city' : 'cuisine'}:${query}`;
+    let result = this.lookupCache.get(cacheKey);
+    if (!result) {
+      const matchingKeys = [...postings.keys()].filter(key => key.includes(query));
+      if (matchingKeys.length === 1) {
+        result = postings.get(matchingKeys[0]);
+      } else {
+        const seen = new Set();
+        for (const key of matchingKeys) {
+          for (const offer of postings.get(key)) seen.add(offer);
+        }
+        result = [...seen];
+      }
+      this.lookupCache.set(cacheKey, result);
+    }
+    return result;
+  }
+
+  /**
+   * Return one page of filtered, sorted offers
+   * @param {Object} params - city, cuisine, provider, minDiscount, maxPrice, sortBy, offset, limit
+   * @returns {Object} { offers, total }
+   */
+  query({ sortBy = 'discount', offset = 0, limit = 12, ...filters }) {
+    const { view, rank } = this.sortedView(sortBy);
+    const { postings, checkNumeric, passesNumeric } = this.resolveFilters(filters);
+
+    const end = offset + limit;
+
+    if (postings.length === 0) {
+      if (!checkNumeric) {
+        return { offers: view.slice(offset, end), total: view.length };
+      }
+      // Walk the presorted view; the page is collected on the way
+      const page = [];
+      let total = 0;
+      for (const offer of view) {
+        if (!passesNumeric(offer)) continue;
+        if (total >= offset && total < end) page.push(offer);
+        total++;
+      }
+      return { offers: page, total };
+    }
+
+    // Intersect postings starting from the smallest list
+    postings.sort((a, b) => a.length - b.length);
+    const [smallest, ...rest] = postings;
+    const memberships = rest.map(list => new Set(list));
+    const matches = smallest.filter(offer =>
+      memberships.every(set => set.has(offer)) && (!checkNumeric || passesNumeric(offer))
+    );
+
+    const top = selectTopK(matches, end, (a, b) => rank.get(a) - rank.get(b));
+    return { offers: top.slice(offset), total: matches.length };
+  }
+
+  /**
+   * Return the filtered offers that follow a position in a sort order (keyset
+   * pagination). Unlike offset pages, the cost does not grow with the depth.
+   * @param {Object} params - city, cuisine, provider, minDiscount, maxPrice, sortBy, limit,
+   *   afterRank (position of the last offer already returned, -1 for the first page)
+   * @returns {Object} { offers, hasMore, lastRank }
+   */
+  queryAfter({ sortBy = 'discount', afterRank = -1, limit = 12, ...filters }) {
+    const { view, rank } = this.sortedView(sortBy);
+    const { postings, checkNumeric, passesNumeric } = this.resolveFilters(filters);
+
+    let page;
+    if (postings.length === 0) {
+      // Walk the presorted view from the cursor; one extra offer tells whether more follow
+      page = [];
+      for (let position = firstAfter(view, rank, afterRank); position < view.length && page.length <= limit; position++) {
+        const offer = view[position];
+        if (!checkNumeric || passesNumeric(offer)) page.push(offer);
+      }
+    } else {
+      postings.sort((a, b) => a.length - b.length);
+      const [smallest, ...rest] = postings;
+      const memberships = rest.map(list => new Set(list));
+      const matches = smallest.filter(offer =>
+        rank.get(offer) > afterRank &&
+        memberships.every(set => set.has(offer)) && (!checkNumeric || passesNumeric(offer))
+      );
+      page = selectTopK(matches, limit + 1, (a, b) => rank.get(a) - rank.get(b));
+    }
+
+    const offers = page.slice(0, limit);
+    return {
+      offers,
+      hasMore: page.length > limit,
+      lastRank: offers.length > 0 ? rank.get(offers[offers.length - 1]) : afterRank
+    };
+  }
+
+  /**
+   * Remove offers from all postings and views. Ranks of the remaining offers
+   * are kept, so cursors issued before the removal stay valid.
+   * @param {Array} offers - Offers removed from the catalog
+   */
+  remove(offers) {
+    const dead = new Set(offers.filter(offer => this.ranks.discount?.has(offer)));
+    if (dead.size === 0) return;
+
+    const prune = (postings, key) => {
+      const remaining = postings.get(key).filter(offer => !dead.has(offer));
+      if (remaining.length > 0) postings.set(key, remaining);
+      else postings.delete(key);
+    };
+    const cities = new Set();
+    const providers = new Set();
+    const cuisines = new Set();
+    for (const offer of dead) {
+      cities.add(offer.city.toLowerCase());
+      providers.add(offer.provider_id);
+      for (const cuisine of offer.cuisine_types) cuisines.add(cuisine.toLowerCase());
+    }
+    cities.forEach(key => prune(this.byCity, key));
+    providers.forEach(key => prune(this.byProvider, key));
+    cuisines.forEach(key => prune(this.byCuisine, key));
+
+    for (const order of Object.keys(this.views)) {
+      this.views[order] = this.views[order].filter(offer => !dead.has(offer));
+      for (const offer of dead) this.ranks[order].delete(offer);
+    }
+    this.size -= dead.size;
+    this.lookupCache.clear();
+  }
+
+  /**
+   * @param {string} sortBy - Sort order name (unknown names fall back to discount)
+   * @returns {Object} { order, view, rank } for the sort order
+   */
+  sortedView(sortBy) {
+    const order = SORT_ORDERS[sortBy] ? sortBy : 'discount';
+    return { order, view: this.views[order] || [], rank: this.ranks[order] };
+  }
+
+  /**
+   * Resolve filter parameters into postings lists and a numeric predicate
+   * @param {Object} filters - city, cuisine, provider, minDiscount, maxPrice
+   * @returns {Object} { postings, checkNumeric, passesNumeric }
+   */
+  resolveFilters({ city, cuisine, provider, minDiscount = 0, maxPrice = Infinity }) {
+    const postings = [];
+    if (city && city !== 'all') {
+      postings.push(this.lookup(this.byCity, city.toLowerCase()));
+    }
+    if (cuisine && cuisine !== 'all') {
+      postings.push(this.lookup(this.byCuisine, cuisine.toLowerCase()));
+    }
+    if (provider && provider !== 'all') {
+      postings.push(this.byProvider.get(provider) || []);
+    }
+
+    // Skip numeric checks when the bounds cannot exclude anything
+    const checkNumeric = minDiscount > this.minDiscount || maxPrice < this.maxPrice;
+    const passesNumeric = offer =>
+      offer.discount_percent >= minDiscount && offer.discounted_price <= maxPrice;
+
+    return { postings, checkNumeric, passesNumeric };
+  }
+}
+
+/**
+ * Encode a keyset position as an opaque cursor. The cursor is tied to the
+ * catalog version, sort order and filters it was issued for.
+ * @param {Object} position - { version, sortBy, filterKey, rank }
+ * @returns {string} Cursor string
+ */
+export function encodeOfferCursor({ version, sortBy, filterKey, rank }) {
+  return Buffer.from(JSON.stringify({ v: version, s: sortBy, f: filterKey, r: rank })).toString('base64url');
+}
+
+/**
+ * Decode a cursor produced by encodeOfferCursor
+ * @param {string} cursor - Cursor string
+ * @returns {Object|null} { version, sortBy, filterKey, rank } or null when malformed
+ */
+export function decodeOfferCursor(cursor) {
+  try {
+    const { v, s, f, r } = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (!Number.isInteger(v) || !Number.isInteger(r) || typeof s !== 'string' || typeof f !== 'string') {
+      return null;
+    }
+    return { version: v, sortBy: s, filterKey: f, rank: r };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Canonical form of the offer filters, used to check a cursor against its query
+ * @param {Object} filters - city, cuisine, provider, minDiscount, maxPrice
+ * @returns {string} Filter key
+ */
+export function offerFilterKey({ city = '', cuisine = '', provider = '', minDiscount = 0, maxPrice = Infinity }) {
+  return [city.toLowerCase(), cuisine.toLowerCase(), provider, minDiscount, maxPrice].join('|');
+}
+
+// Position of the first offer in a view ranked after afterRank (ranks increase along the view)
+function firstAfter(view, rank, afterRank) {
+  let low = 0;
+  let high = view.length;
+  while (low < high) {
+    const middle = (low + high) >> 1;
+    if (rank.get(view[middle]) <= afterRank) low = middle + 1;
+    else high = middle;
+  }
+  return low;
+}
+
+function addPosting(postings, key, offer) {
+  const list = postings.get(key);
+  if (list) {
+    list.push(offer);
+  } else {
+    postings.set(key, [offer]);
+  }
+}
+
+// Shared index kept in step with the shared offer catalog
+export const offerIndex = new OfferIndex();
+
+// Removals (expiry) are applied in place; full rebuilds are picked up by version
+offerCatalog.subscribe((event, catalog) => {
+  if (event.type === 'remove' && offerIndex.version === catalog.version) {
+    offerIndex.remove(event.offers);
+  }
+});
+
+/**
+ * Get the offer index for the current catalog, rebuilding it after a catalog refresh
+ * @returns {Promise<OfferIndex>} Index matching the current catalog version
+ */
+export async function getOfferIndex() {
+  const catalog = await getOfferCatalog();
+  if (offerIndex.version !== catalog.version) {
+    offerIndex.build(catalog.offers, catalog.version);
+  }
+  return offerIndex;
+}
+
+export default {
+  OfferIndex,
+  offerIndex,
+  getOfferIndex,
+  encodeOfferCursor,
+  decodeOfferCursor,
+  offerFilterKey
+};
@@ -0,0 +1,122 @@
+/**
+ * Offer Projection for FoodAI
+ *
+ * Shapes offers for the `offers` endpoint. By default only the fields the
+ * offer grid renders are sent, and provider and restaurant details are
+ * deduplicated into lookup tables keyed by id instead of being repeated on
+ * every offer. `fields=` selects other fields, `fields=full` the whole offer.
+ */
+
+// Fields of the compact list view (what the offer grid in app/page.js renders;
+// distance_km is only present on near-me searches)
+export const OFFER_LIST_FIELDS = [
+  'id',
+  'provider_id',
+  'restaurant_id',
+  'title',
+  'description',
+  'image_url',
+  'original_price',
+  'discounted_price',
+  'discount_percent',
+  'currency',
+  'ends_at',
+  'deep_link',
+  'distance_km'
+];
+
+// Per-provider and per-restaurant fields, served once per page in the lookup tables
+const PROVIDER_LOOKUP_FIELDS = {
+  name: 'provider_name',
+  logo_url: 'provider_logo',
+  color: 'provider_color'
+};
+
+const RESTAURANT_LOOKUP_FIELDS = {
+  name: 'restaurant_name',
+  city: 'city',
+  district: 'district',
+  cuisine_types: 'cuisine_types',
+  rating: 'rating',
+  latitude: 'latitude',
+  longitude: 'longitude'
+};
+
+const FULL_VIEW = new Set(['full', '*']);
+
+/**
+ * Parse the `fields` query parameter
+ * @param {string|null} param - Comma-separated field names, `full`/`*`, or empty for the list view
+ * @returns {Array<string>|null} Fields to keep (always including id), or null for whole offers
+ */
+export function parseFields(param) {
+  if (!param) return OFFER_LIST_FIELDS;
+
+  const names = param.split(',').map(name => name.trim()).filter(Boolean);
+  if (names.some(name => FULL_VIEW.has(name))) return null;
+
+  return [...new Set(['id', ...names])];
+}
+
+function pick(source, mapping) {
+  const entry = {};
+  for (const [name, field] of Object.entries(mapping)) {
+    if (source[field] !== undefined) entry[name] = source[field];
+  }
+  return entry;
+}
+
+/**
+ * Keep only the selected fields of one offer
+ * @param {Object} offer - Catalog offer
+ * @param {Array<string>|null} fields - Output of parseFields (null keeps the offer as is)
+ * @returns {Object} Projected offer
+ */
+export function projectOffer(offer, fields) {
+  if (!fields) return offer;
+  const projected = {};
+  for (const field of fields) {
+    if (offer[field] !== undefined) projected[field] = offer[field];
+  }
+  return projected;
+}
+
+/**
+ * Project one page of offers
+ * @param {Array} offers - Catalog offers
+ * @param {Array<string>|null} fields - Output of parseFields
+ * @returns {Object} { offers, providers?, restaurants? } (lookup tables only for
+ *   projected views that reference provider_id / restaurant_id)
+ */
+export function projectOffers(offers, fields) {
+  if (!fields) return { offers };
+
+  const result = { offers: offers.map(offer => projectOffer(offer, fields)) };
+
+  if (fields.includes('provider_id')) {
+    result.providers = {};
+    for (const offer of offers) {
+      if (!(offer.provider_id in result.providers)) {
+        result.providers[offer.provider_id] = pick(offer, PROVIDER_LOOKUP_FIELDS);
+      }
+    }
+  }
+
+  if (fields.includes('restaurant_id')) {
+    result.restaurants = {};
+    for (const offer of offers) {
+      if (!(offer.restaurant_id in result.restaurants)) {
+        result.restaurants[offer.restaurant_id] = pick(offer, RESTAURANT_LOOKUP_FIELDS);
+      }
+    }
+  }
+
+  return result;
+}
+
+export default {
+  OFFER_LIST_FIELDS,
+  parseFields,
+  projectOffer,
+  projectOffers
+};
@@ -0,0 +1,58 @@
+/**
+ * Bounded Top-K Selection
+ *
+ * Picks the first k items of a collection under a comparator without sorting
+ * the whole collection: O(n log k) with a bounded binary heap.
+ */
+
+/**
+ * Select the k smallest items according to compare, returned in sorted order
+ * @param {Iterable} items - Items to select from
+ * @param {number} k - Number of items to keep
+ * @param {Function} compare - Comparator, negative when a sorts before b
+ * @returns {Array} Up to k items, sorted by compare
+ */
+export function selectTopK(items, k, compare) {
+  if (k <= 0) return [];
+
+  // Max-heap on compare: the root is the worst item currently kept
+  const heap = [];
+
+  const siftUp = (index) => {
+    while (index > 0) {
+      const parent = (index - 1) >> 1;
+      if (compare(heap[index], heap[parent]) <= 0) break;
+      [heap[index], heap[parent]] = [heap[parent], heap[index]];
+      index = parent;
+    }
+  };
+
+  const siftDown = (index) => {
+    for (;;) {
+      const left = index * 2 + 1;
+      const right = left + 1;
+      let largest = index;
+      if (left < heap.length && compare(heap[left], heap[largest]) > 0) largest = left;
+      if (right < heap.length && compare(heap[right], heap[largest]) > 0) largest = right;
+      if (largest === index) break;
+      [heap[index], heap[largest]] = [heap[largest], heap[index]];
+      index = largest;
+    }
+  };
+
+  for (const item of items) {
+    if (heap.length < k) {
+      heap.push(item);
+      siftUp(heap.length - 1);
+    } else if (compare(item, heap[0]) < 0) {
+      heap[0] = item;
+      siftDown(0);
+    }
+  }
+
+  return heap.sort(compare);
+}
+
+export default {
+  selectTopK
+};
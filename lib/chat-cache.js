@@ -0,0 +1,160 @@
+/**
+ * Chat Response Cache for FoodAI
+ *
+ * Caches DeepSeek answers keyed on the normalized conversation and a digest
+ * of the offers table sent to the model, so snapshot refreshes that leave the
+ * relevant offers unchanged keep their cached answers. Plain responses go through the shared cache helpers;
+ * streamed responses are recorded chunk by chunk so a hit can be replayed as
+ * SSE, and identical requests arriving while a stream is still running share
+ * that one upstream stream.
+ */
+
+import { createHash } from 'crypto';
+import { LRUCache, createSwrCache } from './cache.js';
+import { encodeOffers } from './deepseek.js';
+
+// Cache size and lifetime (configurable via environment)
+const CHAT_CACHE_TTL_MS = parseInt(process.env.CHAT_CACHE_TTL_MS) || 10 * 60 * 1000;
+const CHAT_CACHE_MAX_ENTRIES = parseInt(process.env.CHAT_CACHE_MAX_ENTRIES) || 500;
+
+/**
+ * Normalize a message for cache keys (case, whitespace and trailing punctuation)
+ * @param {string} content - Message text
+ * @returns {string} Normalized text
+ */
+function normalizeContent(content) {
+  return String(content || '')
+    .toLowerCase()
+    .replace(/\s+/g, ' ')
+    .trim()
+    .replace(/[\s?!.]+$/, '');
+}
+
+/**
+ * Build a cache key for a conversation
+ * @param {string} kind - Response kind ('chat' or 'stream'; their prompts differ)
+ * @param {Array} messages - Chat messages
+ * @param {Object} options - { offers } offer context passed to the model
+ * @returns {string} Cache key
+ */
+export function buildChatCacheKey(kind, messages, { offers = [] } = {}) {
+  const conversation = messages.map(message => [message.role, normalizeContent(message.content)]);
+  const digest = createHash('sha1').update(JSON.stringify(conversation)).digest('base64url');
+  // The rendered table is what the model sees; the prompt's budget only ever trims it
+  const { text } = encodeOffers(offers);
+  const offersDigest = text ? createHash('sha1').update(text).digest('base64url') : 'none';
+  return `${kind}:${offersDigest}:${digest}`;
+}
+
+// Completed non-streaming answers (fresh for the TTL, never served stale)
+export const chatResponseCache = createSwrCache({
+  maxEntries: CHAT_CACHE_MAX_ENTRIES,
+  freshMs: CHAT_CACHE_TTL_MS,
+  staleMs: 0
+});
+
+/**
+ * Create a cache for streamed responses
+ * @param {Object} options
+ * @param {number} options.maxEntries - Completed streams kept in memory
+ * @param {number} options.ttlMs - Lifetime of a completed stream
+ * @returns {Object} Cache with open(key, start) and stats()
+ */
+export function createStreamCache({ maxEntries = CHAT_CACHE_MAX_ENTRIES, ttlMs = CHAT_CACHE_TTL_MS } = {}) {
+  const completed = new LRUCache({ maxEntries, ttlMs });
+  const running = new Map();
+  const counters = { hits: 0, misses: 0, shared: 0, errors: 0 };
+
+  // Yield recorded chunks, then follow the live stream until it ends
+  async function* follow(entry) {
+    let index = 0;
+    while (true) {
+      if (index < entry.chunks.length) {
+        yield entry.chunks[index++];
+      } else if (entry.error) {
+        throw entry.error;
+      } else if (entry.done) {
+        return;
+      } else {
+        await new Promise(resolve => entry.waiters.push(resolve));
+      }
+    }
+  }
+
+  async function* replay(chunks) {
+    yield* chunks;
+  }
+
+  const notify = (entry) => {
+    const waiters = entry.waiters;
+    entry.waiters = [];
+    waiters.forEach(resolve => resolve());
+  };
+
+  const pump = async (key, entry, source) => {
+    try {
+      for await (const chunk of source) {
+        entry.chunks.push(chunk);
+        notify(entry);
+      }
+      entry.done = true;
+      completed.set(key, entry.chunks);
+    } catch (error) {
+      counters.errors++;
+      entry.error = error;
+    } finally {
+      running.delete(key);
+      notify(entry);
+    }
+  };
+
+  return {
+    /**
+     * Open a stream for key: replay a cached one, join a running one, or start it
+     * @param {string} key - Cache key
+     * @param {Function} start - Async () => AsyncIterable of content strings
+     * @returns {Promise<Object>} { chunks: AsyncIterable<string>, cache: 'hit' | 'shared' | 'miss' }
+     */
+    async open(key, start) {
+      const cached = completed.get(key);
+      if (cached) {
+        counters.hits++;
+        return { chunks: replay(cached), cache: 'hit' };
+      }
+
+      let entry = running.get(key);
+      let cache = 'shared';
+      if (entry) {
+        counters.shared++;
+      } else {
+        counters.misses++;
+        cache = 'miss';
+        entry = { chunks: [], done: false, error: null, waiters: [] };
+        entry.ready = Promise.resolve().then(start);
+        running.set(key, entry);
+        entry.ready.then(
+          source => pump(key, entry, source),
+          () => running.delete(key)
+        );
+      }
+
+      // Connection errors surface to every caller before any SSE is written
+      await entry.ready;
+      return { chunks: follow(entry), cache };
+    },
+
+    stats() {
+      return { ...counters, entries: completed.size, evictions: completed.evictions, running: running.size };
+    }
+  };
+}
+
+// Shared cache for /api/chat/stream
+export const chatStreamCache = createStreamCache();
+
+export default {
+  buildChatCacheKey,
+  chatResponseCache,
+  createStreamCache,
+  chatStreamCache
+};
@@ -0,0 +1,274 @@
+/**
+ * Clickout Ingestion Queue for FoodAI
+ *
+ * Buffers clickouts in process and writes them to Supabase in bulk, so the
+ * clickout request returns immediately. Batches are flushed when the queue
+ * reaches `batchSize` or after `flushIntervalMs`. Failed inserts are retried
+ * with backoff; batches that still fail are spilled to a bounded local NDJSON
+ * file and replayed after the next successful flush. Offer and provider ids
+ * are checked once per batch, so a click on an offer or provider that is not
+ * in the database (e.g. the generated catalog, or a stale id from a client)
+ * is stored without that reference instead of failing the foreign key for
+ * the whole batch.
+ */
+
+import { promises as fs } from 'fs';
+import os from 'os';
+import path from 'path';
+import { supabase } from './supabase.js';
+import { trackUpstream } from './metrics.js';
+
+const BATCH_SIZE = parseInt(process.env.CLICKOUT_BATCH_SIZE) || 100;
+const FLUSH_INTERVAL_MS = parseInt(process.env.CLICKOUT_FLUSH_INTERVAL_MS) || 1000;
+const MAX_QUEUE = parseInt(process.env.CLICKOUT_MAX_QUEUE) || 10000;
+const MAX_RETRIES = 3;
+const RETRY_BASE_MS = 200;
+const SPILL_PATH = process.env.CLICKOUT_SPILL_PATH || path.join(os.tmpdir(), 'foodai-clickouts.ndjson');
+const MAX_SPILL_BYTES = parseInt(process.env.CLICKOUT_SPILL_MAX_BYTES) || 10 * 1024 * 1024;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Postgres data exceptions (22xxx) and integrity violations (23xxx) will never succeed on retry
+const isRowError = (error) => /^2[23]/.test(String(error?.code || ''));
+
+/**
+ * Create a clickout queue
+ * @param {Object} options
+ * @param {Function} options.insertBatch - Async (rows) => { unlinked? }, throws on failure
+ * @param {number} options.batchSize - Rows per bulk insert
+ * @param {number} options.flushIntervalMs - Maximum time a row waits before a flush
+ * @param {number} options.maxQueue - Rows kept in memory before spilling directly
+ * @param {string} options.spillPath - NDJSON file for rows that could not be written
+ * @param {number} options.maxSpillBytes - Size cap for the spill file
+ * @returns {Object} Queue with enqueue(row), flush() and stats()
+ */
+export function createClickoutQueue({
+  insertBatch,
+  batchSize = BATCH_SIZE,
+  flushIntervalMs = FLUSH_INTERVAL_MS,
+  maxQueue = MAX_QUEUE,
+  spillPath = SPILL_PATH,
+  maxSpillBytes = MAX_SPILL_BYTES
+}) {
+  let queue = [];
+  let timer = null;
+  let flushing = null;
+  let hasSpill = true; // a previous process may have left a spill file behind
+  const counters = {
+    enqueued: 0, written: 0, batches: 0, retries: 0, spilled: 0, replayed: 0, rejected: 0, dropped: 0, unlinked: 0,
+    corruptSpillLines: 0
+  };
+
+  const insertWithRetry = async (rows) => {
+    for (let attempt = 0; ; attempt++) {
+      try {
+        const result = await insertBatch(rows);
+        counters.written += rows.length;
+        counters.unlinked += result?.unlinked || 0;
+        counters.batches++;
+        return;
+      } catch (error) {
+        if (isRowError(error)) {
+          // A bad row (constraint/data error) fails the whole batch: split to isolate it
+          if (rows.length === 1) {
+            counters.rejected++;
+            console.error('Clickout rejected by Supabase:', error.message, rows[0]);
+            return;
+          }
+          const middle = Math.ceil(rows.length / 2);
+          await insertWithRetry(rows.slice(0, middle));
+          await insertWithRetry(rows.slice(middle));
+          return;
+        }
+        if (attempt >= MAX_RETRIES) throw error;
+        counters.retries++;
+        await sleep(RETRY_BASE_MS * 2 ** attempt);
+      }
+    }
+  };
+
+  const spill = async (rows) => {
+    try {
+      const size = await fs.stat(spillPath).then(stat => stat.size, () => 0);
+      const data = rows.map(row => JSON.stringify(row)).join('\n') + '\n';
+      if (size + Buffer.byteLength(data) > maxSpillBytes) {
+        counters.dropped += rows.length;
+        console.error(`Clickout spill file full, dropped ${rows.length} clickouts`);
+        return;
+      }
+      await fs.appendFile(spillPath, data);
+      counters.spilled += rows.length;
+      hasSpill = true;
+    } catch (error) {
+      counters.dropped += rows.length;
+      console.error('Failed to spill clickouts:', error);
+    }
+  };
+
+  // Re-insert spilled rows once Supabase accepts writes again
+  const replaySpill = async () => {
+    const replayPath = `${spillPath}.replay`;
+    // A replay file left by an interrupted replay is finished before new spills are taken
+    const leftover = await fs.access(replayPath).then(() => true, () => false);
+    if (!leftover) {
+      try {
+        await fs.rename(spillPath, replayPath);
+      } catch {
+        hasSpill = false;
+        return;
+      }
+    }
+
+    const rows = [];
+    try {
+      const lines = (await fs.readFile(replayPath, 'utf8')).split('\n').filter(Boolean);
+      for (const line of lines) {
+        try {
+          rows.push(JSON.parse(line));
+        } catch {
+          // A crash mid-append can leave a truncated last line; skip it, keep the rest
+          counters.corruptSpillLines++;
+        }
+      }
+    } catch (error) {
+      // Leave the replay file in place; it is picked up again on the next replay
+      console.error('Failed to read clickout spill file:', error);
+      return;
+    }
+    await fs.unlink(replayPath).catch(() => {});
+    // After a leftover file, check for newer spills on the next flush
+    hasSpill = leftover;
+
+    for (let i = 0; i < rows.length; i += batchSize) {
+      const batch = rows.slice(i, i + batchSize);
+      try {
+        await insertWithRetry(batch);
+        counters.replayed += batch.length;
+      } catch (error) {
+        console.error('Clickout spill replay failed:', error);
+        await spill(rows.slice(i));
+        return;
+      }
+    }
+  };
+
+  const runFlush = async () => {
+    while (queue.length > 0) {
+      const batch = queue.splice(0, batchSize);
+      try {
+        await insertWithRetry(batch);
+      } catch (error) {
+        console.error('Clickout bulk insert failed, spilling to disk:', error);
+        await spill(batch.concat(queue.splice(0)));
+        return;
+      }
+    }
+    if (hasSpill) {
+      await replaySpill();
+    }
+  };
+
+  const flush = () => {
+    if (timer) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    if (!flushing) {
+      flushing = runFlush()
+        .catch(error => console.error('Clickout flush failed:', error))
+        .finally(() => {
+          flushing = null;
+          if (queue.length > 0) schedule();
+        });
+    }
+    return flushing;
+  };
+
+  const schedule = () => {
+    if (queue.length >= batchSize) {
+      flush();
+    } else if (!timer) {
+      timer = setTimeout(flush, flushIntervalMs);
+      if (timer.unref) timer.unref();
+    }
+  };
+
+  return {
+    /**
+     * Queue a clickout row for the next bulk insert (never blocks the caller)
+     * @param {Object} row - Row for the clickouts table
+     */
+    enqueue(row) {
+      counters.enqueued++;
+      if (queue.length >= maxQueue) {
+        spill([row]);
+        return;
+      }
+      queue.push(row);
+      schedule();
+    },
+
+    flush,
+
+    stats() {
+      return { ...counters, queued: queue.length };
+    }
+  };
+}
+
+/**
+ * Ids from one column of a batch that exist in the referenced table
+ * @param {Array} rows - Clickout rows
+ * @param {string} column - Foreign key column (offer_id, provider_id)
+ * @param {string} table - Referenced table
+ * @returns {Promise<Set>} Known ids
+ */
+async function knownIds(rows, column, table) {
+  const ids = [...new Set(rows.map(row => row[column]).filter(Boolean))];
+  if (ids.length === 0) return new Set();
+  const { data, error } = await trackUpstream('supabase', () => supabase
+    .from(table)
+    .select('id')
+    .in('id', ids));
+  if (error) throw error;
+  return new Set(data.map(entry => entry.id));
+}
+
+/**
+ * Insert a batch into the Supabase clickouts table (no read-back). Offer and
+ * provider ids missing from their tables are checked with one query each and
+ * cleared, so the click is still counted rather than failing the batch.
+ * @param {Array} rows - Clickout rows
+ * @returns {Promise<Object>} { unlinked } rows with a reference cleared
+ */
+async function insertClickouts(rows) {
+  const [offers, providers] = await Promise.all([
+    knownIds(rows, 'offer_id', 'offers'),
+    knownIds(rows, 'provider_id', 'providers')
+  ]);
+
+  let unlinked = 0;
+  const checked = rows.map(row => {
+    const unknownOffer = row.offer_id && !offers.has(row.offer_id);
+    const unknownProvider = row.provider_id && !providers.has(row.provider_id);
+    if (!unknownOffer && !unknownProvider) return row;
+    unlinked++;
+    return {
+      ...row,
+      offer_id: unknownOffer ? null : row.offer_id,
+      provider_id: unknownProvider ? null : row.provider_id
+    };
+  });
+
+  const { error } = await trackUpstream('supabase', () => supabase.from('clickouts').insert(checked));
+  if (error) throw error;
+  return { unlinked };
+}
+
+// Shared queue writing to the Supabase clickouts table
+export const clickoutQueue = createClickoutQueue({ insertBatch: insertClickouts });
+
+export default {
+  createClickoutQueue,
+  clickoutQueue
+};
@@ -6,6 +6,7 @@
  */
 
 import OpenAI from 'openai';
+import { recordPromptTokens, recordUpstream, trackUpstream } from './metrics.js';
 
 // DeepSeek API client (compatible with OpenAI SDK)
 export const deepseekClient = new OpenAI({
@@ -13,19 +14,18 @@ export const deepseekClient = new OpenAI({
   baseURL: process.env.DEEPSEEK_BASE_URL || 'https://api.deepseek.com',
 });
 
-/**
- * Generate AI response for food deal queries
- * @param {Array} messages - Array of chat messages
- * @param {Object} context - Additional context about available offers
- * @returns {Object} AI response message
- */
-export const generateFoodDealResponse = async (messages, context = null) => {
-  const startTime = Date.now();
-  let status = 'success';
-  
-  try {
-    // Enhanced system prompt with Finnish context and current deals
-    const systemPrompt = `Olet FoodAI:n avustaja, joka auttaa löytämään parhaita ruokatarjouksia Suomessa. 
+// Prompt token budget per call (configurable via DEEPSEEK_PROMPT_TOKEN_BUDGET)
+const PROMPT_TOKEN_BUDGET = parseInt(process.env.DEEPSEEK_PROMPT_TOKEN_BUDGET) || 3000;
+
+// Share of the budget reserved for the offers table
+const OFFERS_TOKEN_BUDGET = parseInt(process.env.DEEPSEEK_OFFERS_TOKEN_BUDGET) || 900;
+
+// Upper bound for the summary line of dropped history
+const HISTORY_SUMMARY_TOKENS = 120;
+
+// Static system prompts. Kept byte-identical between calls so the upstream
+// prefix cache can reuse them; per-request data goes in a later message.
+const FOOD_DEAL_SYSTEM_PROMPT = `Olet FoodAI:n avustaja, joka auttaa löytämään parhaita ruokatarjouksia Suomessa. 
 
 KONTEKSTI:
 - Palvelemme Suomen markkinoita (Helsinki, Tampere, Turku, Oulu, jne.)
@@ -48,19 +48,151 @@ TYYLI:
 - Anna konkreettisia vinkkejä
 - Mainitse hinnat ja säästöt
 - Käytä emojeja kohtuudella 🍕🍔🌱
-- Vastaa käyttäjän kielellä (suomi/englanti)
+- Vastaa käyttäjän kielellä (suomi/englanti)`;
+
+const STREAMING_SYSTEM_PROMPT = `Olet FoodAI:n avustaja, joka auttaa löytämään parhaita ruokatarjouksia Suomessa. 
+
+KONTEKSTI:
+- Palvelemme Suomen markkinoita
+- Integroituna Wolt, Foodora ja ResQ Club palveluihin
+- Hinnat euroissa (€)
+- Puhut sujuvaa suomea ja englantia
+
+TEHTÄVÄSI:
+✅ Etsi ruokatarjouksia ja anna suosituksia
+✅ Vertaile hintoja ja alennuksia
+✅ Auta ruokavaliorajoituksissa
+✅ Mainitse ympäristövaikutukset
+
+Vastaa lyhyesti ja ytimekkäästi.`;
+
+const OFFERS_HEADER = 'NYKYISET TARJOUKSET (tarjous|ravintola|kaupunki|keittiö|hinta €|norm. €|ale %|palvelu):';
+
+/**
+ * Rough token estimate for prompt budgeting (~3 characters per token for Finnish text)
+ * @param {string} text - Prompt text
+ * @returns {number} Estimated tokens
+ */
+export function estimateTokens(text) {
+  return Math.ceil((text || '').length / 3) + 1;
+}
+
+const cell = (value) => String(value ?? '').replace(/[|\n]/g, ' ').trim();
+
+/**
+ * Render offers as one pipe-separated line each, stopping at the token budget
+ * @param {Array} offers - Offer context objects
+ * @param {number} budgetTokens - Maximum tokens for the rendered table
+ * @returns {Object} { text, included }
+ */
+export function encodeOffers(offers, budgetTokens = OFFERS_TOKEN_BUDGET) {
+  if (!offers || offers.length === 0) return { text: '', included: 0 };
+
+  const lines = [OFFERS_HEADER];
+  let used = estimateTokens(OFFERS_HEADER);
+  for (const offer of offers) {
+    const line = [
+      offer.title,
+      offer.restaurant_name ?? offer.restaurant,
+      offer.city,
+      offer.cuisine,
+      offer.discounted_price ?? offer.discountedPrice,
+      offer.original_price ?? offer.originalPrice,
+      offer.discount_percentage ?? offer.discount,
+      offer.provider_name ?? offer.provider
+    ].map(cell).join('|');
+    const cost = estimateTokens(line);
+    if (used + cost > budgetTokens) break;
+    lines.push(line);
+    used += cost;
+  }
+
+  const included = lines.length - 1;
+  if (included < offers.length) {
+    lines.push(`(+${offers.length - included} muuta tarjousta)`);
+  }
+  return { text: lines.join('\n'), included };
+}
+
+/**
+ * Keep the newest chat messages that fit the budget; older turns collapse
+ * into one short summary of the user's earlier questions
+ * @param {Array} messages - Chat history, oldest first
+ * @param {number} budgetTokens - Maximum tokens for the history
+ * @returns {Object} { messages, dropped }
+ */
+export function truncateHistory(messages, budgetTokens) {
+  const kept = [];
+  let used = 0;
+  let index = messages.length - 1;
+  for (; index >= 0; index--) {
+    const cost = estimateTokens(messages[index].content) + 4;
+    // The latest message is always sent, whatever its size
+    if (kept.length > 0 && used + cost > budgetTokens - HISTORY_SUMMARY_TOKENS) break;
+    kept.unshift(messages[index]);
+    used += cost;
+  }
 
-${context ? `\nNYKYISET TARJOUKSET:\n${JSON.stringify(context, null, 2)}` : ''}`;
+  const dropped = messages.slice(0, index + 1);
+  if (dropped.length === 0) return { messages: kept, dropped: 0 };
+
+  const questions = dropped
+    .filter(message => message.role === 'user')
+    .map(message => cell(message.content).slice(0, 60));
+  let summary = `Aiempi keskustelu tiivistettynä (${dropped.length} viestiä), käyttäjä kysyi: ${questions.join(' / ')}`;
+  summary = summary.slice(0, HISTORY_SUMMARY_TOKENS * 3);
+
+  return { messages: [{ role: 'system', content: summary }, ...kept], dropped: dropped.length };
+}
+
+/**
+ * Build the message list for a call: static system prompt, compact offers
+ * context, then as much chat history as the remaining budget allows
+ * @param {string} systemPrompt - Static system prompt
+ * @param {Array} messages - Chat history
+ * @param {Array|Object} context - Offer list or { availableOffers, totalOffers }
+ * @param {number} budgetTokens - Total prompt budget
+ * @returns {Object} { messages, estimatedTokens, offersIncluded, historyDropped }
+ */
+export function buildPromptMessages(systemPrompt, messages, context = null, budgetTokens = PROMPT_TOKEN_BUDGET) {
+  const offers = Array.isArray(context) ? context : context?.availableOffers || [];
+  const systemTokens = estimateTokens(systemPrompt);
+
+  const { text: offersText, included } = encodeOffers(
+    offers,
+    Math.min(OFFERS_TOKEN_BUDGET, Math.max(0, budgetTokens - systemTokens))
+  );
+  const offersTokens = offersText ? estimateTokens(offersText) : 0;
+
+  const history = truncateHistory(messages, budgetTokens - systemTokens - offersTokens);
+
+  const promptMessages = [{ role: 'system', content: systemPrompt }];
+  if (offersText) {
+    promptMessages.push({ role: 'system', content: offersText });
+  }
+  promptMessages.push(...history.messages);
+
+  const estimatedTokens = promptMessages.reduce((sum, message) => sum + estimateTokens(message.content) + 4, 0);
+  return { messages: promptMessages, estimatedTokens, offersIncluded: included, historyDropped: history.dropped };
+}
+
+/**
+ * Generate AI response for food deal queries
+ * @param {Array} messages - Array of chat messages
+ * @param {Array|Object} context - Available offers (array or { availableOffers, totalOffers })
+ * @returns {Object} AI response message
+ */
+export const generateFoodDealResponse = async (messages, context = null) => {
+  const startTime = Date.now();
+  let status = 'success';
+  
+  try {
+    const prompt = buildPromptMessages(FOOD_DEAL_SYSTEM_PROMPT, messages, context);
+    recordPromptTokens('chat', prompt.estimatedTokens);
 
     const response = await deepseekClient.chat.completions.create({
       model: 'deepseek-chat',
-      messages: [
-        {
-          role: 'system',
-          content: systemPrompt
-        },
-        ...messages
-      ],
+      messages: prompt.messages,
       temperature: 0.7,
       max_tokens: 1000,
       presence_penalty: 0.1,
@@ -68,12 +200,14 @@ ${context ? `\nNYKYISET TARJOUKSET:\n${JSON.stringify(context, null, 2)}` : ''}`
     });
 
     const duration = Date.now() - startTime;
+    recordUpstream('deepseek', 'ok', duration);
     console.log(`DeepSeek API call successful in ${duration}ms`);
 
     return response.choices[0].message;
   } catch (error) {
     status = 'error';
     const duration = Date.now() - startTime;
+    recordUpstream('deepseek', 'error', duration);
     console.error('DeepSeek API Error:', error);
     
     // Log for monitoring
@@ -87,42 +221,22 @@ ${context ? `\nNYKYISET TARJOUKSET:\n${JSON.stringify(context, null, 2)}` : ''}`
 /**
  * Generate streaming response for real-time chat experience
  * @param {Array} messages - Array of chat messages  
- * @param {Object} context - Additional context about available offers
+ * @param {Array|Object} context - Available offers (array or { availableOffers, totalOffers })
  * @returns {AsyncIterable} Streaming response
  */
 export const generateStreamingFoodDealResponse = async (messages, context = null) => {
   try {
-    const systemPrompt = `Olet FoodAI:n avustaja, joka auttaa löytämään parhaita ruokatarjouksia Suomessa. 
-
-KONTEKSTI:
-- Palvelemme Suomen markkinoita
-- Integroituna Wolt, Foodora ja ResQ Club palveluihin
-- Hinnat euroissa (€)
-- Puhut sujuvaa suomea ja englantia
-
-TEHTÄVÄSI:
-✅ Etsi ruokatarjouksia ja anna suosituksia
-✅ Vertaile hintoja ja alennuksia
-✅ Auta ruokavaliorajoituksissa
-✅ Mainitse ympäristövaikutukset
-
-Vastaa lyhyesti ja ytimekkäästi.
-
-${context ? `\nTarjoukset:\n${JSON.stringify(context, null, 2)}` : ''}`;
+    const prompt = buildPromptMessages(STREAMING_SYSTEM_PROMPT, messages, context);
+    recordPromptTokens('stream', prompt.estimatedTokens);
 
-    const stream = await deepseekClient.chat.completions.create({
+    // Times opening the stream (time to response headers), not the whole answer
+    const stream = await trackUpstream('deepseek_stream', () => deepseekClient.chat.completions.create({
       model: 'deepseek-chat',
-      messages: [
-        {
-          role: 'system',
-          content: systemPrompt
-        },
-        ...messages
-      ],
+      messages: prompt.messages,
       stream: true,
       temperature: 0.7,
       max_tokens: 800,
-    });
+    }));
 
     return stream;
   } catch (error) {
@@ -138,21 +252,11 @@ ${context ? `\nTarjoukset:\n${JSON.stringify(context, null, 2)}` : ''}`;
  * @returns {Object} AI response with offer context
  */
 export const generateContextualResponse = async (messages, currentOffers = []) => {
-  // Limit offers to prevent token overflow
-  const limitedOffers = currentOffers.slice(0, 10).map(offer => ({
-    title: offer.title,
-    restaurant: offer.restaurant_name,
-    originalPrice: offer.original_price,
-    discountedPrice: offer.discounted_price,
-    discount: offer.discount_percentage,
-    provider: offer.provider_name,
-    cuisine: offer.cuisine
-  }));
-
+  // The encoder trims the offers to the token budget; no timestamp, so the
+  // prompt stays identical for identical conversations
   const context = {
-    availableOffers: limitedOffers,
-    totalOffers: currentOffers.length,
-    timestamp: new Date().toISOString()
+    availableOffers: currentOffers,
+    totalOffers: currentOffers.length
   };
 
   return await generateFoodDealResponse(messages, context);
@@ -187,5 +291,9 @@ export default {
   generateFoodDealResponse,
   generateStreamingFoodDealResponse,
   generateContextualResponse,
-  checkDeepSeekHealth
+  checkDeepSeekHealth,
+  estimateTokens,
+  encodeOffers,
+  truncateHistory,
+  buildPromptMessages
 };
\ No newline at end of file
@@ -0,0 +1,109 @@
+/**
+ * HTTP Caching for FoodAI
+ *
+ * Strong ETags with 304 Not Modified responses for JSON endpoints, and
+ * precompressed (brotli/gzip) bodies for payloads that never change while
+ * the process runs, so they are serialized and compressed once instead of
+ * on every request.
+ */
+
+import { createHash } from 'crypto';
+import { brotliCompressSync, gzipSync, constants as zlibConstants } from 'zlib';
+
+// Bodies smaller than this are not worth compressing
+const MIN_COMPRESS_BYTES = 256;
+
+/**
+ * Strong ETag for a response body
+ * @param {string|Buffer} body - Serialized body
+ * @returns {string} Quoted ETag
+ */
+export function computeETag(body) {
+  return `"${createHash('sha1').update(body).digest('base64url')}"`;
+}
+
+/**
+ * Whether the request's If-None-Match matches the current ETag
+ * @param {Request} request - Incoming request
+ * @param {string} etag - Current ETag
+ * @returns {boolean} True when a 304 can be sent
+ */
+export function isNotModified(request, etag) {
+  const header = request.headers.get('if-none-match');
+  if (!header) return false;
+  // If-None-Match uses weak comparison, so W/ prefixes are ignored
+  return header.split(',').some(tag => {
+    const candidate = tag.trim().replace(/^W\//, '');
+    return candidate === '*' || candidate === etag;
+  });
+}
+
+/**
+ * Pick the best encoding the client accepts
+ * @param {string|null} acceptEncoding - Accept-Encoding header
+ * @param {Object} encodings - Available encoded bodies by encoding name
+ * @returns {string|null} 'br', 'gzip' or null for identity
+ */
+export function negotiateEncoding(acceptEncoding, encodings) {
+  if (!acceptEncoding) return null;
+  const accepted = new Set(
+    acceptEncoding
+      .split(',')
+      .map(part => part.trim().split(';'))
+      .filter(([, q]) => !q || parseFloat(q.split('=')[1]) > 0)
+      .map(([name]) => name.trim().toLowerCase())
+  );
+  return ['br', 'gzip'].find(name => encodings[name] && (accepted.has(name) || accepted.has('*'))) || null;
+}
+
+/**
+ * Serialize and compress a JSON payload once
+ * @param {any} payload - Value to serialize
+ * @returns {Object} { body, etag, encodings: { br, gzip } }
+ */
+export function precompressJson(payload) {
+  const body = Buffer.from(JSON.stringify(payload));
+  const encodings = {};
+  if (body.length >= MIN_COMPRESS_BYTES) {
+    encodings.br = brotliCompressSync(body, {
+      params: { [zlibConstants.BROTLI_PARAM_QUALITY]: zlibConstants.BROTLI_MAX_QUALITY }
+    });
+    encodings.gzip = gzipSync(body, { level: 9 });
+  }
+  return { body, etag: computeETag(body), encodings };
+}
+
+/**
+ * Build a 200 or 304 response for a serialized JSON body
+ * @param {Request} request - Incoming request (If-None-Match, Accept-Encoding)
+ * @param {Object} entity - { body, etag, encodings? }
+ * @param {Object} headers - Extra headers, e.g. Cache-Control
+ * @returns {Response} Response with ETag (and Content-Encoding when compressed)
+ */
+export function conditionalJsonResponse(request, { body, etag, encodings = {} }, headers = {}) {
+  const common = { ETag: etag, Vary: 'Accept-Encoding', ...headers };
+
+  if (isNotModified(request, etag)) {
+    return new Response(null, { status: 304, headers: common });
+  }
+
+  const encoding = negotiateEncoding(request.headers.get('accept-encoding'), encodings);
+  const payload = encoding ? encodings[encoding] : body;
+  return new Response(payload, {
+    status: 200,
+    headers: {
+      ...common,
+      'Content-Type': 'application/json',
+      'Content-Length': String(payload.length),
+      ...(encoding ? { 'Content-Encoding': encoding } : {})
+    }
+  });
+}
+
+export default {
+  computeETag,
+  isNotModified,
+  negotiateEncoding,
+  precompressJson,
+  conditionalJsonResponse
+};
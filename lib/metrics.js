@@ -0,0 +1,223 @@
+/**
+ * Request Metrics for FoodAI
+ *
+ * Lightweight hot-path timing: per-request phase timers that render a
+ * Server-Timing header, in-process histograms per route and phase, and
+ * counters/histograms for upstream calls (Supabase, DeepSeek, providers),
+ * and a histogram of estimated DeepSeek prompt sizes. Everything is exported in the Prometheus text format on admin/metrics.
+ */
+
+// Histogram bucket upper bounds in milliseconds
+const BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000];
+
+// Prompt size bucket upper bounds in (estimated) tokens
+const BUCKETS_TOKENS = [250, 500, 1000, 1500, 2000, 2500, 3000, 4000, 6000, 8000];
+
+class Histogram {
+  constructor(buckets = BUCKETS_MS) {
+    this.buckets = buckets;
+    this.counts = new Array(buckets.length).fill(0);
+    this.sum = 0;
+    this.count = 0;
+  }
+
+  observe(value) {
+    this.sum += value;
+    this.count++;
+    for (let i = 0; i < this.buckets.length; i++) {
+      if (value <= this.buckets[i]) {
+        this.counts[i]++;
+        return;
+      }
+    }
+  }
+}
+
+const phaseHistograms = new Map();
+const upstreamHistograms = new Map();
+const upstreamCounters = new Map();
+const promptTokenHistograms = new Map();
+
+const labelKey = (labels) => JSON.stringify(labels);
+
+function histogramFor(map, labels, buckets = BUCKETS_MS) {
+  const key = labelKey(labels);
+  let entry = map.get(key);
+  if (!entry) {
+    entry = { labels, histogram: new Histogram(buckets) };
+    map.set(key, entry);
+  }
+  return entry.histogram;
+}
+
+const now = () => performance.now();
+
+/**
+ * Create a timer for one request
+ * @param {string} route - Route label (keep the set of values small)
+ * @returns {Object} Timer with start(phase), time(phase, fn), serverTiming() and finish(response)
+ */
+export function createRequestTimer(route) {
+  const startedAt = now();
+  const phases = [];
+
+  const record = (phase, ms) => {
+    phases.push({ phase, ms });
+    histogramFor(phaseHistograms, { route, phase }).observe(ms);
+  };
+
+  return {
+    /**
+     * Start timing a phase
+     * @param {string} phase - Phase name
+     * @returns {Function} Call to end the phase
+     */
+    start(phase) {
+      const phaseStart = now();
+      return () => record(phase, now() - phaseStart);
+    },
+
+    /**
+     * Time a sync or async function as one phase
+     * @param {string} phase - Phase name
+     * @param {Function} fn - Work to time
+     * @returns {any} The function's result (a promise for async functions)
+     */
+    time(phase, fn) {
+      const end = this.start(phase);
+      let result;
+      try {
+        result = fn();
+      } catch (error) {
+        end();
+        throw error;
+      }
+      if (result && typeof result.then === 'function') {
+        return result.finally(end);
+      }
+      end();
+      return result;
+    },
+
+    /**
+     * @returns {string} Server-Timing header value for the phases so far
+     */
+    serverTiming() {
+      return phases
+        .map(({ phase, ms }) => `${phase};dur=${ms.toFixed(1)}`)
+        .concat(`total;dur=${(now() - startedAt).toFixed(1)}`)
+        .join(', ');
+    },
+
+    /**
+     * Record the total time and attach the Server-Timing header
+     * @param {Response} response - Response about to be returned
+     * @returns {Response} The same response
+     */
+    finish(response) {
+      const header = this.serverTiming();
+      histogramFor(phaseHistograms, { route, phase: 'total' }).observe(now() - startedAt);
+      response.headers.set('Server-Timing', header);
+      return response;
+    }
+  };
+}
+
+/**
+ * Count one upstream call and its duration
+ * @param {string} upstream - Upstream name (supabase, deepseek, provider_wolt, ...)
+ * @param {string} outcome - 'ok' or 'error'
+ * @param {number} ms - Call duration
+ */
+export function recordUpstream(upstream, outcome, ms) {
+  const key = labelKey({ upstream, outcome });
+  const counter = upstreamCounters.get(key);
+  if (counter) {
+    counter.value++;
+  } else {
+    upstreamCounters.set(key, { labels: { upstream, outcome }, value: 1 });
+  }
+  histogramFor(upstreamHistograms, { upstream }).observe(ms);
+}
+
+/**
+ * Time an upstream call. Supabase results carrying an `error` count as failures.
+ * @param {string} upstream - Upstream name
+ * @param {Function} fn - Async function performing the call
+ * @returns {Promise<any>} The call's result
+ */
+export async function trackUpstream(upstream, fn) {
+  const startedAt = now();
+  try {
+    const result = await fn();
+    recordUpstream(upstream, result?.error ? 'error' : 'ok', now() - startedAt);
+    return result;
+  } catch (error) {
+    recordUpstream(upstream, 'error', now() - startedAt);
+    throw error;
+  }
+}
+
+/**
+ * Record the estimated size of a prompt sent to DeepSeek
+ * @param {string} call - Call kind ('chat' or 'stream')
+ * @param {number} tokens - Estimated prompt tokens
+ */
+export function recordPromptTokens(call, tokens) {
+  histogramFor(promptTokenHistograms, { call }, BUCKETS_TOKENS).observe(tokens);
+}
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+const formatLabels = (labels) =>
+  '{' + Object.entries(labels).map(([name, value]) => `${name}="${escapeLabel(value)}"`).join(',') + '}';
+
+function renderHistograms(lines, name, help, map) {
+  lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} histogram`);
+  for (const { labels, histogram } of map.values()) {
+    let cumulative = 0;
+    histogram.buckets.forEach((bound, i) => {
+      cumulative += histogram.counts[i];
+      lines.push(`${name}_bucket${formatLabels({ ...labels, le: bound })} ${cumulative}`);
+    });
+    lines.push(`${name}_bucket${formatLabels({ ...labels, le: '+Inf' })} ${histogram.count}`);
+    lines.push(`${name}_sum${formatLabels(labels)} ${histogram.sum.toFixed(3)}`);
+    lines.push(`${name}_count${formatLabels(labels)} ${histogram.count}`);
+  }
+}
+
+/**
+ * Render all metrics in the Prometheus text exposition format
+ * @param {Object} components - Optional { component: statsObject } exported as gauges
+ * @returns {string} Metrics text
+ */
+export function renderMetrics(components = {}) {
+  const lines = [];
+  renderHistograms(lines, 'foodai_request_phase_duration_ms', 'Request phase duration in milliseconds', phaseHistograms);
+
+  lines.push('# HELP foodai_upstream_requests_total Upstream calls by outcome', '# TYPE foodai_upstream_requests_total counter');
+  for (const { labels, value } of upstreamCounters.values()) {
+    lines.push(`foodai_upstream_requests_total${formatLabels(labels)} ${value}`);
+  }
+  renderHistograms(lines, 'foodai_upstream_duration_ms', 'Upstream call duration in milliseconds', upstreamHistograms);
+  renderHistograms(lines, 'foodai_deepseek_prompt_tokens', 'Estimated DeepSeek prompt size in tokens', promptTokenHistograms);
+
+  lines.push('# HELP foodai_component_stat In-process cache and queue statistics', '# TYPE foodai_component_stat gauge');
+  for (const [component, stats] of Object.entries(components)) {
+    for (const [stat, value] of Object.entries(stats || {})) {
+      if (typeof value === 'number' && Number.isFinite(value)) {
+        lines.push(`foodai_component_stat${formatLabels({ component, stat })} ${value}`);
+      }
+    }
+  }
+
+  return lines.join('\n') + '\n';
+}
+
+export default {
+  createRequestTimer,
+  recordUpstream,
+  trackUpstream,
+  recordPromptTokens,
+  renderMetrics
+};
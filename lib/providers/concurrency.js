@@ -0,0 +1,56 @@
+/**
+ * Concurrency helpers for provider integrations
+ *
+ * Small utilities for running provider calls concurrently with a cap on
+ * in-flight work and a time budget per call.
+ */
+
+/**
+ * Map over items with at most `limit` calls in flight, preserving input order
+ * @param {Array} items - Items to process
+ * @param {number} limit - Maximum number of concurrent calls
+ * @param {Function} fn - Async mapper (item, index) => result
+ * @param {Object} options - { shouldStart } predicate checked before each call starts
+ * @returns {Promise<Array>} Results aligned with items (undefined for skipped items)
+ */
+export async function mapWithConcurrency(items, limit, fn, { shouldStart = () => true } = {}) {
+  const results = new Array(items.length);
+  let next = 0;
+
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++;
+      if (!shouldStart()) return;
+      results[index] = await fn(items[index], index);
+    }
+  };
+
+  const workerCount = Math.max(1, Math.min(limit || items.length, items.length));
+  await Promise.all(Array.from({ length: workerCount }, worker));
+  return results;
+}
+
+/**
+ * Reject if a promise does not settle within the given time budget
+ * @param {Promise} promise - Work to wait for
+ * @param {number} ms - Time budget in milliseconds
+ * @param {string} message - Error message used on timeout
+ * @returns {Promise} The original result, or a rejection with error.code === 'ETIMEDOUT'
+ */
+export function withTimeout(promise, ms, message = `Timed out after ${ms}ms`) {
+  let timer;
+  const timeout = new Promise((_, reject) => {
+    timer = setTimeout(() => {
+      const error = new Error(message);
+      error.code = 'ETIMEDOUT';
+      reject(error);
+    }, ms);
+  });
+
+  return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+}
+
+export default {
+  mapWithConcurrency,
+  withTimeout
+};
@@ -5,6 +5,8 @@
  * Currently using mock data structure to prepare for real API integration.
  */
 
+import { createVenueFetcher } from './venue-fetcher.js';
+
 // Mock configuration - will be replaced with real API endpoints
 const FOODORA_CONFIG = {
   baseUrl: 'https://api.foodora.fi/v1',
@@ -19,7 +21,10 @@ const FOODORA_CONFIG = {
     'User-Agent': 'FoodAI/1.0',
     'Accept': 'application/json',
     'Content-Type': 'application/json'
-  }
+  },
+  // Venue offer fetching limits (shared across all searches)
+  concurrency: 6,
+  rateLimit: { requestsPerSecond: 8, burst: 16 }
 };
 
 /**
@@ -111,6 +116,14 @@ export async function fetchFoodoraDeals(restaurantId) {
   ];
 }
 
+// Bounded-concurrency, rate-limited venue offer fetcher
+const foodoraVenueFetcher = createVenueFetcher({
+  name: 'Foodora',
+  fetchOffers: fetchFoodoraDeals,
+  concurrency: FOODORA_CONFIG.concurrency,
+  rateLimit: FOODORA_CONFIG.rateLimit
+});
+
 /**
  * Search for deals across all restaurants in a city
  * @param {string} cityId - City identifier  
@@ -139,10 +152,11 @@ export async function searchFoodoraDeals(cityId, searchParams = {}) {
 
   // Mock response for now
   const restaurants = await fetchFoodoraRestaurants(cityId);
+  const dealsByRestaurant = await foodoraVenueFetcher.fetchAll(restaurants);
   const allDeals = [];
   
-  for (const restaurant of restaurants) {
-    const deals = await fetchFoodoraDeals(restaurant.id);
+  restaurants.forEach((restaurant, index) => {
+    const deals = dealsByRestaurant[index];
     const enrichedDeals = deals.map(deal => ({
       ...deal,
       restaurant_name: restaurant.name,
@@ -152,7 +166,7 @@ export async function searchFoodoraDeals(cityId, searchParams = {}) {
       deep_link: `https://www.foodora.fi/restaurant/${restaurant.slug}/deal/${deal.id}`
     }));
     allDeals.push(...enrichedDeals);
-  }
+  });
 
   // Apply filters
   let filteredDeals = allDeals;
@@ -8,6 +8,9 @@
 import woltProvider from './wolt.js';
 import foodoraProvider from './foodora.js';
 import resqProvider from './resq.js';
+import { mapWithConcurrency, withTimeout } from './concurrency.js';
+import { createSwrCache } from '../cache.js';
+import { trackUpstream } from '../metrics.js';
 
 // Available providers configuration
 export const PROVIDERS = {
@@ -107,50 +110,159 @@ export async function checkAllProvidersHealth() {
   return healthChecks;
 }
 
+// Search method exposed by each provider module
+const SEARCH_METHODS = {
+  wolt: 'searchWoltOffers',
+  foodora: 'searchFoodoraDeals',
+  resq_club: 'searchResQOffers'
+};
+
+// Fan-out budgets (configurable via environment)
+const PROVIDER_TIMEOUT_MS = parseInt(process.env.PROVIDER_TIMEOUT_MS) || 3000;
+const SEARCH_DEADLINE_MS = parseInt(process.env.PROVIDER_SEARCH_DEADLINE_MS) || 5000;
+const PROVIDER_CONCURRENCY = parseInt(process.env.PROVIDER_CONCURRENCY) || 4;
+
+// Provider search result cache (deal data changes on the scale of minutes)
+const providerSearchCache = createSwrCache({
+  maxEntries: parseInt(process.env.PROVIDER_CACHE_MAX_ENTRIES) || 500,
+  freshMs: parseInt(process.env.PROVIDER_CACHE_FRESH_MS) || 60 * 1000,
+  staleMs: parseInt(process.env.PROVIDER_CACHE_STALE_MS) || 5 * 60 * 1000
+});
+
+/**
+ * Build a cache key from provider, city slug and normalized search params.
+ * Empty values and 'all' are dropped, strings are trimmed and lowercased,
+ * and keys are sorted so equivalent searches share one entry.
+ * @param {string} providerId - Provider identifier
+ * @param {string} citySlug - City identifier
+ * @param {Object} params - Search parameters
+ * @returns {string} Cache key
+ */
+export function buildSearchCacheKey(providerId, citySlug, params = {}) {
+  const normalized = Object.keys(params)
+    .sort()
+    .map(key => {
+      let value = params[key];
+      if (typeof value === 'string') value = value.trim().toLowerCase();
+      return [key, value];
+    })
+    .filter(([, value]) => value !== undefined && value !== null && value !== '' && value !== 'all')
+    .map(([key, value]) => `${key}=${encodeURIComponent(value)}`)
+    .join('&');
+  
+  return `${providerId}:${String(citySlug || '').trim().toLowerCase()}?${normalized}`;
+}
+
+/**
+ * Hit/miss/stale counters for the provider search cache
+ * @returns {Object} Cache statistics
+ */
+export function getProviderCacheStats() {
+  return providerSearchCache.stats();
+}
+
+/**
+ * Plug in a shared cache backend (e.g. Redis) behind the in-memory LRU
+ * @param {Object} backend - Object with async get(key) and set(key, record, ttlMs)
+ */
+export function setProviderCacheBackend(backend) {
+  providerSearchCache.setBackend(backend);
+}
+
+/**
+ * Run one provider search and normalize its offers
+ * @returns {Promise<Object>} { offers, summary } or {} when the provider returned no offers
+ */
+async function runProviderSearch(providerId, provider, citySlug, params) {
+  const search = provider.module[SEARCH_METHODS[providerId]];
+  const result = await trackUpstream(`provider_${providerId}`, () => search(citySlug, params));
+  
+  if (!result || !result.offers) {
+    return {};
+  }
+  
+  return {
+    // Normalize offer format across providers
+    offers: result.offers.map(offer => normalizeOffer(offer, providerId)),
+    summary: {
+      count: result.offers.length,
+      total: result.total || result.offers.length,
+      hasMore: result.hasMore || false
+    }
+  };
+}
+
 /**
  * Search offers across all enabled providers
+ * 
+ * Providers are queried concurrently (at most `concurrency` at a time), each
+ * within its own `timeoutMs` budget. Whatever has arrived when `deadlineMs`
+ * passes is returned; slow or failed providers are reported in `errors`.
+ * Per-provider results are served from a stale-while-revalidate cache.
  * @param {string} citySlug - City identifier
  * @param {Object} searchParams - Search parameters
+ * @param {Object} options - Fan-out options (timeoutMs, deadlineMs, concurrency)
  * @returns {Promise<Object>} Aggregated search results
  */
-export async function searchAllProviders(citySlug, searchParams = {}) {
+export async function searchAllProviders(citySlug, searchParams = {}, options = {}) {
   const { limit = 20, offset = 0, sortBy = 'discount', ...otherParams } = searchParams;
+  const {
+    timeoutMs = PROVIDER_TIMEOUT_MS,
+    deadlineMs = SEARCH_DEADLINE_MS,
+    concurrency = PROVIDER_CONCURRENCY
+  } = options;
   
   const allOffers = [];
   const providerResults = {};
   const errors = {};
   
-  // Fetch offers from each enabled provider
-  for (const [providerId, provider] of Object.entries(PROVIDERS)) {
-    if (!provider.enabled) continue;
-    
+  // Enabled providers that have a search implementation
+  const searchable = Object.entries(PROVIDERS).filter(([providerId, provider]) =>
+    provider.enabled && provider.module && provider.module[SEARCH_METHODS[providerId]]
+  );
+  
+  const settled = {};
+  let deadlineReached = false;
+  
+  // Fetch offers from all providers concurrently
+  const fanout = mapWithConcurrency(searchable, concurrency, async ([providerId, provider]) => {
     try {
-      let result;
-      
-      // Call appropriate search method based on provider
-      if (providerId === 'wolt' && provider.module.searchWoltOffers) {
-        result = await provider.module.searchWoltOffers(citySlug, otherParams);
-      } else if (providerId === 'foodora' && provider.module.searchFoodoraDeals) {
-        result = await provider.module.searchFoodoraDeals(citySlug, otherParams);
-      } else if (providerId === 'resq_club' && provider.module.searchResQOffers) {
-        result = await provider.module.searchResQOffers(citySlug, otherParams);
-      }
-      
-      if (result && result.offers) {
-        // Normalize offer format across providers
-        const normalizedOffers = result.offers.map(offer => normalizeOffer(offer, providerId));
-        allOffers.push(...normalizedOffers);
-        
-        providerResults[providerId] = {
-          count: result.offers.length,
-          total: result.total || result.offers.length,
-          hasMore: result.hasMore || false
-        };
-      }
+      const cacheKey = buildSearchCacheKey(providerId, citySlug, otherParams);
+      settled[providerId] = await withTimeout(
+        providerSearchCache.getOrLoad(cacheKey, () =>
+          runProviderSearch(providerId, provider, citySlug, otherParams)
+        ),
+        timeoutMs,
+        `${provider.name} did not respond within ${timeoutMs}ms`
+      );
     } catch (error) {
+      settled[providerId] = { error };
+    }
+  }, { shouldStart: () => !deadlineReached });
+  
+  let deadlineTimer;
+  const deadline = new Promise(resolve => {
+    deadlineTimer = setTimeout(resolve, deadlineMs);
+  });
+  await Promise.race([fanout, deadline]);
+  clearTimeout(deadlineTimer);
+  deadlineReached = true;
+  
+  // Merge in provider order so results are deterministic
+  for (const [providerId] of searchable) {
+    const outcome = settled[providerId];
+    
+    if (!outcome || outcome.error) {
+      const error = outcome ? outcome.error : new Error(`Search deadline of ${deadlineMs}ms exceeded`);
       console.error(`Error fetching offers from ${providerId}:`, error);
       errors[providerId] = error.message;
       providerResults[providerId] = { count: 0, total: 0, hasMore: false };
+      continue;
+    }
+    
+    if (outcome.offers) {
+      allOffers.push(...outcome.offers);
+      providerResults[providerId] = outcome.summary;
     }
   }
   
@@ -286,6 +398,9 @@ export default {
   getProvider,
   checkAllProvidersHealth,
   searchAllProviders,
+  buildSearchCacheKey,
+  getProviderCacheStats,
+  setProviderCacheBackend,
   getProviderStats,
   generateTrackingUrl
 };
\ No newline at end of file
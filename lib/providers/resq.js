@@ -6,6 +6,8 @@
  * Currently using mock data structure to prepare for real API integration.
  */
 
+import { createVenueFetcher } from './venue-fetcher.js';
+
 // Mock configuration - will be replaced with real API endpoints
 const RESQ_CONFIG = {
   baseUrl: 'https://api.resq-club.com/v1',
@@ -19,7 +21,10 @@ const RESQ_CONFIG = {
     'User-Agent': 'FoodAI/1.0',
     'Accept': 'application/json',
     'Content-Type': 'application/json'
-  }
+  },
+  // Venue offer fetching limits (shared across all searches)
+  concurrency: 4,
+  rateLimit: { requestsPerSecond: 5, burst: 10 }
 };
 
 /**
@@ -114,6 +119,14 @@ export async function fetchResQOffers(venueId) {
   ];
 }
 
+// Bounded-concurrency, rate-limited venue offer fetcher
+const resqVenueFetcher = createVenueFetcher({
+  name: 'ResQ Club',
+  fetchOffers: fetchResQOffers,
+  concurrency: RESQ_CONFIG.concurrency,
+  rateLimit: RESQ_CONFIG.rateLimit
+});
+
 /**
  * Search for offers across all venues in a city
  * @param {string} cityId - City identifier
@@ -142,10 +155,11 @@ export async function searchResQOffers(cityId, searchParams = {}) {
 
   // Mock response for now
   const venues = await fetchResQVenues(cityId);
+  const offersByVenue = await resqVenueFetcher.fetchAll(venues);
   const allOffers = [];
   
-  for (const venue of venues) {
-    const offers = await fetchResQOffers(venue.id);
+  venues.forEach((venue, index) => {
+    const offers = offersByVenue[index];
     const enrichedOffers = offers.map(offer => ({
       ...offer,
       venue_name: venue.name,
@@ -157,7 +171,7 @@ export async function searchResQOffers(cityId, searchParams = {}) {
       eco_score: venue.waste_reduction_score
     }));
     allOffers.push(...enrichedOffers);
-  }
+  });
 
   // Apply filters
   let filteredOffers = allOffers;
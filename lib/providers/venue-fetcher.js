@@ -0,0 +1,119 @@
+/**
+ * Shared Venue Fetcher for provider integrations
+ *
+ * Fetches offers for many venues of one provider with bounded concurrency,
+ * optional batch endpoints and a per-provider token-bucket rate limit.
+ * Used by the Wolt, Foodora and ResQ Club modules instead of a serial
+ * venue -> offers loop.
+ */
+
+import { mapWithConcurrency } from './concurrency.js';
+
+/**
+ * Create a token bucket rate limiter
+ * @param {Object} options
+ * @param {number} options.ratePerSecond - Sustained request rate
+ * @param {number} options.burst - Bucket capacity (requests allowed back to back)
+ * @returns {Object} Limiter with take() resolving when a request may start
+ */
+export function createTokenBucket({ ratePerSecond, burst = ratePerSecond }) {
+  let tokens = burst;
+  let lastRefill = Date.now();
+  let queue = Promise.resolve();
+
+  const refill = () => {
+    const now = Date.now();
+    tokens = Math.min(burst, tokens + ((now - lastRefill) / 1000) * ratePerSecond);
+    lastRefill = now;
+  };
+
+  const acquire = async () => {
+    refill();
+    while (tokens < 1) {
+      const waitMs = Math.ceil(((1 - tokens) / ratePerSecond) * 1000);
+      await new Promise(resolve => setTimeout(resolve, waitMs));
+      refill();
+    }
+    tokens -= 1;
+  };
+
+  return {
+    // Requests are granted in arrival order
+    take() {
+      queue = queue.then(acquire);
+      return queue;
+    }
+  };
+}
+
+/**
+ * Create a venue offer fetcher for one provider
+ * @param {Object} options
+ * @param {string} options.name - Provider name (for logging)
+ * @param {Function} options.fetchOffers - Async (venueId) => offers for a single venue
+ * @param {Function} options.fetchOffersBatch - Optional async (venueIds) => { [venueId]: offers }
+ * @param {number} options.batchSize - Venue IDs per batch request
+ * @param {number} options.concurrency - Maximum requests in flight
+ * @param {Object} options.rateLimit - { requestsPerSecond, burst }
+ * @returns {Object} Fetcher with fetchAll(venues)
+ */
+export function createVenueFetcher({
+  name,
+  fetchOffers,
+  fetchOffersBatch = null,
+  batchSize = 25,
+  concurrency = 6,
+  rateLimit = { requestsPerSecond: 10, burst: 20 }
+}) {
+  const bucket = createTokenBucket({
+    ratePerSecond: rateLimit.requestsPerSecond,
+    burst: rateLimit.burst
+  });
+
+  const fetchVenue = async (venue) => {
+    await bucket.take();
+    try {
+      return await fetchOffers(venue.id);
+    } catch (error) {
+      // One failing venue should not sink the whole provider search
+      console.error(`${name}: failed to fetch offers for venue ${venue.id}:`, error);
+      return [];
+    }
+  };
+
+  const fetchBatch = async (venueBatch) => {
+    await bucket.take();
+    try {
+      const offersByVenue = await fetchOffersBatch(venueBatch.map(venue => venue.id));
+      return venueBatch.map(venue => offersByVenue[venue.id] || []);
+    } catch (error) {
+      console.error(`${name}: batch offer request failed:`, error);
+      return venueBatch.map(() => []);
+    }
+  };
+
+  return {
+    /**
+     * Fetch offers for all venues
+     * @param {Array} venues - Venue objects with an `id`
+     * @returns {Promise<Array<Array>>} Offers per venue, aligned with venues
+     */
+    async fetchAll(venues) {
+      if (fetchOffersBatch) {
+        const batches = [];
+        for (let i = 0; i < venues.length; i += batchSize) {
+          batches.push(venues.slice(i, i + batchSize));
+        }
+        const results = await mapWithConcurrency(batches, concurrency, fetchBatch);
+        return results.flat(1);
+      }
+
+      return mapWithConcurrency(venues, concurrency, fetchVenue);
+    }
+  };
+}
+
+export default {
+  createTokenBucket,
+  createVenueFetcher
+};
@@ -5,6 +5,8 @@
  * Currently using mock data structure to prepare for real API integration.
  */
 
+import { createVenueFetcher } from './venue-fetcher.js';
+
 // Mock configuration - will be replaced with real API endpoints
 const WOLT_CONFIG = {
   baseUrl: 'https://consumer-api.wolt.com/v1',
@@ -19,7 +21,10 @@ const WOLT_CONFIG = {
     'User-Agent': 'FoodAI/1.0',
     'Accept': 'application/json',
     'Content-Type': 'application/json'
-  }
+  },
+  // Venue offer fetching limits (shared across all searches)
+  concurrency: 8,
+  rateLimit: { requestsPerSecond: 10, burst: 20 }
 };
 
 /**
@@ -109,6 +114,14 @@ export async function fetchWoltOffers(venueId) {
   ];
 }
 
+// Bounded-concurrency, rate-limited venue offer fetcher
+const woltVenueFetcher = createVenueFetcher({
+  name: 'Wolt',
+  fetchOffers: fetchWoltOffers,
+  concurrency: WOLT_CONFIG.concurrency,
+  rateLimit: WOLT_CONFIG.rateLimit
+});
+
 /**
  * Search for offers across all venues in a city
  * @param {string} citySlug - City identifier
@@ -137,10 +150,11 @@ export async function searchWoltOffers(citySlug, searchParams = {}) {
 
   // Mock response for now
   const venues = await fetchWoltVenues(citySlug);
+  const offersByVenue = await woltVenueFetcher.fetchAll(venues);
   const allOffers = [];
   
-  for (const venue of venues) {
-    const offers = await fetchWoltOffers(venue.id);
+  venues.forEach((venue, index) => {
+    const offers = offersByVenue[index];
     const enrichedOffers = offers.map(offer => ({
       ...offer,
       venue_name: venue.name,
@@ -150,7 +164,7 @@ export async function searchWoltOffers(citySlug, searchParams = {}) {
       deep_link: `https://wolt.com/fi/venue/${venue.slug}/item/${offer.id}`
     }));
     allOffers.push(...enrichedOffers);
-  }
+  });
 
   // Apply filters
   let filteredOffers = allOffers;
@@ -0,0 +1,119 @@
+/**
+ * Supabase Readiness Tracking for FoodAI
+ *
+ * Probes the database once at startup and memoizes the result so request
+ * handlers never wait on a table-existence round trip. While the database is
+ * not ready it is re-probed with exponential backoff, and seeding runs at most
+ * once at a time.
+ */
+
+export const READINESS_STATES = {
+  UNKNOWN: 'unknown',
+  PROBING: 'probing',
+  READY: 'ready',
+  NOT_READY: 'not_ready'
+};
+
+const INITIAL_BACKOFF_MS = 5 * 1000;
+const MAX_BACKOFF_MS = 5 * 60 * 1000;
+
+/**
+ * Create a memoized readiness probe
+ * @param {Object} options
+ * @param {Function} options.probe - Async check returning { ready, needsSeed }
+ * @param {Function} options.seed - Async seeding step, run when the probe asks for it
+ * @param {number} options.initialBackoffMs - First re-probe delay while not ready
+ * @param {number} options.maxBackoffMs - Upper bound for the re-probe delay
+ * @returns {Object} Readiness tracker with check(), getState() and whenSettled()
+ */
+export function createReadinessProbe({
+  probe,
+  seed,
+  initialBackoffMs = INITIAL_BACKOFF_MS,
+  maxBackoffMs = MAX_BACKOFF_MS
+}) {
+  let state = READINESS_STATES.UNKNOWN;
+  let backoffMs = initialBackoffMs;
+  let nextProbeAt = 0;
+  let probing = null;
+  let seeding = null;
+
+  // Single-flight seeding: concurrent callers share one run, failures allow a retry later
+  const runSeed = () => {
+    if (!seeding) {
+      seeding = Promise.resolve()
+        .then(() => seed())
+        .catch(error => {
+          console.error('Supabase seeding failed:', error);
+          seeding = null;
+        });
+    }
+    return seeding;
+  };
+
+  const runProbe = () => {
+    if (!probing) {
+      state = READINESS_STATES.PROBING;
+      probing = (async () => {
+        let ready = false;
+        try {
+          const result = await probe();
+          ready = result.ready;
+          if (!ready && result.needsSeed && seed) {
+            await runSeed();
+          }
+        } catch (error) {
+          console.error('Supabase readiness probe failed:', error);
+        }
+
+        if (ready) {
+          state = READINESS_STATES.READY;
+          backoffMs = initialBackoffMs;
+        } else {
+          state = READINESS_STATES.NOT_READY;
+          nextProbeAt = Date.now() + backoffMs;
+          backoffMs = Math.min(backoffMs * 2, maxBackoffMs);
+        }
+        probing = null;
+        return state;
+      })();
+    }
+    return probing;
+  };
+
+  return {
+    /**
+     * Non-blocking readiness check: starts a probe when one is due
+     * and returns the current memoized state immediately.
+     * @returns {string} Current readiness state
+     */
+    check() {
+      if (state === READINESS_STATES.UNKNOWN ||
+          (state === READINESS_STATES.NOT_READY && Date.now() >= nextProbeAt)) {
+        runProbe();
+      }
+      return state;
+    },
+
+    /**
+     * @returns {string} Current readiness state
+     */
+    getState() {
+      return state;
+    },
+
+    /**
+     * Wait for any in-flight probe to finish
+     * @returns {Promise<string>} Settled readiness state
+     */
+    async whenSettled() {
+      this.check();
+      return probing ? probing : state;
+    }
+  };
+}
+
+export default {
+  READINESS_STATES,
+  createReadinessProbe
+};
@@ -2,7 +2,7 @@
 -- Bu SQL'leri Supabase Dashboard > SQL Editor'da çalıştırın
 
 -- 1. Sağlayıcılar Tablosu
-DROP TABLE IF EXISTS "offers", "restaurants", "providers", "clickouts", "user_profiles", "admins" CASCADE;
+DROP TABLE IF EXISTS "offers", "restaurants", "providers", "clickouts", "clickout_rollups_hourly", "clickout_rollups_daily", "user_profiles", "admins" CASCADE;
 
 CREATE TABLE "providers" (
   "id" TEXT PRIMARY KEY,
@@ -78,6 +78,35 @@ CREATE TABLE "clickouts" (
   "clicked_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- 4b. Saatlik ve günlük tıklama/komisyon özetleri (clickouts tablosundan artımlı güncellenir)
+CREATE TABLE "clickout_rollups_hourly" (
+  "id" BIGSERIAL PRIMARY KEY,
+  "bucket_start" TIMESTAMP WITH TIME ZONE NOT NULL,
+  "provider_id" TEXT NOT NULL DEFAULT '',
+  "offer_id" TEXT NOT NULL DEFAULT '',
+  "clicks" BIGINT NOT NULL DEFAULT 0,
+  "conversions" BIGINT NOT NULL DEFAULT 0,
+  "conversion_value" DECIMAL(12,2) NOT NULL DEFAULT 0,
+  "commission_earned" DECIMAL(12,2) NOT NULL DEFAULT 0,
+  "last_clicked_at" TIMESTAMP WITH TIME ZONE,
+  "updated_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  UNIQUE ("bucket_start", "provider_id", "offer_id")
+);
+
+CREATE TABLE "clickout_rollups_daily" (
+  "id" BIGSERIAL PRIMARY KEY,
+  "bucket_start" TIMESTAMP WITH TIME ZONE NOT NULL,
+  "provider_id" TEXT NOT NULL DEFAULT '',
+  "offer_id" TEXT NOT NULL DEFAULT '',
+  "clicks" BIGINT NOT NULL DEFAULT 0,
+  "conversions" BIGINT NOT NULL DEFAULT 0,
+  "conversion_value" DECIMAL(12,2) NOT NULL DEFAULT 0,
+  "commission_earned" DECIMAL(12,2) NOT NULL DEFAULT 0,
+  "last_clicked_at" TIMESTAMP WITH TIME ZONE,
+  "updated_at" TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  UNIQUE ("bucket_start", "provider_id", "offer_id")
+);
+
 -- 5. Kullanıcı Profilleri Tablosu
 CREATE TABLE "user_profiles" (
   "id" TEXT PRIMARY KEY,
@@ -110,15 +139,29 @@ CREATE INDEX "idx_offers_discount" ON "offers"("discount_percent" DESC);
 CREATE INDEX "idx_offers_price" ON "offers"("discounted_price" ASC);
 CREATE INDEX "idx_restaurants_city" ON "restaurants"("city");
 CREATE INDEX "idx_restaurants_cuisine" ON "restaurants" USING GIN("cuisine_types");
+-- Konum araması ("yakınımdaki tarjoukset") için earthdistance GiST indeksi
+CREATE EXTENSION IF NOT EXISTS cube;
+CREATE EXTENSION IF NOT EXISTS earthdistance;
+CREATE INDEX "idx_restaurants_location" ON "restaurants"
+  USING GIST (ll_to_earth("latitude"::float8, "longitude"::float8))
+  WHERE "latitude" IS NOT NULL AND "longitude" IS NOT NULL;
 CREATE INDEX "idx_clickouts_offer" ON "clickouts"("offer_id");
 CREATE INDEX "idx_clickouts_date" ON "clickouts"("clicked_at" DESC);
 CREATE INDEX "idx_clickouts_conversion" ON "clickouts"("is_conversion", "clicked_at" DESC);
+-- Özet tabloları için keyset sayfalama indeksleri (bucket_start DESC, id DESC)
+CREATE INDEX "idx_rollups_hourly_keyset" ON "clickout_rollups_hourly"("bucket_start" DESC, "id" DESC);
+CREATE INDEX "idx_rollups_hourly_provider" ON "clickout_rollups_hourly"("provider_id", "bucket_start" DESC, "id" DESC);
+CREATE INDEX "idx_rollups_daily_keyset" ON "clickout_rollups_daily"("bucket_start" DESC, "id" DESC);
+CREATE INDEX "idx_rollups_daily_provider" ON "clickout_rollups_daily"("provider_id", "bucket_start" DESC, "id" DESC);
+CREATE INDEX "idx_rollups_daily_conversions" ON "clickout_rollups_daily"("bucket_start" DESC, "id" DESC) WHERE "conversions" > 0;
 
 -- RLS Politikaları
 ALTER TABLE "providers" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "restaurants" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "offers" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "clickouts" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "clickout_rollups_hourly" ENABLE ROW LEVEL SECURITY;
+ALTER TABLE "clickout_rollups_daily" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "user_profiles" ENABLE ROW LEVEL SECURITY;
 ALTER TABLE "admins" ENABLE ROW LEVEL SECURITY;
 
@@ -127,6 +170,8 @@ CREATE POLICY "Public providers" ON "providers" FOR ALL USING (true);
 CREATE POLICY "Public restaurants" ON "restaurants" FOR ALL USING (true);
 CREATE POLICY "Public offers" ON "offers" FOR ALL USING (true);
 CREATE POLICY "Public clickouts" ON "clickouts" FOR ALL USING (true);
+CREATE POLICY "Public clickout rollups hourly" ON "clickout_rollups_hourly" FOR SELECT USING (true);
+CREATE POLICY "Public clickout rollups daily" ON "clickout_rollups_daily" FOR SELECT USING (true);
 CREATE POLICY "Public profiles" ON "user_profiles" FOR ALL USING (true);
 
 -- Admin sadece admin erişimi
@@ -153,6 +198,132 @@ CREATE TRIGGER "update_profiles_updated_at" BEFORE UPDATE ON "user_profiles"
 CREATE TRIGGER "update_admins_updated_at" BEFORE UPDATE ON "admins"
   FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- Tıklama özetlerini artımlı güncelle
+-- (SECURITY DEFINER: özet tabloları istemcilere yalnızca okunabilir)
+-- Tek bir tıklama satırının etkisini (delta) saatlik ve günlük özetlere uygular
+CREATE OR REPLACE FUNCTION apply_clickout_rollup(
+  p_clicked_at TIMESTAMP WITH TIME ZONE,
+  p_provider_id TEXT,
+  p_offer_id TEXT,
+  p_clicks BIGINT,
+  p_conversions BIGINT,
+  p_conversion_value DECIMAL,
+  p_commission_earned DECIMAL
+)
+RETURNS VOID AS $$
+BEGIN
+  INSERT INTO "clickout_rollups_hourly" AS r
+    ("bucket_start", "provider_id", "offer_id", "clicks", "conversions", "conversion_value", "commission_earned", "last_clicked_at")
+  VALUES
+    (date_trunc('hour', p_clicked_at), COALESCE(p_provider_id, ''), COALESCE(p_offer_id, ''),
+     p_clicks, p_conversions, p_conversion_value, p_commission_earned, p_clicked_at)
+  ON CONFLICT ("bucket_start", "provider_id", "offer_id") DO UPDATE SET
+    "clicks" = r."clicks" + EXCLUDED."clicks",
+    "conversions" = r."conversions" + EXCLUDED."conversions",
+    "conversion_value" = r."conversion_value" + EXCLUDED."conversion_value",
+    "commission_earned" = r."commission_earned" + EXCLUDED."commission_earned",
+    "last_clicked_at" = GREATEST(r."last_clicked_at", EXCLUDED."last_clicked_at"),
+    "updated_at" = NOW();
+
+  INSERT INTO "clickout_rollups_daily" AS r
+    ("bucket_start", "provider_id", "offer_id", "clicks", "conversions", "conversion_value", "commission_earned", "last_clicked_at")
+  VALUES
+    (date_trunc('day', p_clicked_at), COALESCE(p_provider_id, ''), COALESCE(p_offer_id, ''),
+     p_clicks, p_conversions, p_conversion_value, p_commission_earned, p_clicked_at)
+  ON CONFLICT ("bucket_start", "provider_id", "offer_id") DO UPDATE SET
+    "clicks" = r."clicks" + EXCLUDED."clicks",
+    "conversions" = r."conversions" + EXCLUDED."conversions",
+    "conversion_value" = r."conversion_value" + EXCLUDED."conversion_value",
+    "commission_earned" = r."commission_earned" + EXCLUDED."commission_earned",
+    "last_clicked_at" = GREATEST(r."last_clicked_at", EXCLUDED."last_clicked_at"),
+    "updated_at" = NOW();
+END;
+$$ language 'plpgsql' SECURITY DEFINER SET search_path = public;
+
+-- Toplu eklemeler: ifade başına tek gruplanmış upsert (transition table)
+CREATE OR REPLACE FUNCTION rollup_inserted_clickouts()
+RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO "clickout_rollups_hourly" AS r
+    ("bucket_start", "provider_id", "offer_id", "clicks", "conversions", "conversion_value", "commission_earned", "last_clicked_at")
+  SELECT date_trunc('hour', n."clicked_at"), COALESCE(n."provider_id", ''), COALESCE(n."offer_id", ''),
+         COUNT(*), COUNT(*) FILTER (WHERE n."is_conversion"),
+         COALESCE(SUM(n."conversion_value"), 0), COALESCE(SUM(n."commission_earned"), 0), MAX(n."clicked_at")
+  FROM new_clickouts n
+  GROUP BY 1, 2, 3
+  ON CONFLICT ("bucket_start", "provider_id", "offer_id") DO UPDATE SET
+    "clicks" = r."clicks" + EXCLUDED."clicks",
+    "conversions" = r."conversions" + EXCLUDED."conversions",
+    "conversion_value" = r."conversion_value" + EXCLUDED."conversion_value",
+    "commission_earned" = r."commission_earned" + EXCLUDED."commission_earned",
+    "last_clicked_at" = GREATEST(r."last_clicked_at", EXCLUDED."last_clicked_at"),
+    "updated_at" = NOW();
+
+  INSERT INTO "clickout_rollups_daily" AS r
+    ("bucket_start", "provider_id", "offer_id", "clicks", "conversions", "conversion_value", "commission_earned", "last_clicked_at")
+  SELECT date_trunc('day', n."clicked_at"), COALESCE(n."provider_id", ''), COALESCE(n."offer_id", ''),
+         COUNT(*), COUNT(*) FILTER (WHERE n."is_conversion"),
+         COALESCE(SUM(n."conversion_value"), 0), COALESCE(SUM(n."commission_earned"), 0), MAX(n."clicked_at")
+  FROM new_clickouts n
+  GROUP BY 1, 2, 3
+  ON CONFLICT ("bucket_start", "provider_id", "offer_id") DO UPDATE SET
+    "clicks" = r."clicks" + EXCLUDED."clicks",
+    "conversions" = r."conversions" + EXCLUDED."conversions",
+    "conversion_value" = r."conversion_value" + EXCLUDED."conversion_value",
+    "commission_earned" = r."commission_earned" + EXCLUDED."commission_earned",
+    "last_clicked_at" = GREATEST(r."last_clicked_at", EXCLUDED."last_clicked_at"),
+    "updated_at" = NOW();
+
+  RETURN NULL;
+END;
+$$ language 'plpgsql' SECURITY DEFINER SET search_path = public;
+
+-- Konversiyon güncellemeleri ve silmeler: eski satırı çıkar, yenisini ekle
+CREATE OR REPLACE FUNCTION rollup_changed_clickout()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_clickout_rollup(OLD."clicked_at", OLD."provider_id", OLD."offer_id", -1,
+      -(CASE WHEN OLD."is_conversion" THEN 1 ELSE 0 END),
+      -COALESCE(OLD."conversion_value", 0), -COALESCE(OLD."commission_earned", 0));
+  END IF;
+  IF TG_OP = 'UPDATE' THEN
+    PERFORM apply_clickout_rollup(NEW."clicked_at", NEW."provider_id", NEW."offer_id", 1,
+      CASE WHEN NEW."is_conversion" THEN 1 ELSE 0 END,
+      COALESCE(NEW."conversion_value", 0), COALESCE(NEW."commission_earned", 0));
+  END IF;
+  RETURN NULL;
+END;
+$$ language 'plpgsql' SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER "rollup_clickouts_insert" AFTER INSERT ON "clickouts"
+  REFERENCING NEW TABLE AS new_clickouts
+  FOR EACH STATEMENT EXECUTE FUNCTION rollup_inserted_clickouts();
+CREATE TRIGGER "rollup_clickouts_change" AFTER UPDATE OR DELETE ON "clickouts"
+  FOR EACH ROW EXECUTE FUNCTION rollup_changed_clickout();
+
+-- Yarıçap içindeki aktif teklifler, mesafeye göre (earth_box idx_restaurants_location indeksini kullanır)
+CREATE OR REPLACE FUNCTION offers_near(
+  p_lat DOUBLE PRECISION,
+  p_lng DOUBLE PRECISION,
+  p_radius_km DOUBLE PRECISION,
+  p_limit INTEGER DEFAULT 50
+)
+RETURNS TABLE (offer_id TEXT, restaurant_id TEXT, distance_km DOUBLE PRECISION) AS $$
+  SELECT o."id", r."id",
+         earth_distance(ll_to_earth(p_lat, p_lng), ll_to_earth(r."latitude"::float8, r."longitude"::float8)) / 1000.0
+  FROM "restaurants" r
+  JOIN "offers" o ON o."restaurant_id" = r."id"
+  WHERE r."latitude" IS NOT NULL AND r."longitude" IS NOT NULL
+    AND earth_box(ll_to_earth(p_lat, p_lng), p_radius_km * 1000.0)
+        @> ll_to_earth(r."latitude"::float8, r."longitude"::float8)
+    AND earth_distance(ll_to_earth(p_lat, p_lng), ll_to_earth(r."latitude"::float8, r."longitude"::float8))
+        <= p_radius_km * 1000.0
+    AND o."is_active" AND o."ends_at" > NOW()
+  ORDER BY 3
+  LIMIT p_limit;
+$$ language 'sql' STABLE SET search_path = public, extensions;
+
 -- Başlangıç verilerini ekle
 INSERT INTO "admins" ("id", "email", "name", "role") VALUES 
 ('admin_1', 'info@voon.fi', 'Voon Admin', 'super_admin');
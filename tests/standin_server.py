@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+FoodAI API Stand-in Server
+Local, dependency-free imitation of the FoodAI API contract used by
+backend_test.py, so the suite and load tests run without the network.
+Latency, jitter and failures can be injected to get repeatable numbers.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Mirrors lib/catalog/mock-data.js
+RESTAURANTS = [
+    {'id': 'rest_1', 'name': 'Ravintola Savoy', 'city': 'Helsinki', 'district': 'Keskusta',
+     'cuisine_types': ['Suomalainen', 'Fine Dining'], 'rating': 4.8, 'latitude': 60.1699, 'longitude': 24.9384},
+    {'id': 'rest_2', 'name': 'Pizzeria da Mario', 'city': 'Helsinki', 'district': 'Kallio',
+     'cuisine_types': ['Pizza', 'Italiana'], 'rating': 4.3, 'latitude': 60.1841, 'longitude': 24.9511},
+    {'id': 'rest_3', 'name': 'Sushi Zen', 'city': 'Tampere', 'district': 'Keskusta',
+     'cuisine_types': ['Sushi', 'Japanilainen'], 'rating': 4.6, 'latitude': 61.4981, 'longitude': 23.7608},
+    {'id': 'rest_4', 'name': 'Golden Dragon', 'city': 'Turku', 'district': 'Keskusta',
+     'cuisine_types': ['Kiinalainen', 'Aasialainen'], 'rating': 4.4, 'latitude': 60.4518, 'longitude': 22.2666},
+    {'id': 'rest_5', 'name': 'Burger Palace', 'city': 'Oulu', 'district': 'Keskusta',
+     'cuisine_types': ['Hampurilainen', 'Fast Food'], 'rating': 4.2, 'latitude': 65.0121, 'longitude': 25.4651},
+    {'id': 'rest_6', 'name': 'Kebab King', 'city': 'Jyväskylä', 'district': 'Keskusta',
+     'cuisine_types': ['Kebab', 'Turkkilainen'], 'rating': 4.1, 'latitude': 62.2426, 'longitude': 25.7473},
+    {'id': 'rest_7', 'name': 'Thai Garden', 'city': 'Lahti', 'district': 'Keskusta',
+     'cuisine_types': ['Thai', 'Aasialainen'], 'rating': 4.5, 'latitude': 60.9827, 'longitude': 25.6612},
+    {'id': 'rest_8', 'name': 'Ravintola Aino', 'city': 'Kuopio', 'district': 'Keskusta',
+     'cuisine_types': ['Suomalainen', 'Eurooppalainen'], 'rating': 4.7, 'latitude': 62.8924, 'longitude': 27.6780},
+]
+
+PROVIDERS = [
+    {'id': 'wolt', 'name': 'Wolt', 'color': '#00C2E8', 'commission_rate': 8.50, 'website': 'https://wolt.com/fi'},
+    {'id': 'foodora', 'name': 'Foodora', 'color': '#E91E63', 'commission_rate': 7.20, 'website': 'https://www.foodora.fi'},
+    {'id': 'resq_club', 'name': 'ResQ Club', 'color': '#4CAF50', 'commission_rate': 12.00, 'website': 'https://www.resq-club.com/fi/'},
+    {'id': 'kotipizza', 'name': 'Kotipizza', 'color': '#D32F2F', 'commission_rate': 6.50, 'website': 'https://www.kotipizza.fi/'},
+    {'id': 'k_ruoka', 'name': 'K-Ruoka', 'color': '#FF6D00', 'commission_rate': 5.00, 'website': 'https://www.k-ruoka.fi/kauppa'},
+    {'id': 'fiksuruoka', 'name': 'Fiksuruoka', 'color': '#2E7D32', 'commission_rate': 9.00, 'website': 'https://www.fiksuruoka.fi'},
+]
+
+FOOD_ITEMS = [
+    'Lohikeitto', 'Karjalanpiirakka', 'Poronkäristys', 'Mustikkapiirakka', 'Korvapuusti',
+    'Margherita Pizza', 'Pepperoni Pizza', 'Quattro Stagioni', 'Calzone',
+    'Nigiri Sushi', 'Maki Roll', 'Sashimi', 'Temaki', 'California Roll',
+    'Cheeseburger', 'Big Burger', 'Chicken Burger', 'Fish Burger', 'Veggie Burger',
+    'Kebab', 'Falafel', 'Gyros', 'Shawarma', 'Iskender',
+    'Pad Thai', 'Green Curry', 'Tom Yum', 'Massaman Curry', 'Som Tam',
+]
+
+FOOD_IMAGE_IDS = [
+    '1546069901-ba9599a7e63c', '1715493926880-a15b1fee7b30', '1555939594-58d7cb561ad1',
+    '1533777324565-a040eb52facd', '1604908176997-125f25cc6f3d', '1565299624946-b28f40a0ca4b',
+]
+
+CHAT_REPLY = ("Tässä parhaat tarjoukset juuri nyt: Pizzeria da Mario (Helsinki) tarjoaa "
+              "Margherita Pizzan 35 % alennuksella Woltissa, ja Sushi Zen (Tampere) myy "
+              "ylijäämäsushia ResQ Clubin kautta. Tilaa pian, tarjoukset ovat voimassa rajoitetusti! 🍕🍣")
+
+class StandinConfig:
+    """Latency, jitter and failure injection settings"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, failure_rate: float = 0,
+                 chunk_delay_ms: float = 20, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.chunk_delay_ms = chunk_delay_ms
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def should_fail(self) -> bool:
+        if not self.failure_rate:
+            return False
+        with self.lock:
+            return self.rng.random() < self.failure_rate
+
+def generate_offers(seed: int) -> List[Dict[str, Any]]:
+    """Deterministic catalog shaped like generateFinnishOffers()"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    offers = []
+    for restaurant in RESTAURANTS:
+        for provider in PROVIDERS:
+            for i in range(rng.randint(2, 5)):
+                original_price = rng.randint(8, 32)
+                discount_percent = rng.randint(15, 59)
+                offer_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{provider['id']}:{restaurant['id']}:{i}"))
+                offers.append({
+                    'id': offer_id,
+                    'provider_id': provider['id'],
+                    'provider_name': provider['name'],
+                    'provider_color': provider['color'],
+                    'restaurant_id': restaurant['id'],
+                    'restaurant_name': restaurant['name'],
+                    'city': restaurant['city'],
+                    'district': restaurant['district'],
+                    'cuisine_types': restaurant['cuisine_types'],
+                    'rating': restaurant['rating'],
+                    'latitude': restaurant['latitude'],
+                    'longitude': restaurant['longitude'],
+                    'title': rng.choice(FOOD_ITEMS),
+                    'original_price': original_price,
+                    'discounted_price': round(original_price * (1 - discount_percent / 100), 2),
+                    'discount_percent': discount_percent,
+                    'currency': 'EUR',
+                    'ends_at': (now + timedelta(hours=rng.randint(2, 49))).isoformat(),
+                    'image_url': f"https://images.unsplash.com/photo-{rng.choice(FOOD_IMAGE_IDS)}?w=400&h=300&fit=crop&auto=format",
+                    'deep_link': f"https://{provider['id']}.com/restaurant/{restaurant['id']}/offer/{offer_id}",
+                    'is_active': True,
+                    'clickCount': rng.randint(0, 49),
+                })
+    return offers
+
+# Compact list view of GET /api/offers (lib/catalog/projection.js)
+OFFER_LIST_FIELDS = ['id', 'provider_id', 'restaurant_id', 'title', 'description', 'image_url',
+                     'original_price', 'discounted_price', 'discount_percent', 'currency', 'ends_at',
+                     'deep_link', 'distance_km']
+PROVIDER_LOOKUP_FIELDS = {'name': 'provider_name', 'color': 'provider_color'}
+RESTAURANT_LOOKUP_FIELDS = {'name': 'restaurant_name', 'city': 'city', 'district': 'district',
+                            'cuisine_types': 'cuisine_types', 'rating': 'rating',
+                            'latitude': 'latitude', 'longitude': 'longitude'}
+
+def project_offers(offers: List[Dict[str, Any]], fields_param: Optional[str]) -> Dict[str, Any]:
+    """Same `fields=` projection and lookup tables as GET /api/offers"""
+    names = [name.strip() for name in (fields_param or '').split(',') if name.strip()]
+    if any(name in ('full', '*') for name in names):
+        return {'offers': offers}
+    fields = list(dict.fromkeys(['id'] + names)) if names else OFFER_LIST_FIELDS
+
+    result: Dict[str, Any] = {
+        'offers': [{field: offer[field] for field in fields if field in offer} for offer in offers]
+    }
+    for key, id_field, mapping in (('providers', 'provider_id', PROVIDER_LOOKUP_FIELDS),
+                                   ('restaurants', 'restaurant_id', RESTAURANT_LOOKUP_FIELDS)):
+        if id_field in fields:
+            result[key] = {}
+            for offer in offers:
+                result[key].setdefault(offer[id_field], {name: offer[field] for name, field in mapping.items()
+                                                         if field in offer})
+    return result
+
+def query_offers(offers: List[Dict[str, Any]], params: Dict[str, str]) -> Dict[str, Any]:
+    """Same filter, sort and pagination semantics as GET /api/offers"""
+    city = params.get('city', '').lower()
+    cuisine = params.get('cuisine', '').lower()
+    provider = params.get('provider', '')
+    min_discount = _int(params.get('minDiscount'), 0)
+    max_price = _int(params.get('maxPrice'), 100)
+    sort_by = params.get('sortBy', 'discount')
+    page = _int(params.get('page'), 1)
+    limit = _int(params.get('limit'), 12)
+
+    filtered = [
+        offer for offer in offers
+        if (not city or city == 'all' or city in offer['city'].lower())
+        and (not cuisine or cuisine == 'all' or any(cuisine in c.lower() for c in offer['cuisine_types']))
+        and offer['discount_percent'] >= min_discount
+        and offer['discounted_price'] <= max_price
+        and (not provider or provider == 'all' or offer['provider_id'] == provider)
+    ]
+    if sort_by == 'price':
+        filtered.sort(key=lambda offer: offer['discounted_price'])
+    elif sort_by == 'rating':
+        filtered.sort(key=lambda offer: -offer['rating'])
+    else:
+        filtered.sort(key=lambda offer: -offer['discount_percent'])
+
+    start = max(0, (page - 1) * limit)
+    return {
+        **project_offers(filtered[start:start + limit], params.get('fields')),
+        'total': len(filtered),
+        'page': page,
+        'totalPages': -(-len(filtered) // limit) if limit > 0 else 0,
+        'hasMore': start + limit < len(filtered),
+    }
+
+def _int(value: Optional[str], default: int) -> int:
+    try:
+        return int(value) or default
+    except (TypeError, ValueError):
+        return default
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler; server attributes hold the config and catalog"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, payload: Any, status: int = 200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self) -> Tuple[Optional[Any], bool]:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}'), True
+        except ValueError:
+            return None, False
+
+    def inject(self) -> bool:
+        """Apply configured latency; return True when this request should fail"""
+        config = self.server.config
+        delay = config.delay()
+        if delay:
+            time.sleep(delay)
+        if config.should_fail():
+            self.send_json({'error': 'Injected failure'}, 503)
+            return True
+        return False
+
+    def route(self) -> Tuple[str, Dict[str, str]]:
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return url.path.rstrip('/'), params
+
+    def do_HEAD(self):
+        # Image checks are pointed here instead of images.unsplash.com (see FoodAITester.image_host)
+        path, _ = self.route()
+        if path.startswith('/photo-'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/jpeg')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        path, params = self.route()
+        if path.startswith('/photo-'):
+            self.do_HEAD()
+            return
+        if self.inject():
+            return
+
+        offers = self.server.offers
+        if path == '/api':
+            self.send_json({'message': 'FoodAi API - Suomen Ruokatarjousten Vertailupalvelu',
+                            'status': 'Stand-in server'})
+        elif path == '/api/offers':
+            self.send_json(query_offers(offers, params))
+        elif path == '/api/providers':
+            self.send_json([{**provider, 'logo_url': f"https://images.unsplash.com/photo-{FOOD_IMAGE_IDS[i]}?w=100&h=100&fit=crop"}
+                            for i, provider in enumerate(PROVIDERS)])
+        elif path == '/api/cities':
+            self.send_json(list(dict.fromkeys(r['city'] for r in RESTAURANTS)))
+        elif path == '/api/cuisines':
+            self.send_json(list(dict.fromkeys(c for r in RESTAURANTS for c in r['cuisine_types'])))
+        elif path == '/api/stats':
+            self.send_json({
+                'totalOffers': len(offers),
+                'activeProviders': len(PROVIDERS),
+                'averageDiscount': round(sum(o['discount_percent'] for o in offers) / len(offers)),
+                'totalSavings': round(sum(o['original_price'] - o['discounted_price'] for o in offers)),
+                'cities': len({r['city'] for r in RESTAURANTS}),
+            })
+        elif path == '/api/chat':
+            self.send_json({
+                'service': 'FoodAI Chat API',
+                'version': '1.0.0',
+                'powered_by': 'DeepSeek AI (stand-in)',
+                'endpoints': {'chat': 'POST /api/chat', 'stream': 'POST /api/chat/stream'},
+                'status': 'operational',
+            })
+        else:
+            self.send_json({'error': 'Ei löydetty'}, 404)
+
+    def do_POST(self):
+        path, _ = self.route()
+        body, valid = self.read_json()
+        if self.inject():
+            return
+        if not valid:
+            self.send_json({'error': 'Sisäinen palvelinvirhe'}, 500)
+            return
+
+        if path == '/api/clickouts':
+            self.send_json({'success': True, 'clickoutId': str(uuid.uuid4())})
+        elif path in ('/api/chat', '/api/chat/stream'):
+            messages = body.get('messages') if isinstance(body, dict) else None
+            if not isinstance(messages, list):
+                self.send_json({'error': 'Messages array is required'}, 400)
+            elif path == '/api/chat':
+                if not all(m.get('role') in ('user', 'assistant', 'system') and m.get('content') for m in messages):
+                    self.send_json({'error': 'Invalid message format. Each message must have role and content.'}, 400)
+                else:
+                    self.send_json({'role': 'assistant', 'content': CHAT_REPLY})
+            else:
+                self.stream_reply()
+        else:
+            self.send_json({'error': 'Ei löydetty'}, 404)
+
+    def stream_reply(self):
+        """Fake DeepSeek token stream in the /api/chat/stream SSE format"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        chunk_delay = self.server.config.chunk_delay_ms / 1000
+        tokens = [word + ' ' for word in CHAT_REPLY.split(' ')]
+        try:
+            for token in tokens:
+                self.write_chunk(f"data: {json.dumps({'content': token})}\n\n")
+                if chunk_delay:
+                    time.sleep(chunk_delay)
+            self.write_chunk('data: [DONE]\n\n')
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def write_chunk(self, text: str):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+def start_standin_server(host: str = '127.0.0.1', port: int = 0, **config) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in server on a daemon thread; returns (server, api_base).
+    server.base_url also answers image HEAD requests for offline image checks."""
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.config = StandinConfig(**config)
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    server.offers = generate_offers(server.config.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{server.base_url}/api"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FoodAI API stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency-ms', type=float, default=0, help="added latency per request")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="uniform +/- jitter on the latency")
+    parser.add_argument('--failure-rate', type=float, default=0, help="fraction of API requests answered with 503")
+    parser.add_argument('--chunk-delay-ms', type=float, default=20, help="delay between streamed chat chunks")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    server, api_base = start_standin_server(args.host, args.port, latency_ms=args.latency_ms,
+                                            jitter_ms=args.jitter_ms, failure_rate=args.failure_rate,
+                                            chunk_delay_ms=args.chunk_delay_ms, seed=args.seed)
+    print(f"FoodAI stand-in API listening on {api_base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()